@@ -0,0 +1,67 @@
+"""
+In-Process TTL Cache
+====================
+Tiny per-process memo for hot, read-mostly queries (dashboard analytics).
+
+Design Decisions:
+- Plain dict of key -> (expires_at, value); no external cache dependency
+- time.monotonic() so wall-clock adjustments never extend an entry
+- Bounded size: the oldest entry is evicted once maxsize is reached
+- Per-process only; every worker/API replica keeps its own copy, which is
+  acceptable because entries live for seconds, not minutes
+"""
+
+import time
+from typing import Any, Hashable
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Dictionary-backed cache whose entries expire after `ttl_seconds`.
+
+    Not thread-safe; intended for use from a single asyncio event loop.
+    `hits` and `misses` count get() outcomes for observability.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 128):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for `key`, or `default` if missing/expired."""
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store `value` under `key` for `ttl_seconds`."""
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            # dicts preserve insertion order - evict the oldest entry
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
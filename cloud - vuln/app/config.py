@@ -141,6 +141,34 @@ class Settings(BaseSettings):
         description="Timeout for Trivy subprocess",
     )
     
+    trivy_server_url: str | None = Field(
+        default=None,
+        description=(
+            "URL of a running `trivy server`. When set, scans run in "
+            "client/server mode (trivy image --server URL) so the "
+            "vulnerability DB is loaded once by the server, not per scan"
+        ),
+    )
+    
+    trivy_server_listen: str | None = Field(
+        default=None,
+        description=(
+            "host:port for a `trivy server` the standalone worker launches "
+            "and uses for its own scans (ignored when trivy_server_url is set)"
+        ),
+    )
+    
+    trivy_db_max_age_hours: int = Field(
+        default=12,
+        ge=1,
+        le=168,
+        description=(
+            "Age after which the worker refreshes the cached vulnerability DB "
+            "(checked at start-up and between scan batches; scans themselves "
+            "run with --skip-db-update once the DB is in place)"
+        ),
+    )
+    
     # =========================================================================
     # WORKER CONFIGURATION
     # =========================================================================
@@ -188,13 +216,28 @@ class Settings(BaseSettings):
     )
     
     # =========================================================================
-    # RISK SCORING WEIGHTS
+    # REPORT STORAGE
     # =========================================================================
     
-    risk_weight_critical: int = Field(default=100, ge=1)
-    risk_weight_high: int = Field(default=50, ge=1)
-    risk_weight_medium: int = Field(default=10, ge=1)
-    risk_weight_low: int = Field(default=1, ge=1)
+    raw_report_dir: str | None = Field(
+        default=None,
+        description=(
+            "Directory for raw Trivy reports. When set, reports are written "
+            "here and referenced by raw_report_key instead of being stored "
+            "in the raw_report JSONB column. Must be a volume mounted at the "
+            "same path by both the API and the worker, since the worker "
+            "writes reports and the API serves them. Required to keep raw "
+            "reports of 10MB or more (STREAMING_PARSE_THRESHOLD)"
+        ),
+    )
+    
+    store_vulnerability_details: bool = Field(
+        default=False,
+        description=(
+            "Also write one vulnerability_details row per CVE when a scan "
+            "completes (bulk COPY on PostgreSQL), for cross-scan CVE lookups"
+        ),
+    )
     
     # =========================================================================
     # OBSERVABILITY
@@ -11,8 +11,9 @@ Principal Architecture Decisions:
 import asyncio
 import os
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Callable
 
+import orjson
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     AsyncEngine,
@@ -21,7 +22,7 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
-from sqlalchemy import event, text
+from sqlalchemy import DDL, event, text
 
 # =============================================================================
 # CONFIGURATION - Production Optimized Settings
@@ -45,16 +46,28 @@ class DatabaseConfig:
     # - pool_size=20: Baseline connections for steady-state load
     # - max_overflow=30: Burst capacity for CI/CD pipeline spikes
     # - Total max connections = 50 (stay under PostgreSQL default 100)
-    POOL_SIZE: int = 20
-    MAX_OVERFLOW: int = 30
+    # Overridden per deployment (k8s/api.yaml, k8s/worker.yaml): a worker
+    # runs a handful of scans at once and needs far fewer connections
+    POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "30"))
     
     # Timeout settings (seconds)
-    POOL_TIMEOUT: int = 30          # Wait for available connection
-    POOL_RECYCLE: int = 1800        # Recycle connections every 30 min (AWS RDS requirement)
+    POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))      # Wait for available connection
+    POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))    # Recycle connections every 30 min (AWS RDS requirement)
     POOL_PRE_PING: bool = True      # Validate connection before checkout (handles network blips)
     
-    # Statement caching - critical for repeated scan queries
-    PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    # Statement caching - critical for repeated scan queries. Two layers:
+    # - PREPARED_STATEMENT_CACHE_SIZE: SQLAlchemy asyncpg dialect cache of
+    #   prepared statements per connection (skips PREPARE on reuse)
+    # - STATEMENT_CACHE_SIZE: asyncpg's own per-connection statement cache
+    # Behind PgBouncer in transaction (or statement) pooling mode, prepared
+    # statements do not survive across server connections: set both
+    # DB_STATEMENT_CACHE_SIZE=0 and DB_PREPARED_STATEMENT_CACHE_SIZE=0.
+    # Session pooling mode works with the defaults.
+    PREPARED_STATEMENT_CACHE_SIZE: int = int(
+        os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "512")
+    )
+    STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "1024"))
     
     # Echo SQL for debugging (disable in production)
     ECHO_SQL: bool = False
@@ -72,10 +85,25 @@ class Base(DeclarativeBase):
     pass
 
 
+# ix_scan_image_name_trgm uses gin_trgm_ops, so pg_trgm must exist before
+# create_all builds the tables (init_db is the only schema path when the SQL
+# migrations are not run, e.g. docker-compose). No-op on other dialects.
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
 # =============================================================================
 # ENGINE FACTORY - Creates properly configured async engine
 # =============================================================================
 
+def _orjson_serializer(obj) -> str:
+    """Serialize JSON/JSONB bind values with orjson (str fallback like json's default=str)."""
+    return orjson.dumps(obj, default=str).decode()
+
+
 def create_db_engine(
     database_url: str | None = None,
     echo: bool | None = None,
@@ -101,10 +129,14 @@ def create_db_engine(
     
     # Build connect_args for asyncpg-specific optimizations
     connect_args = {
-        # Statement cache size - reduces parse overhead for repeated queries
+        # Statement cache sizes - reduce parse/plan overhead for repeated
+        # queries (see DatabaseConfig for the PgBouncer caveat)
         "prepared_statement_cache_size": DatabaseConfig.PREPARED_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": DatabaseConfig.STATEMENT_CACHE_SIZE,
         # Command timeout - fail fast on hung queries (30 seconds)
         "command_timeout": 30,
+        # JIT compilation costs more than it saves on short OLTP queries
+        "server_settings": {"jit": "off"},
     }
     
     engine = create_async_engine(
@@ -119,9 +151,12 @@ def create_db_engine(
         pool_pre_ping=DatabaseConfig.POOL_PRE_PING,
         # AsyncPG specific settings
         connect_args=connect_args,
-        # JSON serialization - use stdlib json for JSONB columns
-        json_serializer=lambda obj: __import__("json").dumps(obj, default=str),
-        json_deserializer=__import__("json").loads,
+        # JSON serialization - orjson for JSONB columns. The asyncpg dialect
+        # already registers a binary JSONB codec; these hooks are the only
+        # encode/decode it performs, so multi-MB raw_report round-trips avoid
+        # stdlib json entirely
+        json_serializer=_orjson_serializer,
+        json_deserializer=orjson.loads,
     )
     
     return engine
@@ -282,6 +317,47 @@ async def health_check() -> dict:
         }
 
 
+# =============================================================================
+# PENDING-SCAN NOTIFICATIONS - LISTEN/NOTIFY wake-ups for idle workers
+# =============================================================================
+
+# Notified whenever a PENDING scan is inserted
+SCAN_PENDING_CHANNEL = "scan_pending"
+
+
+async def notify_scan_pending(session: AsyncSession) -> None:
+    """
+    Queue a NOTIFY on SCAN_PENDING_CHANNEL in the session's transaction.
+    
+    PostgreSQL delivers it on commit (and drops it on rollback), so a
+    listener never wakes for a scan that was not created. No-op on other
+    backends (SQLite tests), where workers simply poll.
+    """
+    connection = await session.connection()
+    if connection.dialect.name == "postgresql":
+        await session.execute(text(f"NOTIFY {SCAN_PENDING_CHANNEL}"))
+
+
+async def connect_listener(channel: str, callback: Callable[[], None]) -> Any | None:
+    """
+    Open a dedicated asyncpg connection that LISTENs on `channel`.
+    
+    LISTEN is connection state, so it cannot live on a pooled connection;
+    the caller owns the returned connection and must close() it. Returns
+    None when the engine is not PostgreSQL.
+    """
+    url = get_engine().url
+    if url.get_backend_name() != "postgresql":
+        return None
+    
+    import asyncpg  # Only needed (and installed) for PostgreSQL
+    
+    dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+    connection = await asyncpg.connect(dsn)
+    await connection.add_listener(channel, lambda *_: callback())
+    return connection
+
+
 # =============================================================================
 # UTILITY FUNCTIONS
 # =============================================================================
@@ -2,21 +2,29 @@
 Container Vulnerability Scanner - FastAPI Application
 """
 
+import asyncio
 import os
+import base64
+import hashlib
+import time
 import uuid
 import logging
-from datetime import datetime
+import orjson
+from datetime import datetime, timezone
 from contextlib import asynccontextmanager
-from typing import Optional, List
+from typing import Any, Optional, List
 
 from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
-from sqlalchemy import select, func, desc
+from fastapi.responses import FileResponse, JSONResponse, Response
+from pydantic import BaseModel, Field, field_serializer
+from sqlalchemy import select, func, desc, and_, tuple_
 
+from app import report_store
 from app.database import get_engine, get_session_factory, Base, get_db_session, init_db, close_db
 from app.models import VulnerabilityScan, ScanStatus, ComplianceStatus
+from app.repositories import ScanRepository
+from app.responses import ModelJSONResponse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -54,11 +62,17 @@ class ScanResponse(BaseModel):
     error_message: Optional[str] = None
     created_at: datetime
     completed_at: Optional[datetime] = None
-    raw_report: Optional[dict] = None
+    # The report itself is served verbatim by GET /api/v1/scans/{id}/raw_report
+    raw_report_url: Optional[str] = None
 
     class Config:
         from_attributes = True
 
+    @field_serializer("created_at", "completed_at")
+    def serialize_datetime(self, dt: Optional[datetime]) -> Optional[str]:
+        """ISO format (+00:00 offset), as orjson and the other schemas emit"""
+        return dt.isoformat() if dt else None
+
 
 class PaginatedScans(BaseModel):
     """Paginated list of scans"""
@@ -67,6 +81,8 @@ class PaginatedScans(BaseModel):
     page: int
     page_size: int
     pages: int
+    # Opaque keyset cursor for the page after this one (None on the last page)
+    next_cursor: Optional[str] = None
 
 
 class DashboardStats(BaseModel):
@@ -105,6 +121,12 @@ async def lifespan(app: FastAPI):
     
     # Cleanup
     logger.info("Shutting down API...")
+    try:
+        from app.worker import shutdown_parse_pool
+    except ImportError:
+        pass  # Upload route unavailable, so no parse pool was started
+    else:
+        await asyncio.to_thread(shutdown_parse_pool)
     await close_db()
 
 
@@ -117,6 +139,8 @@ app = FastAPI(
     description="Scan Docker images for security vulnerabilities using Trivy",
     version="1.0.0",
     lifespan=lifespan,
+    # orjson (or a model's generated encoder) instead of stdlib json
+    default_response_class=ModelJSONResponse,
 )
 
 # CORS middleware
@@ -148,11 +172,11 @@ async def global_exception_handler(request: Request, exc: Exception):
 async def add_request_id(request: Request, call_next):
     request_id = str(uuid.uuid4())
     request.state.request_id = request_id
-    start_time = datetime.utcnow()
+    start_time = time.perf_counter()
     
     response = await call_next(request)
     
-    duration = (datetime.utcnow() - start_time).total_seconds()
+    duration = time.perf_counter() - start_time
     logger.info(
         f"{request.method} {request.url.path} "
         f"status={response.status_code} "
@@ -171,7 +195,7 @@ async def add_request_id(request: Request, call_next):
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return {"status": "healthy", "timestamp": datetime.now(timezone.utc).isoformat()}
 
 
 # =============================================================================
@@ -211,19 +235,65 @@ async def create_scan(
         }
 
 
+# Columns shown in the scan list, selected as plain rows: no ORM
+# hydration and no JSONB report transfer for up to page_size scans.
+# Key order matches ScanResponse; orjson encodes UUIDs and enums natively.
+_SCAN_LIST_COLUMNS = (
+    VulnerabilityScan.id,
+    VulnerabilityScan.image_name,
+    VulnerabilityScan.image_tag,
+    VulnerabilityScan.registry,
+    VulnerabilityScan.status,
+    VulnerabilityScan.risk_score,
+    VulnerabilityScan.is_compliant,
+    VulnerabilityScan.critical_count,
+    VulnerabilityScan.high_count,
+    VulnerabilityScan.medium_count,
+    VulnerabilityScan.low_count,
+    VulnerabilityScan.total_vulnerabilities,
+    VulnerabilityScan.fixable_count,
+    VulnerabilityScan.scan_duration,
+    VulnerabilityScan.error_message,
+    VulnerabilityScan.created_at,
+    VulnerabilityScan.completed_at,
+)
+
+
+def _encode_scan_cursor(created_at: datetime, scan_id: uuid.UUID) -> str:
+    """Pack the (created_at, id) sort key of the last row into a URL-safe cursor."""
+    raw = orjson.dumps([created_at.isoformat(), str(scan_id)])
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_scan_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Inverse of _encode_scan_cursor; malformed cursors are a 400."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, scan_id = orjson.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(scan_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @app.get("/api/v1/scans", response_model=PaginatedScans)
 async def list_scans(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
     status: Optional[str] = None,
     image_name: Optional[str] = None,
+    cursor: Optional[str] = None,
 ):
     """
     List all vulnerability scans with pagination.
+    
+    Pass the previous response's `next_cursor` as `cursor` to seek straight
+    past the rows already seen (WHERE (created_at, id) < cursor), which
+    costs the same at any depth. `page` is the deprecated OFFSET form, kept
+    for existing clients; it is ignored when a cursor is given.
     """
     async with get_db_session() as session:
         # Build query
-        query = select(VulnerabilityScan)
+        query = select(*_SCAN_LIST_COLUMNS)
         count_query = select(func.count(VulnerabilityScan.id))
         
         # Apply filters
@@ -238,79 +308,159 @@ async def list_scans(
         total_result = await session.execute(count_query)
         total = total_result.scalar() or 0
         
-        # Apply pagination
-        query = query.order_by(desc(VulnerabilityScan.created_at))
-        query = query.offset((page - 1) * page_size).limit(page_size)
+        # Apply pagination; id breaks created_at ties so the order is total
+        # and the (created_at, id) index serves both forms
+        query = query.order_by(
+            desc(VulnerabilityScan.created_at), desc(VulnerabilityScan.id)
+        )
+        if cursor:
+            query = query.where(
+                tuple_(VulnerabilityScan.created_at, VulnerabilityScan.id)
+                < tuple_(*_decode_scan_cursor(cursor))
+            )
+        else:
+            query = query.offset((page - 1) * page_size)
         
-        result = await session.execute(query)
-        scans = result.scalars().all()
+        # One extra row tells whether a next page exists without a second query
+        result = await session.execute(query.limit(page_size + 1))
+        rows = result.all()
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = _encode_scan_cursor(rows[-1].created_at, rows[-1].id)
         
-        return PaginatedScans(
-            items=[
-                ScanResponse(
-                    id=str(s.id),
-                    image_name=s.image_name,
-                    image_tag=s.image_tag,
-                    registry=s.registry,
-                    status=s.status.value,
-                    risk_score=s.risk_score,
-                    is_compliant=s.is_compliant,
-                    critical_count=s.critical_count,
-                    high_count=s.high_count,
-                    medium_count=s.medium_count,
-                    low_count=s.low_count,
-                    total_vulnerabilities=s.total_vulnerabilities,
-                    fixable_count=s.fixable_count,
-                    scan_duration=s.scan_duration,
-                    error_message=s.error_message,
-                    created_at=s.created_at,
-                    completed_at=s.completed_at,
-                )
-                for s in scans
+        # Hot path: rows are trusted DB data, so skip per-item Pydantic
+        # validation and encode plain dicts with orjson. The response_model
+        # above still documents the shape in OpenAPI.
+        payload = {
+            "items": [
+                {**row._asdict(), "raw_report_url": None}
+                for row in rows
             ],
-            total=total,
-            page=page,
-            page_size=page_size,
-            pages=(total + page_size - 1) // page_size,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "pages": (total + page_size - 1) // page_size,
+            "next_cursor": next_cursor,
+        }
+        return Response(
+            content=orjson.dumps(payload),
+            media_type="application/json",
         )
 
 
+def _scan_etag(scan: Any) -> str:
+    """Strong ETag for a scan: every write bumps updated_at, so it changes with the body."""
+    digest = hashlib.blake2b(
+        f"{scan.id}:{scan.status.value}:{scan.updated_at.isoformat()}".encode(),
+        digest_size=16,
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """RFC 9110 If-None-Match check (weak comparison, list or '*')."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
 @app.get("/api/v1/scans/{scan_id}", response_model=ScanResponse)
-async def get_scan(scan_id: str):
+async def get_scan(scan_id: str, request: Request):
     """
     Get detailed scan results by ID.
+    
+    Responses carry an ETag; a poll that sends it back in If-None-Match
+    gets an empty 304 while the scan is unchanged. Clients always
+    revalidate, so a deleted or re-processed scan is never served stale.
     """
     async with get_db_session() as session:
+        # Same plain-row path as list_scans, plus updated_at for the ETag
         result = await session.execute(
-            select(VulnerabilityScan).where(VulnerabilityScan.id == scan_id)
+            select(*_SCAN_LIST_COLUMNS, VulnerabilityScan.updated_at)
+            .where(VulnerabilityScan.id == scan_id)
         )
-        scan = result.scalar_one_or_none()
+        scan = result.one_or_none()
         
         if not scan:
             raise HTTPException(status_code=404, detail="Scan not found")
         
-        return ScanResponse(
-            id=str(scan.id),
-            image_name=scan.image_name,
-            image_tag=scan.image_tag,
-            registry=scan.registry,
-            status=scan.status.value,
-            risk_score=scan.risk_score,
-            is_compliant=scan.is_compliant,
-            critical_count=scan.critical_count,
-            high_count=scan.high_count,
-            medium_count=scan.medium_count,
-            low_count=scan.low_count,
-            total_vulnerabilities=scan.total_vulnerabilities,
-            fixable_count=scan.fixable_count,
-            scan_duration=scan.scan_duration,
-            error_message=scan.error_message,
-            created_at=scan.created_at,
-            completed_at=scan.completed_at,
-            raw_report=scan.raw_report,
+        etag = _scan_etag(scan)
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=cache_headers)
+        
+        # Trusted DB row: encoded with orjson, no ScanResponse round trip
+        payload = scan._asdict()
+        del payload["updated_at"]
+        payload["raw_report_url"] = f"/api/v1/scans/{scan.id}/raw_report"
+        return Response(
+            content=orjson.dumps(payload),
+            media_type="application/json",
+            headers=cache_headers,
         )
 
 
+@app.get("/api/v1/scans/{scan_id}/raw_report")
+async def get_raw_report(scan_id: uuid.UUID):
+    """
+    Get the raw Trivy JSON report for a scan.
+    
+    The stored bytes are returned as-is - the report is never decoded into
+    Python objects or re-serialized.
+    """
+    async with get_db_session() as session:
+        result = await session.execute(
+            select(
+                VulnerabilityScan.raw_report_key,
+                VulnerabilityScan.raw_report_omitted,
+            )
+            .where(VulnerabilityScan.id == scan_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Scan not found")
+        
+        if row.raw_report_omitted:
+            raise HTTPException(
+                status_code=404,
+                detail=(
+                    "Raw report was not kept: it exceeded the 10MB inline "
+                    "limit and RAW_REPORT_DIR is not configured"
+                ),
+            )
+        
+        if row.raw_report_key is not None:
+            # The file lives in RAW_REPORT_DIR, which must be the same volume
+            # the worker writes to
+            if not report_store.is_enabled():
+                logger.warning(
+                    "Scan %s has raw_report_key but RAW_REPORT_DIR is not set on the API",
+                    scan_id,
+                )
+                raise HTTPException(status_code=404, detail="Raw report not available")
+            try:
+                path = report_store.report_path(row.raw_report_key)
+            except ValueError:
+                raise HTTPException(status_code=404, detail="Raw report not available")
+            if not await asyncio.to_thread(path.is_file):
+                logger.warning("Raw report file missing for scan %s: %s", scan_id, path)
+                raise HTTPException(status_code=404, detail="Raw report not available")
+            
+            # Streamed from disk in chunks by Starlette
+            return FileResponse(path, media_type="application/json")
+        
+        report = await ScanRepository(session).get_raw_report_bytes(scan_id)
+        if report is None:
+            raise HTTPException(status_code=404, detail="Raw report not available")
+        return Response(content=report, media_type="application/json")
+
+
 @app.delete("/api/v1/scans/{scan_id}")
 async def delete_scan(scan_id: str):
     """
@@ -354,6 +504,9 @@ async def delete_scan(scan_id: str):
         await session.delete(scan)
         await session.commit()
         
+        if scan.raw_report_key is not None:
+            await report_store.delete_report(scan.raw_report_key)
+        
         logger.info(f"Deleted scan {scan_id} and related data")
         
         return {"message": "Scan deleted successfully", "id": scan_id}
@@ -386,7 +539,10 @@ async def get_dashboard_stats():
                 func.sum(VulnerabilityScan.medium_count).label("medium"),
                 func.sum(VulnerabilityScan.low_count).label("low"),
                 func.count(VulnerabilityScan.id).filter(
-                    VulnerabilityScan.is_compliant == True
+                    and_(
+                        VulnerabilityScan.status == ScanStatus.completed,
+                        VulnerabilityScan.is_compliant == True,
+                    )
                 ).label("compliant"),
                 func.avg(VulnerabilityScan.risk_score).label("avg_risk"),
                 func.sum(VulnerabilityScan.fixable_count).label("fixable"),
@@ -23,6 +23,7 @@ from typing import Any
 
 from sqlalchemy import (
     Column,
+    Computed,
     String,
     Integer,
     Float,
@@ -91,7 +92,7 @@ class ComplianceStatus(str, enum.Enum):
     Compliance classification based on vulnerability profile.
     
     Business Logic:
-    - COMPLIANT: No Critical or High vulnerabilities
+    - COMPLIANT: No vulnerabilities of any counted severity
     - NON_COMPLIANT: Has Critical or High vulnerabilities
     - PENDING_REVIEW: Has only Medium/Low (needs manual review)
     """
@@ -110,6 +111,76 @@ class ComplianceStatus(str, enum.Enum):
 # CORE MODEL: VulnerabilityScan
 # =============================================================================
 
+# =============================================================================
+# GENERATED COLUMN EXPRESSIONS
+# =============================================================================
+# Portable SQL (PostgreSQL and SQLite). Generated columns cannot reference
+# other generated columns, so the risk score expression is inlined where
+# the risk band needs it.
+
+# Points per CVE, (critical, high, medium, low). The single source for the
+# generated risk_score column and the worker's in-process score.
+RISK_WEIGHTS = (100, 50, 10, 1)
+
+_RISK_SCORE_SQL = (
+    "critical_count * {} + high_count * {} + medium_count * {} + low_count * {}"
+    .format(*RISK_WEIGHTS)
+)
+
+# Same rule as the worker's compliance_status == compliant: a completed scan
+# with no Critical/High/Medium/Low CVEs. Pending/in-progress/failed scans
+# have all-zero counts and must not read as clean
+_IS_COMPLIANT_SQL = (
+    "status = 'completed' AND critical_count = 0 AND high_count = 0 "
+    "AND medium_count = 0 AND low_count = 0"
+)
+
+# Lower bound of each band, highest first: (threshold, level, urgency)
+_RISK_BANDS = (
+    (500, "CRITICAL", "Immediate (within 24 hours)"),
+    (100, "HIGH", "Urgent (within 7 days)"),
+    (30, "MEDIUM", "Standard (within 30 days)"),
+    (1, "LOW", "Best-effort (within 90 days)"),
+)
+_NO_RISK = ("NONE", "No action required")
+
+
+def risk_band(risk_score: int) -> tuple[str, str]:
+    """(risk_level, remediation_urgency) for a score, as the generated columns."""
+    for threshold, level, urgency in _RISK_BANDS:
+        if risk_score >= threshold:
+            return level, urgency
+    return _NO_RISK
+
+
+def fixable_ratio(fixable: int, total: int) -> float:
+    """Fraction of CVEs with a fix, as the generated fixable_ratio column."""
+    return round(fixable / total, 4) if total else 1.0
+
+
+def _risk_band_case(field: int) -> str:
+    """CASE expression over the risk score; field 0 = level, 1 = urgency."""
+    whens = " ".join(
+        f"WHEN ({_RISK_SCORE_SQL}) >= {threshold} THEN '{labels[field]}'"
+        for threshold, *labels in _RISK_BANDS
+    )
+    return f"CASE {whens} ELSE '{_NO_RISK[field]}' END"
+
+
+_RISK_LEVEL_SQL = _risk_band_case(0)
+_REMEDIATION_URGENCY_SQL = _risk_band_case(1)
+
+_FULL_IMAGE_SQL = (
+    "CASE WHEN registry = 'docker.io' THEN image_name || ':' || image_tag "
+    "ELSE registry || '/' || image_name || ':' || image_tag END"
+)
+
+_FIXABLE_RATIO_SQL = (
+    "CASE WHEN total_vulnerabilities = 0 THEN 1.0 "
+    "ELSE ROUND(fixable_count * 1.0 / total_vulnerabilities, 4) END"
+)
+
+
 class VulnerabilityScan(Base):
     """
     Primary entity for vulnerability scan results.
@@ -181,6 +252,13 @@ class VulnerabilityScan(Base):
         comment="SHA256 digest for immutable identification"
     )
     
+    content_sha256: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        index=True,
+        comment="SHA256 of uploaded tarball bytes (content-level deduplication)"
+    )
+    
     registry: Mapped[str] = mapped_column(
         String(255),
         nullable=False,
@@ -229,6 +307,22 @@ class VulnerabilityScan(Base):
         comment="Complete Trivy JSON output (preserved for audit)"
     )
     
+    raw_report_key: Mapped[str | None] = mapped_column(
+        String(512),
+        nullable=True,
+        comment="Key of the raw Trivy report in report storage (see app/report_store.py)"
+    )
+    
+    # Set when the report was too large for the JSONB column and no
+    # RAW_REPORT_DIR was configured, so the raw report endpoint can say why
+    raw_report_omitted: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default=text("false"),
+        comment="True if the raw report exceeded the inline limit and was not kept"
+    )
+    
     # Metadata extracted from image
     image_metadata: Mapped[dict | None] = mapped_column(
         JSONB,
@@ -306,10 +400,12 @@ class VulnerabilityScan(Base):
     # RISK SCORING
     # ==========================================================================
     
+    # Generated column - PostgreSQL derives the score from the counts above,
+    # so writers only ever set the inputs and the formula lives in one place
     risk_score: Mapped[int] = mapped_column(
         Integer,
+        Computed(_RISK_SCORE_SQL, persisted=True),
         nullable=False,
-        default=0,
         index=True,
         comment="Weighted risk score: Critical=100, High=50, Medium=10, Low=1"
     )
@@ -327,16 +423,60 @@ class VulnerabilityScan(Base):
         comment="Average CVSS score across all CVEs"
     )
     
+    # ==========================================================================
+    # PRECOMPUTED DISPLAY FIELDS (generated columns)
+    # ==========================================================================
+    # Deterministic functions of the columns above, materialized by the
+    # database so read paths serialize them as plain attributes and can
+    # filter on them (e.g. WHERE risk_level = 'CRITICAL') via an index.
+    
+    risk_level: Mapped[str] = mapped_column(
+        String(16),
+        Computed(_RISK_LEVEL_SQL, persisted=True),
+        nullable=False,
+        index=True,
+        comment="Risk band: NONE/LOW/MEDIUM/HIGH/CRITICAL (generated)"
+    )
+    
+    remediation_urgency: Mapped[str] = mapped_column(
+        String(64),
+        Computed(_REMEDIATION_URGENCY_SQL, persisted=True),
+        nullable=False,
+        comment="Recommended remediation timeline for the risk band (generated)"
+    )
+    
+    full_image: Mapped[str] = mapped_column(
+        String(1024),
+        Computed(_FULL_IMAGE_SQL, persisted=True),
+        nullable=False,
+        comment="Display reference; docker.io registry omitted (generated)"
+    )
+    
+    critical_and_high: Mapped[int] = mapped_column(
+        Integer,
+        Computed("critical_count + high_count", persisted=True),
+        nullable=False,
+        comment="Critical + High count (generated)"
+    )
+    
+    fixable_ratio: Mapped[float] = mapped_column(
+        Float,
+        Computed(_FIXABLE_RATIO_SQL, persisted=True),
+        nullable=False,
+        comment="Fixable / total, 1.0 when there are no vulnerabilities (generated)"
+    )
+    
     # ==========================================================================
     # COMPLIANCE FLAGS
     # ==========================================================================
     
+    # Generated column - kept consistent with the counts by the database
     is_compliant: Mapped[bool] = mapped_column(
         Boolean,
+        Computed(_IS_COMPLIANT_SQL, persisted=True),
         nullable=False,
-        default=False,
         index=True,
-        comment="True if no Critical/High CVEs found"
+        comment="True if the scan completed with no Critical/High/Medium/Low CVEs"
     )
     
     compliance_status: Mapped[ComplianceStatus] = mapped_column(
@@ -433,6 +573,16 @@ class VulnerabilityScan(Base):
             postgresql_using="btree",
         ),
         
+        # Keyset pagination order for the scan list
+        # "Next page of scans older than (created_at, id)"; scanned backwards
+        # for ORDER BY created_at DESC, id DESC
+        Index(
+            "ix_scans_list_order",
+            "created_at",
+            "id",
+            postgresql_using="btree",
+        ),
+        
         # Composite index for compliance dashboards
         # "Show me all non-compliant images with critical vulnerabilities"
         Index(
@@ -475,6 +625,16 @@ class VulnerabilityScan(Base):
             ),
         ),
         
+        # Trigram GIN index for substring search on image name
+        # Serves list filters like image_name ILIKE '%nginx%', which a
+        # B-tree cannot (leading wildcard). Requires the pg_trgm extension.
+        Index(
+            "ix_scan_image_name_trgm",
+            "image_name",
+            postgresql_using="gin",
+            postgresql_ops={"image_name": "gin_trgm_ops"},
+        ),
+        
         # Check constraints for data integrity
         CheckConstraint(
             "risk_score >= 0",
@@ -530,11 +690,12 @@ class VulnerabilityScan(Base):
         - Medium: 10 points each (remediation within 30 days)
         - Low: 1 point each (best-effort remediation)
         """
+        critical, high, medium, low = RISK_WEIGHTS
         return (
-            (self.critical_count * 100) +
-            (self.high_count * 50) +
-            (self.medium_count * 10) +
-            (self.low_count * 1)
+            (self.critical_count * critical) +
+            (self.high_count * high) +
+            (self.medium_count * medium) +
+            (self.low_count * low)
         )
     
     def determine_compliance_status(self) -> ComplianceStatus:
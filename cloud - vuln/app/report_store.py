@@ -0,0 +1,92 @@
+"""
+Raw Report Storage
+==================
+Keeps raw Trivy reports out of the database row when RAW_REPORT_DIR is set.
+
+Design Decisions:
+- Reports are stored as the bytes Trivy produced and served back verbatim
+  by GET /api/v1/scans/{id}/raw_report - never parsed or re-serialized
+- A report's key is "<scan_id>.json", relative to settings.raw_report_dir,
+  and is persisted in VulnerabilityScan.raw_report_key
+- When RAW_REPORT_DIR is unset, callers keep using the raw_report JSONB
+  column (is_enabled() is False)
+- RAW_REPORT_DIR must be a volume shared by the worker (which writes) and
+  the API (which serves); a key whose file is missing is served as a 404
+- Blocking file I/O runs in a thread so the event loop is never stalled
+"""
+
+import asyncio
+import shutil
+from pathlib import Path
+from typing import BinaryIO
+from uuid import UUID
+
+from app.config import settings
+
+
+def is_enabled() -> bool:
+    """True if reports should be written to disk instead of the database."""
+    return settings.raw_report_dir is not None
+
+
+def report_path(key: str) -> Path:
+    """
+    Resolve a stored key to its file path.
+    
+    Raises:
+        ValueError: If storage is disabled or the key escapes the directory
+    """
+    if settings.raw_report_dir is None:
+        raise ValueError("raw report storage is not configured")
+    
+    root = Path(settings.raw_report_dir).resolve()
+    path = (root / key).resolve()
+    if path.parent != root:
+        raise ValueError(f"invalid raw report key: {key!r}")
+    return path
+
+
+def _key_for(scan_id: UUID) -> str:
+    return f"{scan_id}.json"
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def _copy_file(source: Path, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(source, path)
+
+
+async def save_report_bytes(scan_id: UUID, data: bytes) -> str:
+    """Store an encoded report; returns its raw_report_key."""
+    key = _key_for(scan_id)
+    await asyncio.to_thread(_write_bytes, report_path(key), data)
+    return key
+
+
+async def save_report_file(scan_id: UUID, source: Path) -> str:
+    """Copy a report file Trivy wrote into storage; returns its raw_report_key."""
+    key = _key_for(scan_id)
+    await asyncio.to_thread(_copy_file, source, report_path(key))
+    return key
+
+
+def _copy_stream(source: BinaryIO, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        shutil.copyfileobj(source, f)
+
+
+async def save_report_stream(scan_id: UUID, source: BinaryIO) -> str:
+    """Copy a report from an open binary file into storage; returns its raw_report_key."""
+    key = _key_for(scan_id)
+    await asyncio.to_thread(_copy_stream, source, report_path(key))
+    return key
+
+
+async def delete_report(key: str) -> None:
+    """Remove a stored report; missing files are ignored."""
+    await asyncio.to_thread(report_path(key).unlink, missing_ok=True)
@@ -10,14 +10,19 @@ Benefits:
 - Optimizable (query tuning in one place)
 """
 
+import asyncio
 import hashlib
+import time
+from collections import namedtuple
 from datetime import datetime, timedelta, timezone
-from typing import Sequence
+from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy import select, func, desc, and_, or_, update
+from sqlalchemy import select, func, desc, and_, or_, update, cast, case, bindparam, event, Text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
 
+from app.cache import TTLCache
 from app.models import (
     VulnerabilityScan,
     VulnerabilityDetail,
@@ -25,6 +30,106 @@ from app.models import (
     ScanStatus,
     ComplianceStatus,
 )
+from app.schemas import VulnerabilityCountsArray
+
+
+# Dashboard analytics are polled at ~1s resolution with identical inputs;
+# a few seconds of staleness lets repeat calls skip the database entirely.
+# Only plain tuples/dicts are cached (never ORM objects bound to a session),
+# and the cache is cleared whenever this process flushes a scan change.
+ANALYTICS_CACHE_TTL_SECONDS = 5
+_analytics_cache = TTLCache(ttl_seconds=ANALYTICS_CACHE_TTL_SECONDS, maxsize=32)
+
+
+@event.listens_for(Session, "after_flush")
+def _clear_analytics_on_scan_write(session: Session, flush_context: Any) -> None:
+    """Drop cached analytics once a flush inserts, updates or deletes a scan."""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, VulnerabilityScan):
+            _analytics_cache.clear()
+            return
+
+# Scan states that count as "pending" (queued or still being worked on)
+IN_PROGRESS_STATES: tuple[ScanStatus, ...] = (
+    ScanStatus.pending,
+    ScanStatus.pulling,
+    ScanStatus.scanning,
+    ScanStatus.parsing,
+)
+
+# Labels of the dashboard aggregate row, in _dashboard_aggregate_exprs order
+DashboardAggregates = namedtuple(
+    "DashboardAggregates",
+    ["total", "completed", "failed", "pending", "compliant", "avg_risk_score"],
+)
+
+# One get_top_vulnerable_images entry, in select order
+TopVulnerableImage = namedtuple(
+    "TopVulnerableImage",
+    ["full_image", "risk_score", "critical_count", "high_count",
+     "is_compliant", "created_at"],
+)
+
+
+def _dashboard_aggregate_exprs() -> list:
+    """Unlabeled dashboard aggregates, in DashboardAggregates field order."""
+    status = VulnerabilityScan.status
+    completed = status == ScanStatus.completed
+    return [
+        func.count(),
+        func.count().filter(completed),
+        func.count().filter(status == ScanStatus.failed),
+        func.count().filter(status.in_(IN_PROGRESS_STATES)),
+        func.count().filter(
+            and_(completed, VulnerabilityScan.is_compliant.is_(True))
+        ),
+        func.avg(VulnerabilityScan.risk_score).filter(completed),
+    ]
+
+
+# Completed-within-TTL or in-progress scan for an image, built once at
+# import (values are bound per call). Completed scans sort first so a cache
+# hit wins over an in-progress scan.
+_REUSABLE_SCAN_STMT = (
+    select(VulnerabilityScan)
+    .where(
+        VulnerabilityScan.image_name == bindparam("image_name"),
+        VulnerabilityScan.image_tag == bindparam("image_tag"),
+        VulnerabilityScan.registry == bindparam("registry"),
+        or_(
+            and_(
+                VulnerabilityScan.status == ScanStatus.completed,
+                VulnerabilityScan.created_at >= bindparam("cutoff"),
+            ),
+            VulnerabilityScan.status.in_(IN_PROGRESS_STATES),
+        ),
+    )
+    .order_by(
+        case((VulnerabilityScan.status == ScanStatus.completed, 0), else_=1),
+        desc(VulnerabilityScan.created_at),
+    )
+    .limit(1)
+)
+
+# Columns backing ScanSummaryResponse; list pages load nothing else
+_SCAN_SUMMARY_LOAD = load_only(
+    VulnerabilityScan.id,
+    VulnerabilityScan.image_name,
+    VulnerabilityScan.image_tag,
+    VulnerabilityScan.registry,
+    VulnerabilityScan.full_image,
+    VulnerabilityScan.status,
+    VulnerabilityScan.error_message,
+    VulnerabilityScan.risk_score,
+    VulnerabilityScan.is_compliant,
+    VulnerabilityScan.total_vulnerabilities,
+    VulnerabilityScan.critical_count,
+    VulnerabilityScan.high_count,
+    VulnerabilityScan.fixable_count,
+    VulnerabilityScan.scan_duration,
+    VulnerabilityScan.created_at,
+    VulnerabilityScan.completed_at,
+)
 
 
 class ScanRepository:
@@ -47,6 +152,7 @@ class ScanRepository:
         image_tag: str,
         registry: str,
         cache_window_minutes: int = 60,
+        content_sha256: str | None = None,
     ) -> str:
         """
         Generate unique idempotency key for each scan.
@@ -56,11 +162,21 @@ class ScanRepository:
         - Each scan gets a unique key even for the same image
         - Maintains the original format for audit/tracking purposes
         
+        Content-addressed uploads:
+        - When `content_sha256` is given (uploaded tarballs) the key is derived
+          from the content hash alone, so identical bytes map to the same key
+          regardless of the generated image name/tag
+        
         Format: hash(registry/image:tag:timestamp_ms)
+                hash(registry/sha256:<content_sha256>) for uploads
         """
-        # Use high-precision timestamp for uniqueness
-        now = datetime.now(timezone.utc)
-        timestamp_ms = int(now.timestamp() * 1000)  # Milliseconds for uniqueness
+        if content_sha256:
+            key_source = f"{registry}/sha256:{content_sha256}"
+            return hashlib.sha256(key_source.encode()).hexdigest()[:32]
+        
+        # Use high-precision timestamp for uniqueness (epoch milliseconds,
+        # read straight from the clock without building a datetime)
+        timestamp_ms = time.time_ns() // 1_000_000
         
         # Create unique hash for each scan request
         key_source = f"{registry}/{image_name}:{image_tag}:{timestamp_ms}"
@@ -104,6 +220,66 @@ class ScanRepository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
     
+    async def find_cached_or_in_progress(
+        self,
+        image_name: str,
+        image_tag: str,
+        registry: str,
+        max_age_minutes: int = 60,
+    ) -> VulnerabilityScan | None:
+        """
+        Find a cached (completed within max_age) or in-progress scan in one query.
+        
+        Replaces find_cached_scan followed by a separate in-progress lookup.
+        The caller tells the two apart by status.
+        """
+        cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=max_age_minutes)
+        result = await self.session.execute(
+            _REUSABLE_SCAN_STMT,
+            {
+                "image_name": image_name,
+                "image_tag": image_tag,
+                "registry": registry,
+                "cutoff": cutoff_time,
+            },
+        )
+        return result.scalar_one_or_none()
+    
+    async def find_by_content_digest(
+        self,
+        content_sha256: str,
+        max_age_minutes: int = 60,
+    ) -> VulnerabilityScan | None:
+        """
+        Find a reusable scan of identical uploaded content.
+        
+        Lets re-uploads of the same tarball reuse the existing scan instead
+        of running Trivy over the same bytes again. Like image scans, only a
+        scan completed within max_age (the vulnerability DB moves on) or one
+        still in progress is reused.
+        """
+        cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=max_age_minutes)
+        
+        stmt = (
+            select(VulnerabilityScan)
+            .where(
+                and_(
+                    VulnerabilityScan.content_sha256 == content_sha256,
+                    or_(
+                        and_(
+                            VulnerabilityScan.status == ScanStatus.completed,
+                            VulnerabilityScan.created_at >= cutoff_time,
+                        ),
+                        VulnerabilityScan.status.in_(IN_PROGRESS_STATES),
+                    ),
+                )
+            )
+            .order_by(desc(VulnerabilityScan.created_at))
+            .limit(1)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+    
     async def find_by_idempotency_key(
         self,
         idempotency_key: str,
@@ -120,16 +296,58 @@ class ScanRepository:
     # =========================================================================
     
     async def create(self, scan: VulnerabilityScan) -> VulnerabilityScan:
-        """Create new scan record."""
+        """
+        Create new scan record.
+        
+        The INSERT uses RETURNING for every server-generated column
+        (timestamps, generated risk/display columns), so the instance is
+        complete after the flush without a follow-up SELECT.
+        """
         self.session.add(scan)
-        await self.session.flush()  # Get the generated ID
-        await self.session.refresh(scan)
+        await self.session.flush()
         return scan
     
     async def get_by_id(self, scan_id: UUID) -> VulnerabilityScan | None:
         """Get scan by primary key."""
         return await self.session.get(VulnerabilityScan, scan_id)
     
+    async def get_status_fields(self, scan_id: UUID) -> VulnerabilityScan | None:
+        """
+        Get a scan with only the fields the status poll reads.
+        
+        load_only keeps the JSONB report and every other column out of the
+        SELECT.
+        """
+        stmt = (
+            select(VulnerabilityScan)
+            .where(VulnerabilityScan.id == scan_id)
+            .options(
+                load_only(
+                    VulnerabilityScan.id,
+                    VulnerabilityScan.status,
+                    VulnerabilityScan.error_message,
+                    VulnerabilityScan.created_at,
+                    VulnerabilityScan.updated_at,
+                )
+            )
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+    
+    async def get_raw_report_bytes(self, scan_id: UUID) -> bytes | None:
+        """
+        Fetch the raw Trivy report as encoded JSON, without decoding it.
+        
+        Casting the JSONB column to text makes PostgreSQL return the JSON
+        string, skipping the driver's JSON deserializer entirely.
+        """
+        stmt = select(cast(VulnerabilityScan.raw_report, Text)).where(
+            VulnerabilityScan.id == scan_id
+        )
+        result = await self.session.execute(stmt)
+        raw = result.scalar_one_or_none()
+        return raw.encode() if raw is not None else None
+    
     async def update(self, scan: VulnerabilityScan) -> VulnerabilityScan:
         """Update existing scan (scan must be attached to session)."""
         await self.session.flush()
@@ -178,11 +396,14 @@ class ScanRepository:
         """
         List scans with filtering and pagination.
         
+        Only the ScanSummaryResponse columns are loaded; the JSONB report
+        and image metadata never leave the database for a list page.
+        
         Returns:
             Tuple of (scans list, total count)
         """
         # Base query
-        query = select(VulnerabilityScan)
+        query = select(VulnerabilityScan).options(_SCAN_SUMMARY_LOAD)
         count_query = select(func.count(VulnerabilityScan.id))
         
         # Apply filters
@@ -193,6 +414,9 @@ class ScanRepository:
             # Case-insensitive LIKE search
             filters.append(VulnerabilityScan.image_name.ilike(f"%{image_name_filter}%"))
         if compliant_only:
+            # is_compliant is generated from the counts, so unfinished scans
+            # (all counts zero) would otherwise look compliant
+            filters.append(VulnerabilityScan.status == ScanStatus.completed)
             filters.append(VulnerabilityScan.is_compliant == True)
         
         if filters:
@@ -300,12 +524,98 @@ class ScanRepository:
         result = await self.session.execute(stmt)
         return result.scalars().all()
     
+    async def get_trend_counts(
+        self,
+        image_name: str,
+        image_tag: str,
+        days: int = 30,
+    ) -> VulnerabilityCountsArray:
+        """
+        Get the count columns of an image's scan history as parallel arrays.
+        
+        Selects only the trend columns (never raw_report), ordered by time,
+        and packs them column-wise for analytics.
+        """
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+        
+        stmt = (
+            select(
+                VulnerabilityScan.created_at,
+                VulnerabilityScan.critical_count,
+                VulnerabilityScan.high_count,
+                VulnerabilityScan.medium_count,
+                VulnerabilityScan.low_count,
+                VulnerabilityScan.total_vulnerabilities,
+                VulnerabilityScan.risk_score,
+                VulnerabilityScan.is_compliant,
+            )
+            .where(
+                and_(
+                    VulnerabilityScan.image_name == image_name,
+                    VulnerabilityScan.image_tag == image_tag,
+                    VulnerabilityScan.status == ScanStatus.completed,
+                    VulnerabilityScan.created_at >= cutoff_date,
+                )
+            )
+            .order_by(VulnerabilityScan.created_at)
+        )
+        result = await self.session.execute(stmt)
+        return VulnerabilityCountsArray.from_rows(result.tuples())
+    
+    async def get_dashboard_aggregates(self) -> DashboardAggregates:
+        """
+        Dashboard counts and averages in a single round-trip.
+        
+        Returns total, completed, failed, pending, compliant and
+        avg_risk_score (None when nothing has completed). Aggregation happens
+        in PostgreSQL, so no scan rows are transferred or hydrated. Results
+        are cached in-process for ANALYTICS_CACHE_TTL_SECONDS.
+        """
+        cached = _analytics_cache.get("dashboard_aggregates")
+        if cached is not None:
+            return cached
+        
+        stmt = select(
+            *(
+                expr.label(name)
+                for name, expr in zip(
+                    DashboardAggregates._fields, _dashboard_aggregate_exprs()
+                )
+            )
+        )
+        
+        result = await self.session.execute(stmt)
+        aggregates = DashboardAggregates(*result.one())
+        _analytics_cache.set("dashboard_aggregates", aggregates)
+        return aggregates
+    
+    async def get_recent_scans(self, limit: int = 10) -> Sequence[VulnerabilityScan]:
+        """
+        The most recent scans, newest first.
+        
+        Walks ix_scans_list_order backwards and stops after `limit` rows;
+        only the ScanSummaryResponse columns are loaded.
+        """
+        stmt = (
+            select(VulnerabilityScan)
+            .options(_SCAN_SUMMARY_LOAD)
+            .order_by(desc(VulnerabilityScan.created_at), desc(VulnerabilityScan.id))
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+    
     async def get_compliance_summary(self) -> dict:
         """
         Get aggregate compliance statistics.
         
         Returns counts of compliant, non-compliant, and pending review scans.
+        Results are cached in-process for ANALYTICS_CACHE_TTL_SECONDS.
         """
+        cached = _analytics_cache.get("compliance_summary")
+        if cached is not None:
+            return cached
+        
         stmt = (
             select(
                 VulnerabilityScan.compliance_status,
@@ -318,17 +628,28 @@ class ScanRepository:
         result = await self.session.execute(stmt)
         rows = result.all()
         
-        return {row.compliance_status.value: row.count for row in rows}
+        summary = {row.compliance_status.value: row.count for row in rows}
+        _analytics_cache.set("compliance_summary", summary)
+        return summary
     
     async def get_top_vulnerable_images(
         self,
         limit: int = 10,
-    ) -> Sequence[VulnerabilityScan]:
+    ) -> list[TopVulnerableImage]:
         """
         Get images with highest risk scores.
         
         Returns latest scan for each unique image, ordered by risk score.
+        Only the columns the dashboard shows are selected, as plain rows
+        (full_image, risk_score, critical_count, high_count, is_compliant,
+        created_at) - no ORM hydration and no JSONB report transfer.
+        Results are cached in-process per `limit` for ANALYTICS_CACHE_TTL_SECONDS.
         """
+        cache_key = ("top_vulnerable_images", limit)
+        cached = _analytics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Subquery to get latest scan ID for each image
         latest_scan_subq = (
             select(
@@ -342,7 +663,14 @@ class ScanRepository:
         )
         
         stmt = (
-            select(VulnerabilityScan)
+            select(
+                VulnerabilityScan.full_image,
+                VulnerabilityScan.risk_score,
+                VulnerabilityScan.critical_count,
+                VulnerabilityScan.high_count,
+                VulnerabilityScan.is_compliant,
+                VulnerabilityScan.created_at,
+            )
             .join(
                 latest_scan_subq,
                 and_(
@@ -356,7 +684,64 @@ class ScanRepository:
         )
         
         result = await self.session.execute(stmt)
-        return result.scalars().all()
+        images = [TopVulnerableImage(*row) for row in result]
+        _analytics_cache.set(cache_key, images)
+        return images
+
+
+class ScanLoader:
+    """
+    DataLoader-style coalescer for scan lookups by primary key.
+    
+    Every load() issued in the same event-loop tick is answered by one
+    SELECT ... WHERE id IN (...). Results are matched back to callers by
+    id, never by position (the database returns rows in any order), and
+    repeated ids share one future. Request-scoped: one loader per session.
+    """
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._pending: dict[UUID, asyncio.Future] = {}
+        self._batch_tasks: set[asyncio.Task] = set()
+    
+    def load(self, scan_id: UUID) -> "asyncio.Future[VulnerabilityScan | None]":
+        """Schedule `scan_id` for the current tick's batch; await the result."""
+        future = self._pending.get(scan_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = self._pending[scan_id] = loop.create_future()
+        return future
+    
+    def _dispatch(self) -> None:
+        batch, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._load_batch(batch))
+        # Keep a strong reference until the batch finishes
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _load_batch(self, batch: dict[UUID, asyncio.Future]) -> None:
+        try:
+            if len(batch) == 1:
+                # Lone lookup: session.get can answer from the identity map
+                (scan_id,) = batch
+                found = {scan_id: await self.session.get(VulnerabilityScan, scan_id)}
+            else:
+                result = await self.session.execute(
+                    select(VulnerabilityScan).where(VulnerabilityScan.id.in_(batch))
+                )
+                found = {scan.id: scan for scan in result.scalars()}
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for scan_id, future in batch.items():
+            # Callers that were cancelled meanwhile are skipped
+            if not future.done():
+                future.set_result(found.get(scan_id))
 
 
 class VulnerabilityDetailRepository:
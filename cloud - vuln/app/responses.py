@@ -0,0 +1,44 @@
+"""
+Response Classes
+================
+Starlette/FastAPI response types shared by the routes.
+
+Design Decisions:
+- ModelJSONResponse renders with a model's generated `encode()` when it has
+  one (see app/schemas.py:_compile_encoder), skipping Pydantic's serializer
+- Anything else (dicts, lists, plain models) is encoded with orjson
+- Subclasses JSONResponse directly; FastAPI's ORJSONResponse is deprecated
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    JSON response for schema objects returned directly from a route.
+    
+    Usage:
+        return ModelJSONResponse(summary)
+        return ModelJSONResponse([summary, ...])
+    """
+    
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return _render_model(content)
+        
+        if isinstance(content, list) and content and isinstance(content[0], BaseModel):
+            return b"".join((b"[", b",".join(map(_render_model, content)), b"]"))
+        
+        return orjson.dumps(content)
+
+
+def _render_model(model: BaseModel) -> bytes:
+    """Encode one model, preferring its generated encoder."""
+    encode = getattr(model, "encode", None)
+    if encode is not None:
+        return encode()
+    return model.__pydantic_serializer__.to_json(model)
@@ -2,19 +2,40 @@
 Upload endpoint for Docker image tarballs and Dockerfiles
 """
 
+import hashlib
+import logging
 import os
 import uuid
 import shutil
 import tempfile
 import asyncio
+from dataclasses import asdict, dataclass
 from pathlib import Path
 
+import orjson
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
+from sqlalchemy import cast, literal
+from sqlalchemy.dialects.postgresql import JSONB
 
+try:
+    import ijson
+except ImportError:  # Streaming parse is an optimization; fall back to orjson
+    ijson = None
+
+from app import report_store
+from app.config import settings
 from app.database import get_db_session
 from app.models import VulnerabilityScan, ScanStatus
-from app.worker import process_scan_job
+from app.repositories import ScanRepository
+from app.worker import (
+    SEVERITY_CODES,
+    STREAMING_PARSE_THRESHOLD,
+    get_parse_pool,
+    process_scan_job,
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -27,6 +48,11 @@ UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "/tmp/vulnscan_uploads"))
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 
+async def _remove_upload_dir(upload_path: Path | str) -> None:
+    """Delete an upload directory in a thread; unlinking a multi-GB tarball blocks."""
+    await asyncio.to_thread(shutil.rmtree, upload_path, ignore_errors=True)
+
+
 @router.post("/scan/upload")
 async def upload_and_scan(
     background_tasks: BackgroundTasks,
@@ -69,20 +95,25 @@ async def upload_and_scan(
         # Save uploaded file
         file_path = upload_path / (file.filename or f"upload.{type}")
         
-        # Stream file to disk with size check
+        # Stream file to disk with size check, hashing each chunk as it
+        # passes so the content digest costs no extra read of the file
         total_size = 0
+        hasher = hashlib.sha256()
         with open(file_path, "wb") as f:
             while chunk := await file.read(1024 * 1024):  # 1MB chunks
                 total_size += len(chunk)
+                hasher.update(chunk)
                 if total_size > max_size:
                     # Clean up and raise error
-                    shutil.rmtree(upload_path, ignore_errors=True)
+                    await _remove_upload_dir(upload_path)
                     raise HTTPException(
                         status_code=413,
                         detail=f"File too large. Maximum size: {max_size // (1024*1024)}MB"
                     )
                 f.write(chunk)
         
+        content_sha256 = hasher.hexdigest()
+        
         # Generate image name from upload
         if type == "tarball":
             image_name = f"upload-{upload_id[:8]}"
@@ -91,12 +122,36 @@ async def upload_and_scan(
             image_name = f"dockerfile-{upload_id[:8]}"
             image_tag = "build"
         
-        # Create scan record
+        # Create scan record (or reuse a recent scan of an identical tarball)
         async with get_db_session() as session:
+            repo = ScanRepository(session)
+            existing = None
+            if type == "tarball":
+                existing = await repo.find_by_content_digest(
+                    content_sha256, max_age_minutes=settings.scan_cache_ttl_minutes
+                )
+            if existing is not None:
+                await _remove_upload_dir(upload_path)
+                return JSONResponse(
+                    status_code=200,
+                    content={
+                        "id": str(existing.id),
+                        "image_name": existing.image_name,
+                        "image_tag": existing.image_tag,
+                        "status": existing.status.value,
+                        "content_sha256": content_sha256,
+                        "message": "Identical upload already scanned. Returning existing scan.",
+                    }
+                )
+            
             scan = VulnerabilityScan(
+                idempotency_key=ScanRepository.generate_idempotency_key(
+                    image_name, image_tag, "local", content_sha256=content_sha256
+                ),
                 image_name=image_name,
                 image_tag=image_tag,
                 registry="local",
+                content_sha256=content_sha256,
                 status=ScanStatus.pending,
             )
             session.add(scan)
@@ -120,6 +175,7 @@ async def upload_and_scan(
                 "image_name": image_name,
                 "image_tag": image_tag,
                 "status": "pending",
+                "content_sha256": content_sha256,
                 "message": f"Upload received. Scan queued.",
             }
         )
@@ -128,10 +184,101 @@ async def upload_and_scan(
         raise
     except Exception as e:
         # Clean up on error
-        shutil.rmtree(upload_path, ignore_errors=True)
+        await _remove_upload_dir(upload_path)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@dataclass(frozen=True)
+class ReportSummary:
+    """
+    Aggregates extracted from a Trivy report.
+    
+    Small and picklable by design - this is all that crosses the process
+    boundary back from the parse pool; the report itself never does.
+    """
+    critical_count: int = 0
+    high_count: int = 0
+    medium_count: int = 0
+    low_count: int = 0
+    unknown_count: int = 0
+    total_vulnerabilities: int = 0
+    fixable_count: int = 0
+    unfixable_count: int = 0
+    max_cvss_score: float | None = None
+    avg_cvss_score: float | None = None
+
+
+def _iter_report_vulnerabilities(report: dict):
+    """Yield every vulnerability entry from an in-memory Trivy report."""
+    for result_item in report.get("Results") or []:
+        yield from result_item.get("Vulnerabilities") or []
+
+
+def _aggregate_vulnerabilities(vulnerabilities) -> ReportSummary:
+    """
+    Aggregate severity counts, fixability and CVSS stats in a single pass.
+    
+    Accepts any iterable of vulnerability dicts so the same code serves both
+    the in-memory report and the ijson item stream.
+    """
+    # Indexed by severity code: UNKNOWN, LOW, MEDIUM, HIGH, CRITICAL
+    severity_counts = [0] * 5
+    fixable = unfixable = 0
+    max_cvss = 0.0
+    cvss_total = 0.0
+    cvss_count = 0
+    
+    for vuln in vulnerabilities:
+        severity_counts[SEVERITY_CODES.get(vuln.get("Severity"), 0)] += 1
+        
+        if vuln.get("FixedVersion"):
+            fixable += 1
+        else:
+            unfixable += 1
+        
+        # CVSS scores
+        cvss = vuln.get("CVSS") or {}
+        for source in cvss.values():
+            if "V3Score" in source:
+                score = float(source["V3Score"])
+                cvss_total += score
+                cvss_count += 1
+                max_cvss = max(max_cvss, score)
+    
+    unknown, low, medium, high, critical = severity_counts
+    return ReportSummary(
+        critical_count=critical,
+        high_count=high,
+        medium_count=medium,
+        low_count=low,
+        unknown_count=unknown,
+        total_vulnerabilities=critical + high + medium + low + unknown,
+        fixable_count=fixable,
+        unfixable_count=unfixable,
+        max_cvss_score=max_cvss if max_cvss > 0 else None,
+        avg_cvss_score=cvss_total / cvss_count if cvss_count else None,
+    )
+
+
+def parse_trivy_report(output_file: str) -> ReportSummary:
+    """
+    Parse a Trivy JSON report file into a ReportSummary.
+    
+    Runs inside the parse process pool. Small reports take the orjson fast
+    path; reports above STREAMING_PARSE_THRESHOLD are streamed through ijson
+    one vulnerability at a time so peak memory is one item, not the tree.
+    """
+    path = Path(output_file)
+    if ijson is None or path.stat().st_size < STREAMING_PARSE_THRESHOLD:
+        report = orjson.loads(path.read_bytes())
+        return _aggregate_vulnerabilities(_iter_report_vulnerabilities(report))
+    
+    with open(path, "rb") as f:
+        return _aggregate_vulnerabilities(
+            ijson.items(f, "Results.item.Vulnerabilities.item", use_float=True)
+        )
+
+
 async def process_uploaded_scan(
     scan_id: str,
     upload_path: str,
@@ -140,7 +287,6 @@ async def process_uploaded_scan(
 ):
     """Background task to process uploaded image scan."""
     import subprocess
-    import json
     from datetime import datetime, timezone
     
     upload_path = Path(upload_path)
@@ -206,59 +352,37 @@ async def process_uploaded_scan(
                 return
             
             if output_file.exists():
-                with open(output_file) as f:
-                    raw_report = json.load(f)
-                
-                scan.raw_report = raw_report
                 scan.status = ScanStatus.parsing
                 await session.commit()
                 
-                # Parse vulnerabilities
-                critical = high = medium = low = unknown = 0
-                fixable = unfixable = 0
-                max_cvss = 0.0
-                cvss_scores = []
+                # Aggregate in the process pool; only the small summary comes back
+                loop = asyncio.get_running_loop()
+                summary = await loop.run_in_executor(
+                    get_parse_pool(), parse_trivy_report, str(output_file)
+                )
                 
-                for result_item in raw_report.get("Results", []):
-                    for vuln in result_item.get("Vulnerabilities", []):
-                        severity = vuln.get("Severity", "UNKNOWN").upper()
-                        if severity == "CRITICAL":
-                            critical += 1
-                        elif severity == "HIGH":
-                            high += 1
-                        elif severity == "MEDIUM":
-                            medium += 1
-                        elif severity == "LOW":
-                            low += 1
-                        else:
-                            unknown += 1
-                        
-                        if vuln.get("FixedVersion"):
-                            fixable += 1
-                        else:
-                            unfixable += 1
-                        
-                        # CVSS scores
-                        cvss = vuln.get("CVSS", {})
-                        for source in cvss.values():
-                            if "V3Score" in source:
-                                score = source["V3Score"]
-                                cvss_scores.append(score)
-                                max_cvss = max(max_cvss, score)
+                if report_store.is_enabled():
+                    # Keep Trivy's bytes on disk; the row only references them
+                    scan.raw_report_key = await report_store.save_report_file(
+                        scan.id, output_file
+                    )
+                elif output_file.stat().st_size < STREAMING_PARSE_THRESHOLD:
+                    # Hand the raw JSON text to PostgreSQL as a JSONB cast - the
+                    # database parses it, so Python never decodes the full report
+                    report_text = await asyncio.to_thread(output_file.read_text)
+                    scan.raw_report = cast(literal(report_text), JSONB)
+                else:
+                    # Too large to bind as one parameter; only kept with RAW_REPORT_DIR
+                    scan.raw_report_omitted = True
+                    logger.warning(
+                        "Raw report for scan %s exceeds %d bytes and "
+                        "RAW_REPORT_DIR is unset; not storing it",
+                        scan_id, STREAMING_PARSE_THRESHOLD,
+                    )
                 
-                # Update scan record
-                scan.critical_count = critical
-                scan.high_count = high
-                scan.medium_count = medium
-                scan.low_count = low
-                scan.unknown_count = unknown
-                scan.total_vulnerabilities = critical + high + medium + low + unknown
-                scan.fixable_count = fixable
-                scan.unfixable_count = unfixable
-                scan.risk_score = (critical * 100) + (high * 50) + (medium * 10) + (low * 1)
-                scan.max_cvss_score = max_cvss if max_cvss > 0 else None
-                scan.avg_cvss_score = sum(cvss_scores) / len(cvss_scores) if cvss_scores else None
-                scan.is_compliant = critical == 0 and high == 0
+                # Update scan record (single UPDATE on commit)
+                for column, value in asdict(summary).items():
+                    setattr(scan, column, value)
                 scan.status = ScanStatus.completed
                 scan.completed_at = datetime.now(timezone.utc)
                 scan.scan_duration = (scan.completed_at - scan.started_at).total_seconds()
@@ -283,4 +407,4 @@ async def process_uploaded_scan(
     
     finally:
         # Clean up upload directory
-        shutil.rmtree(upload_path, ignore_errors=True)
+        await _remove_upload_dir(upload_path)
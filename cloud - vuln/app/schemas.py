@@ -5,15 +5,25 @@ Principal Architecture Decisions:
 
 1. STRICT VALIDATION: All inputs validated before processing
 2. COMPUTED FIELDS: Derived values calculated at serialization time
+   (response models are frozen, so computed fields are cached_property and
+   computed at most once per instance - never combine with
+   validate_assignment or model_copy(update=...))
 3. PARTIAL RESPONSES: Different schemas for list vs detail views
 4. ENUM ALIGNMENT: Pydantic enums match SQLAlchemy enums exactly
 """
 
 import enum
+import re
+import sys
+from array import array
+from functools import cached_property
+from operator import attrgetter
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Annotated
+from types import MappingProxyType
+from typing import Any, Annotated, Final, Iterable, Mapping, NamedTuple
 
+import orjson
 from pydantic import (
     BaseModel,
     Field,
@@ -24,6 +34,22 @@ from pydantic import (
     model_validator,
 )
 
+from app.models import fixable_ratio, risk_band
+
+
+# =============================================================================
+# VALIDATION PATTERNS - Compiled once at import, reused by every request
+# =============================================================================
+
+_IMAGE_NAME_PATTERN = r'^[a-z0-9][a-z0-9._/-]*[a-z0-9]$|^[a-z0-9]$'
+_TAG_PATTERN = r'^[\w][\w.-]{0,127}$'
+
+# ASCII: Docker references are ASCII-only, and \w would otherwise accept
+# any Unicode letter or digit in a tag. Both patterns are linear-time (no
+# nested quantifiers), so stdlib re is safe here.
+_IMAGE_NAME_RE = re.compile(_IMAGE_NAME_PATTERN, re.ASCII)
+_TAG_RE = re.compile(_TAG_PATTERN, re.ASCII)
+
 
 # =============================================================================
 # ENUMS - Mirror SQLAlchemy enums for type safety
@@ -55,6 +81,117 @@ class ComplianceStatusEnum(str, enum.Enum):
     PENDING_REVIEW = "pending_review"
 
 
+# =============================================================================
+# DISPLAY MAPPINGS - Read-only lookup tables shared by computed fields
+# =============================================================================
+
+_STATUS_EMOJI: Final[Mapping[ScanStatusEnum, str]] = MappingProxyType({
+    ScanStatusEnum.PENDING: "⏳",
+    ScanStatusEnum.PULLING: "📥",
+    ScanStatusEnum.SCANNING: "🔍",
+    ScanStatusEnum.PARSING: "📊",
+    ScanStatusEnum.COMPLETED: "✅",
+    ScanStatusEnum.FAILED: "❌",
+})
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+# Default registry; interned so the common case is an identity check
+_DOCKER_IO: Final = sys.intern("docker.io")
+
+
+# Every VulnerabilityScan attribute ScanDetailResponse is built from;
+# _SCAN_DETAIL_FIELDS fetches them in one C-level call (order matches the
+# unpack in _build_scan_detail)
+_SCAN_DETAIL_COLUMNS: Final = (
+    "id", "idempotency_key", "image_name", "image_tag", "image_digest",
+    "registry", "full_image", "status", "error_message", "error_code",
+    "retry_count", "critical_count", "high_count", "medium_count", "low_count",
+    "unknown_count", "total_vulnerabilities", "fixable_count", "unfixable_count",
+    "critical_and_high", "fixable_ratio",
+    "risk_score", "max_cvss_score", "avg_cvss_score", "is_compliant",
+    "compliance_status", "risk_level", "remediation_urgency",
+    "scan_duration", "pull_duration", "analysis_duration",
+    "worker_id", "trivy_version",
+    "created_at", "started_at", "completed_at", "updated_at",
+)
+_SCAN_DETAIL_FIELDS: Final = attrgetter(*_SCAN_DETAIL_COLUMNS)
+
+
+# Separator for upgrade paths (U+2192 RIGHTWARDS ARROW)
+_ARROW: Final = sys.intern(" \u2192 ")
+
+
+def _utcnow() -> datetime:
+    """Timezone-aware UTC now (datetime.utcnow is naive and deprecated)."""
+    return datetime.now(timezone.utc)
+
+
+def _compile_encoder(model: type[BaseModel]) -> Any:
+    """
+    Generate a specialized `encode(self) -> bytes` for a fixed-shape model.
+    
+    The function body is a single dict literal over the model's fields and
+    computed fields, handed straight to orjson - no per-field serializer
+    dispatch. orjson encodes UUID, str enums and datetimes natively, matching
+    the model's JSON output; only use this for models whose field
+    serializers agree with orjson (see tests/test_schemas.py).
+    """
+    names = (*model.model_fields, *model.model_computed_fields)
+    items = ", ".join(f"{name!r}: self.{name}" for name in names)
+    source = (
+        "def encode(self, _dumps=_dumps):\n"
+        f"    return _dumps({{{items}}})\n"
+    )
+    namespace: dict[str, Any] = {"_dumps": orjson.dumps}
+    exec(compile(source, f"<{model.__name__}.encode>", "exec"), namespace)
+    encode = namespace["encode"]
+    encode.__qualname__ = f"{model.__name__}.encode"
+    encode.__doc__ = "JSON bytes for this model (generated by _compile_encoder)"
+    return encode
+
+
+def _format_full_image(registry: str, name: str, tag: str) -> str:
+    """Display reference for an image; the default registry is omitted."""
+    if registry is _DOCKER_IO or registry == _DOCKER_IO:
+        return f"{name}:{tag}"
+    return f"{registry}/{name}:{tag}"
+
+
+def _with_full_image(data: Any) -> Any:
+    """Fill full_image for mapping input that omits it (ORM rows carry it)."""
+    if (
+        isinstance(data, Mapping)
+        and data.get("full_image") is None
+        and "image_name" in data
+        and "image_tag" in data
+    ):
+        data = dict(data)
+        data["full_image"] = _format_full_image(
+            data.get("registry", _DOCKER_IO), data["image_name"], data["image_tag"],
+        )
+    return data
+
+
+# =============================================================================
+# RESPONSE MODEL CONFIG
+# =============================================================================
+
+# Shared by every response schema (never by ScanRequest / ScanBatchRequest).
+# Response models are built from trusted data and must never be mutated:
+# frozen makes that explicit and lets computed fields be cached, and
+# revalidate_instances="never" keeps already-built nested models (e.g. the
+# metrics inside ScanDetailResponse) from being validated a second time.
+_RESPONSE_CONFIG: Final = ConfigDict(
+    from_attributes=True,
+    revalidate_instances="never",
+    frozen=True,
+    extra="ignore",
+)
+
+
 # =============================================================================
 # REQUEST SCHEMAS
 # =============================================================================
@@ -76,10 +213,12 @@ class ScanRequest(BaseModel):
         extra="forbid",             # Reject unknown fields (strict mode)
     )
     
+    # Patterns are published in the OpenAPI schema only; enforcement happens
+    # once, in the validators below, against the precompiled regexes
     image_name: Annotated[str, Field(
         min_length=1,
         max_length=255,
-        pattern=r'^[a-z0-9][a-z0-9._/-]*[a-z0-9]$|^[a-z0-9]$',
+        json_schema_extra={"pattern": _IMAGE_NAME_PATTERN},
         examples=["nginx", "python", "gcr.io/project/image"],
         description="Docker image name (without tag)",
     )]
@@ -87,13 +226,13 @@ class ScanRequest(BaseModel):
     image_tag: Annotated[str, Field(
         default="latest",
         max_length=128,
-        pattern=r'^[\w][\w.-]{0,127}$',
+        json_schema_extra={"pattern": _TAG_PATTERN},
         examples=["latest", "3.11-slim", "v1.2.3"],
         description="Image tag",
     )]
     
     registry: Annotated[str, Field(
-        default="docker.io",
+        default=_DOCKER_IO,
         max_length=255,
         examples=["docker.io", "gcr.io", "ghcr.io"],
         description="Container registry hostname",
@@ -108,27 +247,31 @@ class ScanRequest(BaseModel):
     @classmethod
     def validate_image_name(cls, v: str) -> str:
         """
-        Normalize image name:
+        Normalize and validate image name:
         - Strip leading/trailing slashes
         - Lowercase for consistency
+        - Match the Docker image name format
         """
-        return v.strip("/").lower()
+        v = v.strip("/").lower()
+        if not _IMAGE_NAME_RE.fullmatch(v):
+            raise ValueError("Invalid Docker image name format")
+        return v
     
     @field_validator("image_tag")
     @classmethod
     def validate_tag(cls, v: str) -> str:
-        """Ensure tag doesn't start with special characters"""
-        if v.startswith(("-", ".")):
+        """Ensure tag doesn't start with special characters and matches the tag format"""
+        if v[:1] in ("-", "."):
             raise ValueError("Tag cannot start with '-' or '.'")
+        if not _TAG_RE.fullmatch(v):
+            raise ValueError("Invalid image tag format")
         return v
     
     @computed_field
     @property
     def full_image_reference(self) -> str:
         """Computed full image reference for display"""
-        if self.registry != "docker.io":
-            return f"{self.registry}/{self.image_name}:{self.image_tag}"
-        return f"{self.image_name}:{self.image_tag}"
+        return _format_full_image(self.registry, self.image_name, self.image_tag)
 
 
 class ScanBatchRequest(BaseModel):
@@ -162,7 +305,7 @@ class ScanBatchRequest(BaseModel):
 class VulnerabilityCountsSchema(BaseModel):
     """Breakdown of vulnerabilities by severity"""
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _RESPONSE_CONFIG
     
     critical: int = Field(default=0, ge=0)
     high: int = Field(default=0, ge=0)
@@ -173,25 +316,43 @@ class VulnerabilityCountsSchema(BaseModel):
     fixable: int = Field(default=0, ge=0)
     unfixable: int = Field(default=0, ge=0)
     
-    @computed_field
-    @property
-    def critical_and_high(self) -> int:
-        """Combined count of Critical + High (compliance metric)"""
-        return self.critical + self.high
+    # Precomputed by the database (generated columns on VulnerabilityScan);
+    # derived here when the caller does not supply them
+    critical_and_high: int = Field(
+        default=0,
+        ge=0,
+        description="Combined count of Critical + High (compliance metric)",
+    )
+    fixable_ratio: float = Field(
+        default=1.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of vulnerabilities that are fixable (1.0 if none)",
+    )
     
-    @computed_field
-    @property
-    def fixable_ratio(self) -> float:
-        """Percentage of vulnerabilities that are fixable"""
-        if self.total == 0:
-            return 1.0  # No vulns = 100% fixable (nothing to fix)
-        return round(self.fixable / self.total, 4)
+    @model_validator(mode="before")
+    @classmethod
+    def derive_totals(cls, data: Any) -> Any:
+        """Fill critical_and_high / fixable_ratio for input without them"""
+        if isinstance(data, Mapping) and not (
+            "critical_and_high" in data and "fixable_ratio" in data
+        ):
+            data = dict(data)
+            data.setdefault(
+                "critical_and_high",
+                data.get("critical", 0) + data.get("high", 0),
+            )
+            data.setdefault(
+                "fixable_ratio",
+                fixable_ratio(data.get("fixable", 0), data.get("total", 0)),
+            )
+        return data
 
 
 class ScanTimingSchema(BaseModel):
     """Timing metrics for scan performance analysis"""
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _RESPONSE_CONFIG
     
     scan_duration: float | None = Field(
         default=None,
@@ -207,11 +368,13 @@ class ScanTimingSchema(BaseModel):
     )
     
     @computed_field
-    @property
+    @cached_property
     def overhead_duration(self) -> float | None:
         """Time spent on non-core operations (queue wait, parsing)"""
         if self.scan_duration is None:
             return None
+        if self.pull_duration is None and self.analysis_duration is None:
+            return round(self.scan_duration, 3)  # No breakdown recorded
         core = (self.pull_duration or 0) + (self.analysis_duration or 0)
         return round(self.scan_duration - core, 3)
 
@@ -219,7 +382,7 @@ class ScanTimingSchema(BaseModel):
 class RiskAssessmentSchema(BaseModel):
     """Risk scoring and compliance assessment"""
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _RESPONSE_CONFIG
     
     risk_score: int = Field(
         default=0,
@@ -240,56 +403,46 @@ class RiskAssessmentSchema(BaseModel):
     )
     is_compliant: bool = Field(
         default=False,
-        description="True if no Critical/High vulnerabilities",
+        description="True if the scan completed with no Critical/High/Medium/Low vulnerabilities",
     )
     compliance_status: ComplianceStatusEnum = Field(
         default=ComplianceStatusEnum.PENDING_REVIEW,
         description="Detailed compliance classification",
     )
     
-    @computed_field
-    @property
-    def risk_level(self) -> str:
-        """
-        Human-readable risk level based on score.
-        
-        Thresholds (Defense University Standard):
-        - CRITICAL: score >= 500 (5+ critical vulns or 10+ high)
-        - HIGH: score >= 100 (1+ critical or 2+ high)
-        - MEDIUM: score >= 30 (3+ medium)
-        - LOW: score > 0
-        - NONE: score = 0
-        """
-        if self.risk_score >= 500:
-            return "CRITICAL"
-        elif self.risk_score >= 100:
-            return "HIGH"
-        elif self.risk_score >= 30:
-            return "MEDIUM"
-        elif self.risk_score > 0:
-            return "LOW"
-        return "NONE"
     
-    @computed_field
-    @property
-    def remediation_urgency(self) -> str:
-        """
-        Recommended remediation timeline based on risk level.
-        """
-        mapping = {
-            "CRITICAL": "Immediate (within 24 hours)",
-            "HIGH": "Urgent (within 7 days)",
-            "MEDIUM": "Standard (within 30 days)",
-            "LOW": "Best-effort (within 90 days)",
-            "NONE": "No action required",
-        }
-        return mapping.get(self.risk_level, "Unknown")
+    # Precomputed by the database (generated columns on VulnerabilityScan);
+    # derived from risk_score when the caller does not supply them
+    risk_level: str = Field(
+        default="NONE",
+        description=(
+            "Risk band: CRITICAL (score >= 500), HIGH (>= 100), "
+            "MEDIUM (>= 30), LOW (> 0), NONE (0)"
+        ),
+    )
+    remediation_urgency: str = Field(
+        default="No action required",
+        description="Recommended remediation timeline for the risk band",
+    )
+    
+    @model_validator(mode="before")
+    @classmethod
+    def derive_risk_band(cls, data: Any) -> Any:
+        """Fill risk_level / remediation_urgency from risk_score if absent"""
+        if isinstance(data, Mapping) and not (
+            "risk_level" in data and "remediation_urgency" in data
+        ):
+            level, urgency = risk_band(data.get("risk_score", 0))
+            data = dict(data)
+            data.setdefault("risk_level", level)
+            data.setdefault("remediation_urgency", urgency)
+        return data
 
 
 class VulnerabilityDetailSchema(BaseModel):
     """Individual vulnerability details (from denormalized table)"""
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _RESPONSE_CONFIG
     
     id: uuid.UUID
     vulnerability_id: str = Field(
@@ -307,11 +460,13 @@ class VulnerabilityDetailSchema(BaseModel):
     published_date: datetime | None = None
     
     @computed_field
-    @property
+    @cached_property
     def upgrade_path(self) -> str | None:
         """Formatted upgrade recommendation"""
         if self.fixed_version:
-            return f"{self.package_name}: {self.package_version} → {self.fixed_version}"
+            return "".join((
+                self.package_name, ": ", self.package_version, _ARROW, self.fixed_version
+            ))
         return None
 
 
@@ -329,7 +484,7 @@ class ScanSummaryResponse(BaseModel):
     - CI/CD webhook responses
     """
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _RESPONSE_CONFIG
     
     id: uuid.UUID = Field(description="Unique scan identifier")
     
@@ -337,6 +492,10 @@ class ScanSummaryResponse(BaseModel):
     image_name: str
     image_tag: str
     registry: str
+    full_image: str | None = Field(
+        default=None,
+        description="Full image reference (generated column)",
+    )
     
     # Status
     status: ScanStatusEnum
@@ -356,31 +515,26 @@ class ScanSummaryResponse(BaseModel):
     completed_at: datetime | None = None
     
     @computed_field
-    @property
-    def full_image(self) -> str:
-        """Full image reference"""
-        if self.registry != "docker.io":
-            return f"{self.registry}/{self.image_name}:{self.image_tag}"
-        return f"{self.image_name}:{self.image_tag}"
-    
-    @computed_field
-    @property
+    @cached_property
     def status_emoji(self) -> str:
         """Status indicator for dashboards"""
-        mapping = {
-            ScanStatusEnum.PENDING: "⏳",
-            ScanStatusEnum.PULLING: "📥",
-            ScanStatusEnum.SCANNING: "🔍",
-            ScanStatusEnum.PARSING: "📊",
-            ScanStatusEnum.COMPLETED: "✅",
-            ScanStatusEnum.FAILED: "❌",
-        }
-        return mapping.get(self.status, "❓")
+        return _STATUS_EMOJI.get(self.status, "❓")
     
     @field_serializer("created_at", "completed_at")
     def serialize_datetime(self, dt: datetime | None) -> str | None:
         """ISO format datetime serialization"""
         return dt.isoformat() if dt else None
+    
+    @model_validator(mode="before")
+    @classmethod
+    def derive_full_image(cls, data: Any) -> Any:
+        """Fill full_image from registry/name/tag when not supplied"""
+        return _with_full_image(data)
+
+
+# Hottest response model: serialize it without Pydantic's serializer
+# (see app/responses.py:ModelJSONResponse)
+ScanSummaryResponse.encode = _compile_encoder(ScanSummaryResponse)
 
 
 class ScanDetailResponse(BaseModel):
@@ -392,7 +546,7 @@ class ScanDetailResponse(BaseModel):
     - Detailed compliance reports
     """
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _RESPONSE_CONFIG
     
     id: uuid.UUID
     idempotency_key: str | None = None
@@ -402,6 +556,10 @@ class ScanDetailResponse(BaseModel):
     image_tag: str
     image_digest: str | None = None
     registry: str
+    full_image: str | None = Field(
+        default=None,
+        description="Full image reference (generated column)",
+    )
     
     # Status
     status: ScanStatusEnum
@@ -424,73 +582,117 @@ class ScanDetailResponse(BaseModel):
     completed_at: datetime | None = None
     updated_at: datetime
     
-    # Raw data (only included if requested)
-    raw_report: dict | None = Field(
-        default=None,
-        description="Full Trivy JSON output (large payload)",
-    )
-    
     @model_validator(mode="before")
     @classmethod
-    def build_nested_objects(cls, data: Any) -> Any:
+    def derive_full_image(cls, data: Any) -> Any:
+        """Fill full_image from registry/name/tag when not supplied"""
+        return _with_full_image(data)
+    
+    @classmethod
+    def from_orm_fast(cls, data: Any) -> "ScanDetailResponse":
         """
-        Transform flat ORM model attributes into nested schema objects.
+        Build the response from a trusted VulnerabilityScan row without validation.
         
-        This handles the mapping from:
-            VulnerabilityScan.critical_count -> VulnerabilityCountsSchema.critical
+        Rows coming out of SQLAlchemy are already typed and constrained by the
+        database, so re-validating them is pure overhead on GET /scans/{id}.
+        Validation is deliberately bypassed via model_construct; keep
+        model_validate for untrusted inbound data (ScanRequest /
+        ScanBatchRequest).
         """
-        if hasattr(data, "__dict__"):
-            # SQLAlchemy model - convert to dict-like access
-            return {
-                "id": data.id,
-                "idempotency_key": data.idempotency_key,
-                "image_name": data.image_name,
-                "image_tag": data.image_tag,
-                "image_digest": data.image_digest,
-                "registry": data.registry,
-                "status": data.status,
-                "error_message": data.error_message,
-                "error_code": data.error_code,
-                "retry_count": data.retry_count,
-                "vulnerability_counts": {
-                    "critical": data.critical_count,
-                    "high": data.high_count,
-                    "medium": data.medium_count,
-                    "low": data.low_count,
-                    "unknown": data.unknown_count,
-                    "total": data.total_vulnerabilities,
-                    "fixable": data.fixable_count,
-                    "unfixable": data.unfixable_count,
-                },
-                "risk_assessment": {
-                    "risk_score": data.risk_score,
-                    "max_cvss_score": data.max_cvss_score,
-                    "avg_cvss_score": data.avg_cvss_score,
-                    "is_compliant": data.is_compliant,
-                    "compliance_status": data.compliance_status,
-                },
-                "timing": {
-                    "scan_duration": data.scan_duration,
-                    "pull_duration": data.pull_duration,
-                    "analysis_duration": data.analysis_duration,
-                },
-                "worker_id": data.worker_id,
-                "trivy_version": data.trivy_version,
-                "created_at": data.created_at,
-                "started_at": data.started_at,
-                "completed_at": data.completed_at,
-                "updated_at": data.updated_at,
-                "raw_report": data.raw_report,
-            }
-        return data
+        return _build_scan_detail(data)
+    
+    @classmethod
+    def from_rows(cls, rows: Iterable[Any]) -> list["ScanDetailResponse"]:
+        """Build responses for many trusted rows (see from_orm_fast)."""
+        return list(map(_build_scan_detail, rows))
     
     @computed_field
-    @property
-    def full_image(self) -> str:
-        """Full image reference"""
-        if self.registry != "docker.io":
-            return f"{self.registry}/{self.image_name}:{self.image_tag}"
-        return f"{self.image_name}:{self.image_tag}"
+    @cached_property
+    def raw_report_url(self) -> str:
+        """
+        Where to fetch the full Trivy JSON output.
+        
+        The report is never embedded here; the endpoint streams the stored
+        bytes without decoding them.
+        """
+        return f"/api/v1/scans/{self.id}/raw_report"
+
+
+def _build_scan_detail(
+    row: Any,
+    *,
+    _fields=_SCAN_DETAIL_FIELDS,
+    _detail=ScanDetailResponse.model_construct,
+    _counts=VulnerabilityCountsSchema.model_construct,
+    _risk=RiskAssessmentSchema.model_construct,
+    _timing=ScanTimingSchema.model_construct,
+    _status=ScanStatusEnum,
+    _compliance=ComplianceStatusEnum,
+) -> ScanDetailResponse:
+    """
+    Construct one ScanDetailResponse straight from a row's attributes.
+    
+    No intermediate dicts: the nested models are constructed in place from
+    keyword arguments. Collaborators are bound as keyword defaults so the
+    per-row calls in ScanDetailResponse.from_rows are local lookups.
+    """
+    (
+        scan_id, idempotency_key, image_name, image_tag, image_digest,
+        registry, full_image, status, error_message, error_code, retry_count,
+        critical, high, medium, low,
+        unknown, total, fixable, unfixable, critical_and_high, fixable_ratio,
+        risk_score, max_cvss_score, avg_cvss_score, is_compliant,
+        compliance_status, risk_level, remediation_urgency,
+        scan_duration, pull_duration, analysis_duration,
+        worker_id, trivy_version,
+        created_at, started_at, completed_at, updated_at,
+    ) = _fields(row)
+    
+    return _detail(
+        id=scan_id,
+        idempotency_key=idempotency_key,
+        image_name=image_name,
+        image_tag=image_tag,
+        image_digest=image_digest,
+        registry=registry,
+        full_image=full_image,
+        status=_status(status),
+        error_message=error_message,
+        error_code=error_code,
+        retry_count=retry_count,
+        vulnerability_counts=_counts(
+            critical=critical,
+            high=high,
+            medium=medium,
+            low=low,
+            unknown=unknown,
+            total=total,
+            fixable=fixable,
+            unfixable=unfixable,
+            critical_and_high=critical_and_high,
+            fixable_ratio=fixable_ratio,
+        ),
+        risk_assessment=_risk(
+            risk_score=risk_score,
+            max_cvss_score=max_cvss_score,
+            avg_cvss_score=avg_cvss_score,
+            is_compliant=is_compliant,
+            compliance_status=_compliance(compliance_status),
+            risk_level=risk_level,
+            remediation_urgency=remediation_urgency,
+        ),
+        timing=_timing(
+            scan_duration=scan_duration,
+            pull_duration=pull_duration,
+            analysis_duration=analysis_duration,
+        ),
+        worker_id=worker_id,
+        trivy_version=trivy_version,
+        created_at=created_at,
+        started_at=started_at,
+        completed_at=completed_at,
+        updated_at=updated_at,
+    )
 
 
 class ScanCreatedResponse(BaseModel):
@@ -500,6 +702,8 @@ class ScanCreatedResponse(BaseModel):
     Includes cache_hit flag to inform client if result is from cache.
     """
     
+    model_config = _RESPONSE_CONFIG
+    
     id: uuid.UUID
     status: ScanStatusEnum
     full_image: str
@@ -517,7 +721,7 @@ class ScanCreatedResponse(BaseModel):
     )
     
     @computed_field
-    @property
+    @cached_property
     def poll_url(self) -> str:
         """URL to poll for status updates"""
         return f"/api/v1/scans/{self.id}"
@@ -530,6 +734,8 @@ class ScanCreatedResponse(BaseModel):
 class PaginationMeta(BaseModel):
     """Pagination metadata for list responses"""
     
+    model_config = _RESPONSE_CONFIG
+    
     total: int = Field(ge=0, description="Total number of items")
     page: int = Field(ge=1, description="Current page number")
     page_size: int = Field(ge=1, le=100, description="Items per page")
@@ -541,22 +747,35 @@ class PaginationMeta(BaseModel):
 class ScanListResponse(BaseModel):
     """Paginated list of scan summaries"""
     
+    model_config = _RESPONSE_CONFIG
+    
     items: list[ScanSummaryResponse]
     pagination: PaginationMeta
     
+    @cached_property
+    def _page_stats(self) -> tuple[int, int]:
+        """(compliant count, risk score sum) for this page, in one pass"""
+        compliant = 0
+        risk_sum = 0
+        for item in self.items:
+            if item.is_compliant:
+                compliant += 1
+            risk_sum += item.risk_score
+        return compliant, risk_sum
+    
     @computed_field
-    @property
+    @cached_property
     def compliant_count(self) -> int:
         """Count of compliant scans in this page"""
-        return sum(1 for item in self.items if item.is_compliant)
+        return self._page_stats[0]
     
     @computed_field
-    @property
+    @cached_property
     def avg_risk_score(self) -> float:
         """Average risk score for this page"""
         if not self.items:
             return 0.0
-        return round(sum(i.risk_score for i in self.items) / len(self.items), 2)
+        return round(self._page_stats[1] / len(self.items), 2)
 
 
 # =============================================================================
@@ -566,6 +785,8 @@ class ScanListResponse(BaseModel):
 class VulnerabilityTrendPoint(BaseModel):
     """Single data point in a vulnerability trend"""
     
+    model_config = _RESPONSE_CONFIG
+    
     date: datetime
     total_vulnerabilities: int
     critical_count: int
@@ -574,6 +795,48 @@ class VulnerabilityTrendPoint(BaseModel):
     is_compliant: bool
 
 
+class VulnerabilityCountsArray(NamedTuple):
+    """
+    Column-oriented (struct-of-arrays) vulnerability counts for trend analytics.
+    
+    One compact typed array per metric instead of one model instance per
+    scan, so aggregates are a single C-level pass over contiguous ints.
+    Produced directly from narrow SELECT rows by
+    ScanRepository.get_trend_counts; keep the per-item Pydantic models for
+    single-item API responses.
+    """
+    created_at: list[datetime]
+    critical: array
+    high: array
+    medium: array
+    low: array
+    total: array
+    risk_score: array
+    is_compliant: array
+    
+    @classmethod
+    def from_rows(cls, rows) -> "VulnerabilityCountsArray":
+        """Build from (created_at, critical, high, medium, low, total, risk, compliant) rows."""
+        columns = cls([], array("q"), array("q"), array("q"), array("q"),
+                      array("q"), array("q"), array("b"))
+        for row in rows:
+            for column, value in zip(columns, row):
+                column.append(value)
+        return columns
+    
+    @property
+    def size(self) -> int:
+        """Number of data points"""
+        return len(self.created_at)
+    
+    @property
+    def average_risk_score(self) -> float:
+        """Average risk score across all data points"""
+        if not self.risk_score:
+            return 0.0
+        return round(sum(self.risk_score) / len(self.risk_score), 2)
+
+
 class ImageTrendResponse(BaseModel):
     """
     Vulnerability trend over time for a specific image.
@@ -581,12 +844,26 @@ class ImageTrendResponse(BaseModel):
     Use Case: "Show me the security posture of nginx:latest over the past 30 days"
     """
     
+    model_config = _RESPONSE_CONFIG
+    
     image_name: str
     image_tag: str
     data_points: list[VulnerabilityTrendPoint]
     
+    @cached_property
+    def _risk_stats(self) -> tuple[int, int, int]:
+        """(first score, last score, score sum) across data points, in one pass"""
+        first_score = last_score = risk_sum = 0
+        for index, point in enumerate(self.data_points):
+            score = point.risk_score
+            if index == 0:
+                first_score = score
+            last_score = score
+            risk_sum += score
+        return first_score, last_score, risk_sum
+    
     @computed_field
-    @property
+    @cached_property
     def trend_direction(self) -> str:
         """
         Calculate if security posture is improving or degrading.
@@ -596,8 +873,7 @@ class ImageTrendResponse(BaseModel):
         if len(self.data_points) < 2:
             return "INSUFFICIENT_DATA"
         
-        first_score = self.data_points[0].risk_score
-        last_score = self.data_points[-1].risk_score
+        first_score, last_score, _ = self._risk_stats
         
         if last_score < first_score:
             return "IMPROVING"
@@ -606,15 +882,12 @@ class ImageTrendResponse(BaseModel):
         return "STABLE"
     
     @computed_field
-    @property
+    @cached_property
     def average_risk_score(self) -> float:
         """Average risk score across all data points"""
         if not self.data_points:
             return 0.0
-        return round(
-            sum(dp.risk_score for dp in self.data_points) / len(self.data_points),
-            2
-        )
+        return round(self._risk_stats[2] / len(self.data_points), 2)
 
 
 # =============================================================================
@@ -624,6 +897,8 @@ class ImageTrendResponse(BaseModel):
 class ErrorDetail(BaseModel):
     """Structured error detail"""
     
+    model_config = _RESPONSE_CONFIG
+    
     code: str = Field(description="Machine-readable error code")
     message: str = Field(description="Human-readable error message")
     field: str | None = Field(default=None, description="Field that caused error")
@@ -633,13 +908,15 @@ class ErrorDetail(BaseModel):
 class ErrorResponse(BaseModel):
     """Standard API error response"""
     
+    model_config = _RESPONSE_CONFIG
+    
     status: str = Field(default="error")
     error: ErrorDetail
     request_id: str | None = Field(
         default=None,
         description="Request ID for tracing",
     )
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utcnow)
 
 
 # =============================================================================
@@ -649,6 +926,8 @@ class ErrorResponse(BaseModel):
 class HealthCheckResponse(BaseModel):
     """API health check response"""
     
+    model_config = _RESPONSE_CONFIG
+    
     status: str = Field(description="Overall health status")
     version: str = Field(description="API version")
     database: str = Field(description="Database connection status")
@@ -656,7 +935,7 @@ class HealthCheckResponse(BaseModel):
     uptime_seconds: float = Field(description="Service uptime")
     
     @computed_field
-    @property
+    @cached_property
     def is_healthy(self) -> bool:
         """Quick boolean health check"""
         return self.status == "healthy" and self.database == "connected"
@@ -12,18 +12,23 @@ Architecture Note:
     This allows easy testing via dependency injection.
 """
 
+import asyncio
 import logging
-from datetime import datetime, timezone
-from typing import Sequence
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Awaitable, Callable, ClassVar, Mapping, Sequence, TypeVar
 from uuid import UUID
 
 from fastapi import BackgroundTasks
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.config import settings
-from app.models import VulnerabilityScan, ScanStatus, ComplianceStatus
-from app.repositories import ScanRepository, AuditLogRepository
+from app.database import get_session_factory, notify_scan_pending
+from app.models import VulnerabilityScan, ScanAuditLog, ScanStatus, ComplianceStatus
+from app.repositories import ScanRepository, ScanLoader, AuditLogRepository
 from app.exceptions import (
     ScanNotFoundException,
     ScanAlreadyExistsException,
@@ -31,29 +36,82 @@ from app.exceptions import (
     DatabaseTransactionException,
 )
 
+# Resolved once at import; None if the worker module cannot be loaded
+try:
+    from app.worker import process_scan_job
+except ImportError:
+    process_scan_job = None
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Image reference: optional registry host (must contain a "." or be
+# "localhost", optionally with a port), repository path, optional tag
+_IMAGE_REFERENCE_RE = re.compile(
+    r"^(?:(?P<registry>(?:[^/:]+\.[^/:]+|localhost)(?::\d+)?)/)?"
+    r"(?P<name>[^:]+?)(?::(?P<tag>[^:]+))?$"
+)
+
+
+def _parse_image_reference(image_name: str) -> tuple[str | None, str, str | None]:
+    """
+    Split a raw image reference into (registry, name, tag) in a single pass.
+    
+    Missing parts are returned as None.
+    """
+    reference = image_name.lower().strip("/")
+    match = _IMAGE_REFERENCE_RE.match(reference)
+    if match is None:
+        # Unusual input (e.g. several ":"); fall back to a right-most tag split
+        name, _, tag = reference.rpartition(":")
+        return None, name or tag, tag if name else None
+    return match.group("registry", "name", "tag")
+
+
+@lru_cache(maxsize=8192)
+def _normalize_image_reference(
+    image_name: str,
+    image_tag: str | None,
+    registry: str | None,
+) -> tuple[str, str, str]:
+    """
+    Memoized body of ScanService.normalize_image_reference.
+    
+    Normalization is pure and the same few references arrive on every
+    submit and polling request, so a hit skips the regex and string work.
+    """
+    parsed_registry, final_name, parsed_tag = _parse_image_reference(image_name)
+    
+    # Explicit arguments win; the embedded part then stays in the name
+    if image_tag and parsed_tag:
+        final_name = f"{final_name}:{parsed_tag}"
+    if registry and parsed_registry:
+        final_name = f"{parsed_registry}/{final_name}"
+    
+    final_tag = image_tag or parsed_tag or "latest"
+    final_registry = registry or parsed_registry or "docker.io"
+    
+    return final_name, final_tag, final_registry
+
 
 # =============================================================================
 # DATA CLASSES - Service Layer DTOs
 # =============================================================================
 
+@dataclass(slots=True, frozen=True)
 class ScanResult:
     """
     Service-layer result object for scan operations.
     
     Encapsulates the scan entity plus metadata about how it was retrieved.
+    Created on every scan request, so it is slotted (no per-instance
+    __dict__) and immutable.
     """
     
-    def __init__(
-        self,
-        scan: VulnerabilityScan,
-        cache_hit: bool = False,
-        newly_created: bool = False,
-    ):
-        self.scan = scan
-        self.cache_hit = cache_hit
-        self.newly_created = newly_created
+    scan: VulnerabilityScan
+    cache_hit: bool = False
+    newly_created: bool = False
     
     @property
     def id(self) -> UUID:
@@ -68,32 +126,20 @@ class ScanResult:
         return self.scan.full_image_name
 
 
+@dataclass(slots=True, frozen=True)
 class DashboardStats:
     """Aggregated statistics for the dashboard."""
     
-    def __init__(
-        self,
-        total_scans: int,
-        completed_scans: int,
-        failed_scans: int,
-        pending_scans: int,
-        compliant_images: int,
-        non_compliant_images: int,
-        average_risk_score: float,
-        top_risky_images: list[dict],
-        compliance_rate: float,
-        recent_scans: list[VulnerabilityScan],
-    ):
-        self.total_scans = total_scans
-        self.completed_scans = completed_scans
-        self.failed_scans = failed_scans
-        self.pending_scans = pending_scans
-        self.compliant_images = compliant_images
-        self.non_compliant_images = non_compliant_images
-        self.average_risk_score = average_risk_score
-        self.top_risky_images = top_risky_images
-        self.compliance_rate = compliance_rate
-        self.recent_scans = recent_scans
+    total_scans: int
+    completed_scans: int
+    failed_scans: int
+    pending_scans: int
+    compliant_images: int
+    non_compliant_images: int
+    average_risk_score: float
+    top_risky_images: list[dict]
+    compliance_rate: float
+    recent_scans: list[VulnerabilityScan]
 
 
 # =============================================================================
@@ -116,16 +162,35 @@ class ScanService:
             result = await service.submit_scan_request("nginx:latest")
     """
     
-    def __init__(self, session: AsyncSession):
+    # Progress percentage reported for each scan state (static, built once)
+    _PROGRESS_MAP: ClassVar[Mapping[ScanStatus, int]] = MappingProxyType({
+        ScanStatus.pending: 0,
+        ScanStatus.pulling: 20,
+        ScanStatus.scanning: 50,
+        ScanStatus.parsing: 80,
+        ScanStatus.completed: 100,
+        ScanStatus.failed: 100,
+    })
+    
+    def __init__(
+        self,
+        session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ):
         """
         Initialize service with database session.
         
         Args:
             session: SQLAlchemy async session (injected via FastAPI dependency)
+            session_factory: Factory for the extra sessions used by concurrent
+                read-only queries (defaults to the application factory)
         """
         self.session = session
+        self._session_factory = session_factory
         self.scan_repo = ScanRepository(session)
         self.audit_repo = AuditLogRepository(session)
+        # Concurrent get_scan_by_id calls share one IN (...) query per tick
+        self.scan_loader = ScanLoader(session)
         
         # Configuration
         self.cache_ttl_minutes = settings.scan_cache_ttl_minutes
@@ -152,27 +217,7 @@ class ScanService:
         Returns:
             Tuple of (image_name, image_tag, registry)
         """
-        # Default values
-        final_tag = image_tag or "latest"
-        final_registry = registry or "docker.io"
-        final_name = image_name.lower().strip("/")
-        
-        # Handle tag embedded in image name (nginx:1.24)
-        if ":" in final_name and not image_tag:
-            parts = final_name.rsplit(":", 1)
-            final_name = parts[0]
-            final_tag = parts[1] if len(parts) > 1 else "latest"
-        
-        # Handle registry embedded in image name (gcr.io/project/image)
-        if "/" in final_name and not registry:
-            first_part = final_name.split("/")[0]
-            # Check if first part looks like a registry (contains "." or ":")
-            if "." in first_part or ":" in first_part or first_part == "localhost":
-                parts = final_name.split("/", 1)
-                final_registry = parts[0]
-                final_name = parts[1] if len(parts) > 1 else final_name
-        
-        return final_name, final_tag, final_registry
+        return _normalize_image_reference(image_name, image_tag, registry)
     
     # =========================================================================
     # SCAN RETRIEVAL
@@ -193,16 +238,16 @@ class ScanService:
             DatabaseConnectionException: If database is unavailable
         """
         try:
-            scan = await self.scan_repo.get_by_id(scan_id)
+            scan = await self.scan_loader.load(scan_id)
             
             if scan is None:
-                logger.warning(f"Scan not found: {scan_id}")
+                logger.warning("Scan not found: %s", scan_id)
                 raise ScanNotFoundException(str(scan_id))
             
             return scan
             
         except SQLAlchemyError as e:
-            logger.error(f"Database error fetching scan {scan_id}: {e}")
+            logger.error("Database error fetching scan %s: %s", scan_id, e)
             raise DatabaseConnectionException(
                 f"Failed to retrieve scan: {str(e)}"
             ) from e
@@ -211,9 +256,24 @@ class ScanService:
         """
         Get current scan status with progress information.
         
-        Returns a lightweight status object suitable for polling.
+        Returns a lightweight status object suitable for polling. Only the
+        status columns are loaded (see ScanRepository.get_status_fields).
+        
+        Raises:
+            ScanNotFoundException: If scan doesn't exist
+            DatabaseConnectionException: If database is unavailable
         """
-        scan = await self.get_scan_by_id(scan_id)
+        try:
+            scan = await self.scan_repo.get_status_fields(scan_id)
+        except SQLAlchemyError as e:
+            logger.error("Database error fetching scan status %s: %s", scan_id, e)
+            raise DatabaseConnectionException(
+                f"Failed to retrieve scan status: {str(e)}"
+            ) from e
+        
+        if scan is None:
+            logger.warning("Scan not found: %s", scan_id)
+            raise ScanNotFoundException(str(scan_id))
         
         return {
             "id": str(scan.id),
@@ -225,18 +285,9 @@ class ScanService:
             "updated_at": scan.updated_at.isoformat(),
         }
     
-    @staticmethod
-    def _calculate_progress(status: ScanStatus) -> int:
-        """Map scan status to progress percentage."""
-        progress_map = {
-            ScanStatus.pending: 0,
-            ScanStatus.pulling: 20,
-            ScanStatus.scanning: 50,
-            ScanStatus.parsing: 80,
-            ScanStatus.completed: 100,
-            ScanStatus.failed: 100,
-        }
-        return progress_map.get(status, 0)
+    # Map scan status to progress percentage: a bound dict lookup, no
+    # Python-level frame per status poll (every ScanStatus is mapped)
+    _calculate_progress = staticmethod(_PROGRESS_MAP.get)
     
     # =========================================================================
     # IDEMPOTENT SCAN SUBMISSION - Core Logic
@@ -280,9 +331,20 @@ class ScanService:
         norm_name, norm_tag, norm_registry = self.normalize_image_reference(
             image_name, image_tag, registry
         )
-        full_image = f"{norm_registry}/{norm_name}:{norm_tag}"
+        logger.info(
+            "Processing scan request for: %s/%s:%s",
+            norm_registry, norm_name, norm_tag,
+        )
         
-        logger.info(f"Processing scan request for: {full_image}")
+        # Step 2: Tracking key (pure CPU), computed before any database work.
+        # It embeds a millisecond timestamp, so it is unique per request and
+        # must not be memoized.
+        idempotency_key = ScanRepository.generate_idempotency_key(
+            image_name=norm_name,
+            image_tag=norm_tag,
+            registry=norm_registry,
+            cache_window_minutes=self.cache_ttl_minutes,
+        )
         
         try:
             # =========================================================
@@ -292,10 +354,13 @@ class ScanService:
             
             # Always create a new scan (allows multiple scans of same image)
             new_scan = await self._create_scan(
-                norm_name, norm_tag, norm_registry, triggered_by
+                norm_name, norm_tag, norm_registry, idempotency_key, triggered_by
             )
             
-            logger.info(f"Created new scan {new_scan.id} for {full_image}")
+            logger.info(
+                "Created new scan %s for %s/%s:%s",
+                new_scan.id, norm_registry, norm_name, norm_tag,
+            )
             
             # Trigger background worker for the new scan
             if background_tasks:
@@ -303,7 +368,7 @@ class ScanService:
                     trigger_worker_task,
                     scan_id=new_scan.id,
                 )
-                logger.debug(f"Queued background task for scan {new_scan.id}")
+                logger.debug("Queued background task for scan %s", new_scan.id)
             
             return ScanResult(
                 scan=new_scan,
@@ -312,7 +377,7 @@ class ScanService:
             )
             
         except SQLAlchemyError as e:
-            logger.error(f"Database error during scan submission: {e}")
+            logger.error("Database error during scan submission: %s", e)
             raise DatabaseTransactionException(
                 operation="scan_submission",
                 reason=str(e),
@@ -338,81 +403,47 @@ class ScanService:
     #     """
     #     pass
     
-    async def _check_cache(
+    async def _find_reusable_scan(
         self,
         image_name: str,
         image_tag: str,
         registry: str,
-    ) -> VulnerabilityScan | None:
+    ) -> ScanResult | None:
         """
-        Check if a valid cached scan exists.
+        Find a scan that can be returned instead of creating a new one.
         
-        Cache Criteria:
-        - Same image_name, image_tag, registry
-        - Status = COMPLETED
-        - Created within cache_ttl_minutes
+        One round-trip covers both former checks (cache, then in-progress):
+        - Cache hit: COMPLETED within cache_ttl_minutes
+        - In progress: PENDING, PULLING, SCANNING or PARSING
+        A cache hit wins when both exist.
+        
+        Note: submit_scan_request currently always creates a new scan
+        (multiple scan support) and does not call this.
         """
-        return await self.scan_repo.find_cached_scan(
+        scan = await self.scan_repo.find_cached_or_in_progress(
             image_name=image_name,
             image_tag=image_tag,
             registry=registry,
             max_age_minutes=self.cache_ttl_minutes,
         )
-    
-    async def _check_in_progress(
-        self,
-        image_name: str,
-        image_tag: str,
-        registry: str,
-    ) -> VulnerabilityScan | None:
-        """
-        Check if a scan is already in progress for this image.
-        
-        In-Progress States: PENDING, PULLING, SCANNING, PARSING
-        """
-        from sqlalchemy import select, and_
-        
-        in_progress_states = [
-            ScanStatus.pending,
-            ScanStatus.pulling,
-            ScanStatus.scanning,
-            ScanStatus.parsing,
-        ]
-        
-        stmt = (
-            select(VulnerabilityScan)
-            .where(
-                and_(
-                    VulnerabilityScan.image_name == image_name,
-                    VulnerabilityScan.image_tag == image_tag,
-                    VulnerabilityScan.registry == registry,
-                    VulnerabilityScan.status.in_(in_progress_states),
-                )
-            )
-            .limit(1)
-        )
-        
-        result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        if scan is None:
+            return None
+        return ScanResult(scan=scan, cache_hit=scan.status == ScanStatus.completed)
     
     async def _create_scan(
         self,
         image_name: str,
         image_tag: str,
         registry: str,
+        idempotency_key: str,
         triggered_by: str | None = None,
     ) -> VulnerabilityScan:
         """
         Create a new scan record in PENDING state.
-        """
-        # Generate unique idempotency key for tracking (no longer used for deduplication)
-        idempotency_key = ScanRepository.generate_idempotency_key(
-            image_name=image_name,
-            image_tag=image_tag,
-            registry=registry,
-            cache_window_minutes=self.cache_ttl_minutes,
-        )
         
+        `idempotency_key` is the tracking key from generate_idempotency_key
+        (no longer used for deduplication).
+        """
         # Create scan entity - each scan is unique regardless of image
         scan = VulnerabilityScan(
             image_name=image_name,
@@ -422,18 +453,24 @@ class ScanService:
             idempotency_key=idempotency_key,
         )
         
-        # Persist to database
+        # Flush the scan first (populates scan.id via INSERT ... RETURNING);
+        # with no ORM relationship the unit of work cannot order the audit
+        # INSERT after it on its own
         scan = await self.scan_repo.create(scan)
         
-        # Log audit trail
-        await self.audit_repo.log_transition(
-            scan_id=scan.id,
-            previous_status=None,
-            new_status=ScanStatus.pending,
-            message="Scan request received - multiple scan support enabled",
-            triggered_by=triggered_by or "api",
+        # The audit row rides on the commit's flush - no separate flush
+        self.session.add(
+            ScanAuditLog(
+                scan_id=scan.id,
+                previous_status=None,
+                new_status=ScanStatus.pending,
+                message="Scan request received - multiple scan support enabled",
+                triggered_by=triggered_by or "api",
+            )
         )
         
+        # Wake idle workers once the scan is committed
+        await notify_scan_pending(self.session)
         await self.session.commit()
         
         return scan
@@ -465,7 +502,7 @@ class ScanService:
                 compliant_only=compliant_only,
             )
         except SQLAlchemyError as e:
-            logger.error(f"Database error listing scans: {e}")
+            logger.error("Database error listing scans: %s", e)
             raise DatabaseConnectionException(
                 f"Failed to list scans: {str(e)}"
             ) from e
@@ -474,51 +511,64 @@ class ScanService:
     # DASHBOARD ANALYTICS
     # =========================================================================
     
+    async def _read_in_own_session(
+        self,
+        query: Callable[[ScanRepository], Awaitable[T]],
+    ) -> T:
+        """
+        Run a read-only repository query on a dedicated session.
+        
+        An AsyncSession must never be used by two coroutines at once, so
+        queries that are gathered concurrently each check out their own
+        session (and pooled connection).
+        """
+        factory = self._session_factory or get_session_factory()
+        async with factory() as session:
+            return await query(ScanRepository(session))
+    
     async def get_dashboard_stats(self) -> DashboardStats:
         """
         Compute aggregated statistics for the dashboard.
         
+        The independent queries run concurrently on separate sessions, so
+        latency is that of the slowest query rather than their sum.
+        
         Returns:
             DashboardStats with counts, rates, and top risky images
         """
         try:
-            # Get compliance summary
-            compliance_summary = await self.scan_repo.get_compliance_summary()
-            
-            # Get all scans for counting (recent 30 days via view)
-            all_scans, total = await self.scan_repo.list_scans(
-                page=1,
-                page_size=1000,  # Get enough for statistics
-            )
-            
-            # Calculate counts
-            completed = sum(1 for s in all_scans if s.status == ScanStatus.completed)
-            failed = sum(1 for s in all_scans if s.status == ScanStatus.failed)
-            pending = sum(
-                1 for s in all_scans
-                if s.status in [ScanStatus.pending, ScanStatus.pulling, 
-                                ScanStatus.scanning, ScanStatus.parsing]
+            (
+                compliance_summary,
+                aggregates,
+                recent,
+                top_risky,
+            ) = await asyncio.gather(
+                self._read_in_own_session(
+                    lambda repo: repo.get_compliance_summary()
+                ),
+                # Counts and averages, aggregated in SQL
+                self._read_in_own_session(
+                    lambda repo: repo.get_dashboard_aggregates()
+                ),
+                # Last 10 scans via the list-order index
+                self._read_in_own_session(
+                    lambda repo: repo.get_recent_scans(limit=10)
+                ),
+                self._read_in_own_session(
+                    lambda repo: repo.get_top_vulnerable_images(limit=5)
+                ),
             )
             
             # Compliance counts (from completed scans only)
-            completed_scans = [s for s in all_scans if s.status == ScanStatus.completed]
-            compliant = sum(1 for s in completed_scans if s.is_compliant)
-            non_compliant = len(completed_scans) - compliant
-            
-            # Average risk score
-            if completed_scans:
-                avg_risk = sum(s.risk_score for s in completed_scans) / len(completed_scans)
-            else:
-                avg_risk = 0.0
-            
-            # Compliance rate
-            compliance_rate = (compliant / len(completed_scans) * 100) if completed_scans else 0.0
+            completed = aggregates.completed
+            compliant = aggregates.compliant
+            non_compliant = completed - compliant
+            avg_risk = float(aggregates.avg_risk_score or 0.0)
+            compliance_rate = (compliant / completed * 100) if completed else 0.0
             
-            # Get top risky images
-            top_risky = await self.scan_repo.get_top_vulnerable_images(limit=5)
             top_risky_data = [
                 {
-                    "image": s.full_image_name,
+                    "image": s.full_image,
                     "risk_score": s.risk_score,
                     "critical_count": s.critical_count,
                     "high_count": s.high_count,
@@ -528,14 +578,11 @@ class ScanService:
                 for s in top_risky
             ]
             
-            # Recent scans (last 10)
-            recent, _ = await self.scan_repo.list_scans(page=1, page_size=10)
-            
             return DashboardStats(
-                total_scans=total,
+                total_scans=aggregates.total,
                 completed_scans=completed,
-                failed_scans=failed,
-                pending_scans=pending,
+                failed_scans=aggregates.failed,
+                pending_scans=aggregates.pending,
                 compliant_images=compliant,
                 non_compliant_images=non_compliant,
                 average_risk_score=round(avg_risk, 2),
@@ -545,7 +592,7 @@ class ScanService:
             )
             
         except SQLAlchemyError as e:
-            logger.error(f"Database error computing dashboard stats: {e}")
+            logger.error("Database error computing dashboard stats: %s", e)
             raise DatabaseConnectionException(
                 f"Failed to compute dashboard stats: {str(e)}"
             ) from e
@@ -564,7 +611,8 @@ class ScanService:
         norm_name, norm_tag, _ = self.normalize_image_reference(image_name, image_tag)
         
         try:
-            scans = await self.scan_repo.get_image_history(
+            # Narrow column-wise fetch - the trend never needs raw_report
+            counts = await self.scan_repo.get_trend_counts(
                 image_name=norm_name,
                 image_tag=norm_tag,
                 days=days,
@@ -572,18 +620,25 @@ class ScanService:
             
             return [
                 {
-                    "date": s.created_at.isoformat(),
-                    "risk_score": s.risk_score,
-                    "total_vulnerabilities": s.total_vulnerabilities,
-                    "critical_count": s.critical_count,
-                    "high_count": s.high_count,
-                    "is_compliant": s.is_compliant,
+                    "date": created_at.isoformat(),
+                    "risk_score": risk_score,
+                    "total_vulnerabilities": total,
+                    "critical_count": critical,
+                    "high_count": high,
+                    "is_compliant": bool(is_compliant),
                 }
-                for s in scans
+                for created_at, risk_score, total, critical, high, is_compliant in zip(
+                    counts.created_at,
+                    counts.risk_score,
+                    counts.total,
+                    counts.critical,
+                    counts.high,
+                    counts.is_compliant,
+                )
             ]
             
         except SQLAlchemyError as e:
-            logger.error(f"Database error fetching image trend: {e}")
+            logger.error("Database error fetching image trend: %s", e)
             raise DatabaseConnectionException(
                 f"Failed to fetch image trend: {str(e)}"
             ) from e
@@ -602,9 +657,9 @@ async def trigger_worker_task(scan_id: UUID) -> None:
     2. Or directly invoke the worker process
     3. Or call a Kubernetes Job API
     
-    For now, we just log and import the worker when ready.
+    For now, we just log and invoke the worker directly.
     """
-    logger.info(f"[BACKGROUND TASK] Triggering worker for scan: {scan_id}")
+    logger.info("[BACKGROUND TASK] Triggering worker for scan: %s", scan_id)
     
     # TODO: In production, replace with actual queue/worker invocation
     # Example with Redis queue:
@@ -615,16 +670,16 @@ async def trigger_worker_task(scan_id: UUID) -> None:
     #   worker = ScanWorker()
     #   await worker.process_scan(scan_id)
     
-    try:
-        # Import worker module (will be created in next step)
-        from app.worker import process_scan_job
-        await process_scan_job(scan_id)
-    except ImportError:
+    if process_scan_job is None:
         logger.warning(
-            f"Worker module not yet available, scan {scan_id} will remain PENDING"
+            "Worker module not available, scan %s will remain PENDING", scan_id
         )
+        return
+    
+    try:
+        await process_scan_job(scan_id)
     except Exception as e:
-        logger.error(f"Worker task failed for scan {scan_id}: {e}")
+        logger.error("Worker task failed for scan %s: %s", scan_id, e)
 
 
 # =============================================================================
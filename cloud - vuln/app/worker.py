@@ -25,25 +25,41 @@ Principal Architecture Decisions:
 """
 
 import asyncio
-import json
 import logging
+import multiprocessing
 import os
+import re
 import signal
-import subprocess
 import sys
 import tempfile
 import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Any
-from uuid import UUID
+from functools import cache
+from typing import Any, BinaryIO, Callable, Iterable, Iterator
+from uuid import UUID, uuid4
 
-from sqlalchemy import select, update, and_
-from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
+from sqlalchemy import Text, bindparam, insert, literal, select, update, and_, cast
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
+try:
+    import ijson
+except ImportError:  # Streaming parse is an optimization; fall back to orjson
+    ijson = None
+
+from app import report_store
 from app.config import settings
-from app.database import get_db_session, get_session_factory
+from app.database import (
+    SCAN_PENDING_CHANNEL,
+    connect_listener,
+    get_db_session,
+    get_engine,
+    get_session_factory,
+)
 from app.models import (
     VulnerabilityScan,
     VulnerabilityDetail,
@@ -51,6 +67,7 @@ from app.models import (
     ScanStatus,
     SeverityLevel,
     ComplianceStatus,
+    RISK_WEIGHTS,
 )
 from app.exceptions import (
     ScanTimeoutException,
@@ -83,6 +100,77 @@ class ScanLogAdapter(logging.LoggerAdapter):
 # DATA CLASSES
 # =============================================================================
 
+# Severity columns store a small code; the index is the code
+SEVERITY_NAMES: tuple[str, ...] = (
+    SeverityLevel.UNKNOWN.value,
+    SeverityLevel.LOW.value,
+    SeverityLevel.MEDIUM.value,
+    SeverityLevel.HIGH.value,
+    SeverityLevel.CRITICAL.value,
+)
+# Severity string -> code, pre-populated with every casing seen in the wild
+# so the hot loop is a single dict lookup (no per-vulnerability .upper());
+# anything else, including a missing or null Severity, is UNKNOWN (0)
+SEVERITY_CODES: dict[str | None, int] = {
+    variant: code
+    for code, name in enumerate(SEVERITY_NAMES)
+    for variant in (name, name.lower(), name.title())
+}
+
+# CVSS column value for "no score" (real scores are 0.0-10.0)
+NO_CVSS_SCORE = -1.0
+
+
+@dataclass
+class VulnColumns:
+    """
+    Column-oriented (struct-of-arrays) per-CVE details from a Trivy report.
+    
+    Typed arrays for severity code, CVSS score and fixability, plain lists
+    for the strings - instead of one ten-key dict per vulnerability. Counts
+    are C-level passes over the arrays. Iterating yields the row dicts
+    (e.g. for a VulnerabilityDetail bulk insert) on demand.
+    
+    Only severities and fixable are always filled (the counts need them);
+    the per-CVE detail columns are kept only with store_vulnerability_details,
+    otherwise iteration yields nothing.
+    """
+    
+    ids: list[str] = field(default_factory=list)
+    package_names: list[str] = field(default_factory=list)
+    package_versions: list[str] = field(default_factory=list)
+    fixed_versions: list[str | None] = field(default_factory=list)
+    severities: array = field(default_factory=lambda: array("B"))  # SEVERITY_NAMES index
+    cvss_scores: array = field(default_factory=lambda: array("d"))  # NO_CVSS_SCORE if absent
+    fixable: array = field(default_factory=lambda: array("b"))
+    titles: list[str] = field(default_factory=list)
+    descriptions: list[str] = field(default_factory=list)
+    published_dates: list[str | None] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.severities)
+    
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(len(self.ids)):
+            cvss_score = self.cvss_scores[i]
+            yield {
+                "vulnerability_id": self.ids[i],
+                "package_name": self.package_names[i],
+                "package_version": self.package_versions[i],
+                "fixed_version": self.fixed_versions[i],
+                "severity": SEVERITY_NAMES[self.severities[i]],
+                "cvss_score": None if cvss_score == NO_CVSS_SCORE else cvss_score,
+                "is_fixable": bool(self.fixable[i]),
+                "title": self.titles[i],
+                "description": self.descriptions[i],
+                "published_date": self.published_dates[i],
+            }
+    
+    def severity_counts(self) -> list[int]:
+        """Vulnerability count per severity code (index into SEVERITY_NAMES)."""
+        return [self.severities.count(code) for code in range(len(SEVERITY_NAMES))]
+
+
 @dataclass
 class RiskMetrics:
     """Calculated risk metrics from Trivy scan results."""
@@ -100,7 +188,26 @@ class RiskMetrics:
     avg_cvss_score: float | None = None
     is_compliant: bool = True
     compliance_status: ComplianceStatus = ComplianceStatus.compliant
-    vulnerabilities: list[dict] = field(default_factory=list)
+    vulnerabilities: VulnColumns = field(default_factory=VulnColumns)
+
+
+@dataclass
+class ParsedReport:
+    """What the worker keeps from a Trivy report file after parsing."""
+    
+    metrics: RiskMetrics
+    trivy_version: str = "unknown"
+    image_digest: str | None = None
+
+
+@dataclass(frozen=True)
+class StatusTransition:
+    """One audited status change, as recorded in scan_audit_logs."""
+    
+    previous_status: ScanStatus | None
+    new_status: ScanStatus
+    message: str | None = None
+    audit_data: dict | None = None
 
 
 @dataclass
@@ -144,32 +251,109 @@ class WorkerConfig:
     trivy_binary: str = settings.trivy_binary_path
     trivy_cache_dir: str = settings.trivy_cache_dir
     trivy_timeout: int = settings.trivy_timeout_seconds  # 5 minutes default
+    trivy_server_url: str | None = settings.trivy_server_url  # client/server mode
+    trivy_db_max_age_hours: int = settings.trivy_db_max_age_hours
+    skip_db_update: bool = False  # Set once ensure_trivy_db() has a DB on disk
+    store_vulnerability_details: bool = settings.store_vulnerability_details
+    scratch_dir: str | None = None  # Report spill dir (None: tempfile default, /tmp)
     
     # Worker settings
     poll_interval: int = settings.worker_poll_interval_seconds
     max_retries: int = settings.scan_max_retries
-    batch_size: int = 1  # Process one scan at a time for simplicity
+    batch_size: int = settings.worker_concurrency  # Scans claimed per poll
+    max_parallel: int = settings.worker_concurrency  # Trivy scans run at once
+    notify_fallback_interval: int = 30  # Safety-net poll while LISTENing
     
-    # Risk scoring weights
-    weight_critical: int = settings.risk_weight_critical
-    weight_high: int = settings.risk_weight_high
-    weight_medium: int = settings.risk_weight_medium
-    weight_low: int = settings.risk_weight_low
+    # Risk scoring weights; the stored risk_score column is generated from
+    # the same RISK_WEIGHTS, so override these only for what-if scoring
+    weight_critical: int = RISK_WEIGHTS[0]
+    weight_high: int = RISK_WEIGHTS[1]
+    weight_medium: int = RISK_WEIGHTS[2]
+    weight_low: int = RISK_WEIGHTS[3]
     
     # Worker identification
     worker_id: str = field(default_factory=lambda: f"worker-{os.getpid()}")
+    
+    # Weights indexed by severity code (SEVERITY_NAMES order, UNKNOWN = 0),
+    # derived once from the weight_* fields
+    severity_weights: tuple[int, ...] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        self.severity_weights = (
+            0,
+            self.weight_low,
+            self.weight_medium,
+            self.weight_high,
+            self.weight_critical,
+        )
 
 
 # =============================================================================
 # TRIVY EXECUTION - Secure Subprocess Handling
 # =============================================================================
 
+# Trivy stderr classification, checked in priority order. Case-insensitive
+# regexes search the text as-is instead of lower()-copying it per check;
+# each maps to a factory for the exception to raise.
+_TRIVY_ERROR_PATTERNS: tuple[tuple[re.Pattern[str], Callable[[str], Exception]], ...] = (
+    (
+        re.compile(r"could not find image|manifest unknown", re.IGNORECASE),
+        lambda image: ImageNotFoundException(image_name=image, registry="unknown"),
+    ),
+    (
+        re.compile(r"unauthorized|denied", re.IGNORECASE),
+        lambda image: ImagePullException(
+            image_name=image,
+            reason="Authentication failed - check registry credentials",
+        ),
+    ),
+    (
+        re.compile(r"rate limit|too many requests", re.IGNORECASE),
+        lambda image: ImagePullException(
+            image_name=image,
+            reason="Registry rate limit exceeded",
+        ),
+    ),
+)
+
+
+def _classify_trivy_error(
+    stderr_text: str,
+    image_reference: str,
+    exit_code: int | None,
+) -> Exception:
+    """Map a failed Trivy run's stderr to the exception to raise."""
+    for pattern, make_error in _TRIVY_ERROR_PATTERNS:
+        if pattern.search(stderr_text):
+            return make_error(image_reference)
+    return TrivyExecutionException(
+        reason=stderr_text or f"Exit code {exit_code}",
+        exit_code=exit_code,
+    )
+
+
+@cache
+def _trivy_env() -> dict[str, str]:
+    """
+    Environment for Trivy subprocesses, built once per process.
+    
+    The cache dir is passed as --cache-dir, so only NO_COLOR is added;
+    later changes to os.environ are not picked up.
+    """
+    return {**os.environ, "NO_COLOR": "1"}  # Disable color output for cleaner logs
+
+
+async def _spool_stream(stream: asyncio.StreamReader, sink: BinaryIO) -> None:
+    """Copy a subprocess pipe into `sink` in 64 KiB chunks."""
+    while chunk := await stream.read(64 * 1024):
+        sink.write(chunk)
+
+
 async def run_trivy_scan(
     image_reference: str,
-    output_path: Path,
     config: WorkerConfig,
     log: logging.LoggerAdapter,
-) -> dict:
+) -> BinaryIO:
     """
     Execute Trivy scan with async subprocess handling.
     
@@ -177,21 +361,26 @@ async def run_trivy_scan(
     - shell=False prevents command injection
     - Explicit timeout prevents zombie processes
     - Process killed on timeout (not just terminated)
-    - Temporary file for output (cleaned up by caller)
     
     PERFORMANCE FIX:
     - Uses asyncio.create_subprocess_exec instead of subprocess.Popen
     - Non-blocking execution allows the event loop to continue
     - Enables true concurrent scan processing
+    - With config.trivy_server_url set, runs as a thin client of a warm
+      `trivy server` (see TrivyServer): the server keeps the vulnerability
+      DB open, so each scan skips loading it
+    - The JSON report is read from Trivy's stdout into a spooled buffer:
+      reports under STREAMING_PARSE_THRESHOLD never touch disk, larger
+      ones roll over to an anonymous temp file in config.scratch_dir
     
     Args:
         image_reference: Full image reference (e.g., "nginx:latest")
-        output_path: Path to write JSON output
         config: Worker configuration
         log: Logger adapter with scan context
     
     Returns:
-        Parsed JSON output from Trivy
+        The JSON report, rewound (parse with parse_report); the caller
+        closes it
     
     Raises:
         ScanTimeoutException: If scan exceeds timeout
@@ -204,7 +393,6 @@ async def run_trivy_scan(
         config.trivy_binary,
         "image",
         "--format", "json",
-        "--output", str(output_path),
         "--timeout", f"{config.trivy_timeout}s",
         "--scanners", "vuln",
         "--cache-dir", config.trivy_cache_dir,
@@ -212,36 +400,44 @@ async def run_trivy_scan(
         # This ensures scans work even on fresh installations
         # Quiet mode - only output results
         "--quiet",
-        image_reference,
     ]
+    if config.trivy_server_url:
+        cmd += ["--server", config.trivy_server_url]
+    elif config.skip_db_update:
+        # DB is kept fresh by ensure_trivy_db(); concurrent scans must not
+        # each try to refresh (or first-download) it mid-flight
+        cmd.append("--skip-db-update")
+    cmd.append(image_reference)
+    
+    if log.isEnabledFor(logging.INFO):
+        log.info("Executing Trivy: %s", " ".join(cmd))
+    
+    # Execute with async subprocess - NON-BLOCKING!
+    # This is the key performance fix - allows event loop to continue
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=_trivy_env(),
+    )
     
-    log.info(f"Executing Trivy: {' '.join(cmd)}")
-    
-    process = None
+    report = tempfile.SpooledTemporaryFile(
+        max_size=STREAMING_PARSE_THRESHOLD, dir=config.scratch_dir
+    )
     try:
-        # Set up environment
-        env = os.environ.copy()
-        env["TRIVY_CACHE_DIR"] = config.trivy_cache_dir
-        env["NO_COLOR"] = "1"  # Disable color output for cleaner logs
-        
-        # Execute with async subprocess - NON-BLOCKING!
-        # This is the key performance fix - allows event loop to continue
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            env=env,
-        )
-        
         # Wait with timeout using asyncio.wait_for (non-blocking)
         try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
+            _, stderr, _ = await asyncio.wait_for(
+                asyncio.gather(
+                    _spool_stream(process.stdout, report),
+                    process.stderr.read(),
+                    process.wait(),
+                ),
                 timeout=config.trivy_timeout
             )
         except asyncio.TimeoutError:
             # CRITICAL: Kill the process on timeout to prevent zombies
-            log.error(f"Trivy scan timed out after {config.trivy_timeout}s - killing process")
+            log.error("Trivy scan timed out after %ss - killing process", config.trivy_timeout)
             
             # First try graceful termination
             process.terminate()
@@ -254,7 +450,7 @@ async def run_trivy_scan(
                 await process.wait()
             
             raise ScanTimeoutException(
-                scan_id="unknown",  # Will be set by caller
+                scan_id="unknown",  # Only `reason` is recorded (_SCAN_ERRORS)
                 timeout_seconds=config.trivy_timeout,
             )
         
@@ -262,57 +458,32 @@ async def run_trivy_scan(
         if process.returncode != 0:
             stderr_text = stderr.decode("utf-8", errors="replace").strip()
             
-            # Classify error type
-            if "could not find image" in stderr_text.lower() or "manifest unknown" in stderr_text.lower():
-                raise ImageNotFoundException(
-                    image_name=image_reference,
-                    registry="unknown",
-                )
-            elif "unauthorized" in stderr_text.lower() or "denied" in stderr_text.lower():
-                raise ImagePullException(
-                    image_name=image_reference,
-                    reason="Authentication failed - check registry credentials",
-                )
-            elif "rate limit" in stderr_text.lower() or "too many requests" in stderr_text.lower():
-                raise ImagePullException(
-                    image_name=image_reference,
-                    reason="Registry rate limit exceeded",
-                )
-            else:
-                raise TrivyExecutionException(
-                    reason=stderr_text or f"Exit code {process.returncode}",
-                    exit_code=process.returncode,
-                )
+            raise _classify_trivy_error(stderr_text, image_reference, process.returncode)
         
-        # Parse output file
-        if not output_path.exists():
+        if report.tell() == 0:
             raise TrivyExecutionException(
-                reason="Trivy did not produce output file",
+                reason="Trivy did not produce any output",
                 exit_code=process.returncode,
             )
-        
-        with open(output_path, "r") as f:
-            result = json.load(f)
-        
-        log.info(f"Trivy scan completed successfully")
-        return result
-    
-    except json.JSONDecodeError as e:
-        raise TrivyExecutionException(
-            reason=f"Failed to parse Trivy JSON output: {e}",
-            exit_code=0,
-        )
+    except BaseException:
+        # Also reached on cancellation - never leave Trivy running
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        report.close()
+        raise
+    
+    report.seek(0)
+    log.info("Trivy scan completed successfully")
+    return report
 
 
-def run_trivy_scan_with_db_update(
-    image_reference: str,
-    config: WorkerConfig,
-    log: logging.LoggerAdapter,
-) -> None:
+async def update_trivy_db(config: WorkerConfig) -> None:
     """
-    Update Trivy vulnerability database.
+    Download/refresh the Trivy vulnerability database into trivy_cache_dir.
     
-    Should be run periodically (e.g., daily via cron) rather than per-scan.
+    Failures are logged, not raised: scans fall back to Trivy's own
+    download-on-demand behaviour.
     """
     cmd = [
         config.trivy_binary,
@@ -321,20 +492,186 @@ def run_trivy_scan_with_db_update(
         "--cache-dir", config.trivy_cache_dir,
     ]
     
-    log.info("Updating Trivy vulnerability database...")
+    logger.info("Updating Trivy vulnerability database...")
+    
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+        env=_trivy_env(),
+    )
+    try:
+        # 5 minute timeout for DB download
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout=300)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        logger.error("Trivy database update timed out")
+        return
+    
+    if process.returncode != 0:
+        logger.error(
+            "Trivy database update failed: %s",
+            stderr.decode("utf-8", errors="replace").strip(),
+        )
+    else:
+        logger.info("Trivy database updated successfully")
+
+
+def update_trivy_db_sync(config: WorkerConfig | None = None) -> None:
+    """
+    Blocking wrapper around update_trivy_db for cron jobs / init containers.
     
+    Must not be called from inside a running event loop.
+    """
+    asyncio.run(update_trivy_db(config or WorkerConfig()))
+
+
+# Serializes DB refreshes across all scan tasks in this process
+_trivy_db_lock = asyncio.Lock()
+
+
+def _trivy_db_age_seconds(config: WorkerConfig) -> float | None:
+    """Age of the cached DB (metadata.json mtime), or None if absent."""
+    metadata = os.path.join(config.trivy_cache_dir, "db", "metadata.json")
     try:
-        subprocess.run(
-            cmd,
-            timeout=300,  # 5 minute timeout for DB download
-            check=True,
-            capture_output=True,
+        return time.time() - os.path.getmtime(metadata)
+    except OSError:
+        return None
+
+
+def trivy_db_stale(config: WorkerConfig) -> bool:
+    """True if the cached DB is missing or older than trivy_db_max_age_hours."""
+    age = _trivy_db_age_seconds(config)
+    return age is None or age >= config.trivy_db_max_age_hours * 3600
+
+
+async def ensure_trivy_db(config: WorkerConfig) -> bool:
+    """
+    Make sure a vulnerability DB younger than trivy_db_max_age_hours is cached.
+    
+    Cheap when the DB is fresh (one stat). Otherwise refreshes it under a
+    process-wide lock, so a cold start downloads the DB once instead of
+    every concurrent scan racing to fetch it.
+    
+    Returns:
+        True if a DB is on disk afterwards (possibly stale if the refresh
+        failed), i.e. scans may safely run with --skip-db-update
+    """
+    async with _trivy_db_lock:
+        if not trivy_db_stale(config):
+            return True
+        await update_trivy_db(config)
+        return _trivy_db_age_seconds(config) is not None
+
+
+# =============================================================================
+# TRIVY SERVER - Long-lived scanner process for client/server mode
+# =============================================================================
+
+class TrivyServer:
+    """
+    A `trivy server` child process, started once and shared by all scans.
+    
+    Every standalone `trivy image` run pays Go runtime start-up plus opening
+    the vulnerability DB; in client/server mode the server holds the DB and
+    each scan is a thin client call. Use as an async context manager:
+    
+        async with TrivyServer(config, "127.0.0.1:4954") as server:
+            config.trivy_server_url = server.url
+    """
+    
+    def __init__(
+        self,
+        config: WorkerConfig,
+        listen: str,
+        startup_timeout: float = 60.0,
+    ):
+        self.config = config
+        self.listen = listen
+        self.startup_timeout = startup_timeout
+        self._process: asyncio.subprocess.Process | None = None
+        host, _, port = listen.rpartition(":")
+        self._host = host or "127.0.0.1"
+        self._port = int(port)
+    
+    @property
+    def url(self) -> str:
+        return f"http://{self._host}:{self._port}"
+    
+    async def start(self) -> None:
+        """Launch the server and wait until /healthz answers."""
+        self._process = await asyncio.create_subprocess_exec(
+            self.config.trivy_binary,
+            "server",
+            "--listen", f"{self._host}:{self._port}",
+            "--cache-dir", self.config.trivy_cache_dir,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=_trivy_env(),
+        )
+        
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self._process.returncode is not None:
+                raise TrivyExecutionException(
+                    reason="Trivy server exited during start-up",
+                    exit_code=self._process.returncode,
+                )
+            if await self._healthy():
+                logger.info("Trivy server ready at %s", self.url)
+                return
+            await asyncio.sleep(0.5)
+        
+        await self.stop()
+        raise TrivyExecutionException(
+            reason=f"Trivy server not healthy after {self.startup_timeout}s",
         )
-        log.info("Trivy database updated successfully")
-    except subprocess.TimeoutExpired:
-        log.error("Trivy database update timed out")
-    except subprocess.CalledProcessError as e:
-        log.error(f"Trivy database update failed: {e.stderr.decode()}")
+    
+    async def ensure_running(self) -> None:
+        """Restart the server if it has exited since start() (e.g. crashed)."""
+        if self._process is None or self._process.returncode is None:
+            return
+        logger.warning(
+            "Trivy server exited with code %s, restarting", self._process.returncode
+        )
+        await self.start()
+    
+    async def stop(self) -> None:
+        """Terminate the server (SIGKILL if it ignores SIGTERM)."""
+        process, self._process = self._process, None
+        if process is None or process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), timeout=10)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+    
+    async def _healthy(self) -> bool:
+        try:
+            reader, writer = await asyncio.open_connection(self._host, self._port)
+        except OSError:
+            return False
+        try:
+            writer.write(
+                f"GET /healthz HTTP/1.0\r\nHost: {self._host}\r\n\r\n".encode()
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            return b" 200 " in status_line
+        except OSError:
+            return False
+        finally:
+            writer.close()
+    
+    async def __aenter__(self) -> "TrivyServer":
+        await self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
 
 
 # =============================================================================
@@ -382,71 +719,96 @@ def calculate_risk_metrics(
     Returns:
         RiskMetrics dataclass with all calculated values
     """
-    metrics = RiskMetrics()
-    cvss_scores: list[float] = []
-    
     # Extract all vulnerabilities from all results (targets)
-    results = trivy_output.get("Results", [])
+    return score_vulnerabilities(
+        (
+            vuln
+            for result in trivy_output.get("Results", [])
+            for vuln in result.get("Vulnerabilities") or []
+        ),
+        config,
+    )
+
+
+def score_vulnerabilities(
+    vulnerabilities: Iterable[dict],
+    config: WorkerConfig,
+) -> RiskMetrics:
+    """
+    Accumulate RiskMetrics over a stream of Trivy vulnerability entries.
     
-    for result in results:
-        vulnerabilities = result.get("Vulnerabilities") or []
+    Consumes the iterable once, so it can be fed straight from an ijson
+    item stream; the entries themselves are never retained.
+    
+    Per-CVE detail columns are only materialized when
+    config.store_vulnerability_details is set (their one consumer is the
+    vulnerability_details insert); otherwise only the counters are kept.
+    """
+    metrics = RiskMetrics()
+    columns = metrics.vulnerabilities
+    keep_details = config.store_vulnerability_details
+    
+    # CVSS statistics accumulate in the same pass (no score list to rescan)
+    cvss_count = 0
+    cvss_sum = 0.0
+    cvss_max = NO_CVSS_SCORE
+    
+    # Counting happens afterwards over the severity / fixable arrays
+    for vuln in vulnerabilities:
+        # Severity code by dict lookup (unrecognised -> UNKNOWN)
+        severity_code = SEVERITY_CODES.get(vuln.get("Severity"), 0)
         
-        for vuln in vulnerabilities:
-            metrics.total_vulnerabilities += 1
-            
-            # Get severity (default to UNKNOWN if missing)
-            severity = vuln.get("Severity", "UNKNOWN").upper()
-            
-            # Count by severity
-            if severity == "CRITICAL":
-                metrics.critical_count += 1
-            elif severity == "HIGH":
-                metrics.high_count += 1
-            elif severity == "MEDIUM":
-                metrics.medium_count += 1
-            elif severity == "LOW":
-                metrics.low_count += 1
-            else:
-                metrics.unknown_count += 1
-            
-            # Check if fixable (FixedVersion exists and is not empty)
-            fixed_version = vuln.get("FixedVersion", "")
-            if fixed_version and fixed_version.strip():
-                metrics.fixable_count += 1
-            else:
-                metrics.unfixable_count += 1
-            
-            # Extract CVSS score (try multiple sources)
-            cvss_score = extract_cvss_score(vuln)
-            if cvss_score is not None:
-                cvss_scores.append(cvss_score)
-            
-            # Store vulnerability details for potential insertion
-            metrics.vulnerabilities.append({
-                "vulnerability_id": vuln.get("VulnerabilityID", "UNKNOWN"),
-                "package_name": vuln.get("PkgName", "unknown"),
-                "package_version": vuln.get("InstalledVersion", "unknown"),
-                "fixed_version": fixed_version or None,
-                "severity": severity,
-                "cvss_score": cvss_score,
-                "is_fixable": bool(fixed_version and fixed_version.strip()),
-                "title": vuln.get("Title", ""),
-                "description": vuln.get("Description", ""),
-                "published_date": vuln.get("PublishedDate"),
-            })
-    
-    # Calculate risk score using weighted formula
-    metrics.risk_score = (
-        (metrics.critical_count * config.weight_critical) +
-        (metrics.high_count * config.weight_high) +
-        (metrics.medium_count * config.weight_medium) +
-        (metrics.low_count * config.weight_low)
+        # Fixable if FixedVersion exists and is not empty
+        fixed_version = vuln.get("FixedVersion", "")
+        is_fixable = bool(fixed_version and fixed_version.strip())
+        
+        # Extract CVSS score (try multiple sources)
+        cvss_score = extract_cvss_score(vuln)
+        if cvss_score is None:
+            cvss_score = NO_CVSS_SCORE
+        else:
+            cvss_count += 1
+            cvss_sum += cvss_score
+            if cvss_score > cvss_max:
+                cvss_max = cvss_score
+        
+        columns.severities.append(severity_code)
+        columns.fixable.append(is_fixable)
+        
+        if keep_details:
+            columns.ids.append(vuln.get("VulnerabilityID", "UNKNOWN"))
+            columns.package_names.append(vuln.get("PkgName", "unknown"))
+            columns.package_versions.append(vuln.get("InstalledVersion", "unknown"))
+            columns.fixed_versions.append(fixed_version or None)
+            columns.cvss_scores.append(cvss_score)
+            columns.titles.append(vuln.get("Title", ""))
+            columns.descriptions.append(vuln.get("Description", ""))
+            columns.published_dates.append(vuln.get("PublishedDate"))
+    
+    # Count by severity and fixability over the columns
+    severity_counts = columns.severity_counts()
+    (
+        metrics.unknown_count,
+        metrics.low_count,
+        metrics.medium_count,
+        metrics.high_count,
+        metrics.critical_count,
+    ) = severity_counts
+    metrics.total_vulnerabilities = len(columns)
+    metrics.fixable_count = columns.fixable.count(1)
+    metrics.unfixable_count = metrics.total_vulnerabilities - metrics.fixable_count
+    
+    # Calculate risk score using weighted formula: counts . weights, both
+    # indexed by severity code
+    metrics.risk_score = sum(
+        count * weight
+        for count, weight in zip(severity_counts, config.severity_weights)
     )
     
     # Calculate CVSS statistics
-    if cvss_scores:
-        metrics.max_cvss_score = max(cvss_scores)
-        metrics.avg_cvss_score = round(sum(cvss_scores) / len(cvss_scores), 2)
+    if cvss_count:
+        metrics.max_cvss_score = cvss_max
+        metrics.avg_cvss_score = round(cvss_sum / cvss_count, 2)
     
     # Determine compliance status
     if metrics.critical_count > 0 or metrics.high_count > 0:
@@ -462,6 +824,12 @@ def calculate_risk_metrics(
     return metrics
 
 
+# Vendors consulted in this order within each score version; vendors not
+# listed follow in report order. NVD leads so the fast path below hits first.
+_CVSS_VENDOR_PRIORITY = ("nvd", "redhat", "ghsa", "bitnami")
+_CVSS_SCORE_KEYS = ("V3Score", "V2Score")
+
+
 def extract_cvss_score(vuln: dict) -> float | None:
     """
     Extract CVSS score from vulnerability data.
@@ -470,54 +838,251 @@ def extract_cvss_score(vuln: dict) -> float | None:
     1. CVSS v3 from NVD
     2. CVSS v3 from vendor
     3. CVSS v2 from NVD
-    4. None if no score available
+    4. CVSS v2 from vendor
+    5. None if no score available
+    
+    Vendors are ranked by _CVSS_VENDOR_PRIORITY rather than by the key
+    order of the report, so the chosen score is deterministic.
     """
-    cvss_data = vuln.get("CVSS", {})
+    cvss_data = vuln.get("CVSS")
+    if not cvss_data:
+        return None
     
-    # Try NVD v3 first
-    nvd = cvss_data.get("nvd", {})
-    if "V3Score" in nvd:
+    # Common case: NVD v3 present, no vendor ranking needed
+    nvd = cvss_data.get("nvd")
+    if nvd and nvd.get("V3Score") is not None:
         return float(nvd["V3Score"])
     
-    # Try vendor v3
-    for vendor, scores in cvss_data.items():
-        if isinstance(scores, dict) and "V3Score" in scores:
-            return float(scores["V3Score"])
+    ranked = [cvss_data[v] for v in _CVSS_VENDOR_PRIORITY if v in cvss_data]
+    if len(ranked) < len(cvss_data):
+        ranked.extend(
+            scores for vendor, scores in cvss_data.items()
+            if vendor not in _CVSS_VENDOR_PRIORITY
+        )
+    
+    for key in _CVSS_SCORE_KEYS:
+        for scores in ranked:
+            if isinstance(scores, dict) and scores.get(key) is not None:
+                return float(scores[key])
+    return None
+
+
+# Reports larger than this are streamed through ijson so the whole Trivy
+# object tree is never materialized just to score it
+STREAMING_PARSE_THRESHOLD = 10 * 1024 * 1024  # 10MB
+
+# Decode errors from either parser (orjson's is a ValueError)
+_REPORT_PARSE_ERRORS: tuple[type[Exception], ...] = (
+    (ValueError,) if ijson is None else (ValueError, ijson.JSONError)
+)
+
+
+def _read_report_header(f: BinaryIO) -> tuple[str, str | None]:
+    """
+    Read SchemaVersion and the first Metadata.RepoDigests entry.
     
-    # Try v2 as fallback
-    if "V2Score" in nvd:
-        return float(nvd["V2Score"])
+    Trivy writes both before Results, so the event scan stops there.
+    """
+    trivy_version, image_digest = "unknown", None
+    for prefix, _, value in ijson.parse(f):
+        if prefix == "SchemaVersion":
+            trivy_version = str(value)
+        elif prefix == "Metadata.RepoDigests.item" and image_digest is None:
+            image_digest = value
+        elif prefix == "Results":
+            break
+    return trivy_version, image_digest
+
+
+def _parse_report_bytes(data: bytes, config: WorkerConfig) -> ParsedReport:
+    """
+    In-memory (orjson) parse + score of a whole report.
     
-    for vendor, scores in cvss_data.items():
-        if isinstance(scores, dict) and "V2Score" in scores:
-            return float(scores["V2Score"])
+    Top-level so the parse process pool can pickle it; decode errors are
+    left as ValueError for the caller to wrap.
+    """
+    trivy_output = orjson.loads(data)
+    repo_digests = trivy_output.get("Metadata", {}).get("RepoDigests")
+    return ParsedReport(
+        metrics=calculate_risk_metrics(trivy_output, config),
+        trivy_version=str(trivy_output.get("SchemaVersion", "unknown")),
+        image_digest=repo_digests[0] if repo_digests else None,
+    )
+
+
+def _stream_report(report: BinaryIO, config: WorkerConfig) -> ParsedReport:
+    """Streaming (ijson) parse + score; only the accumulators stay in memory."""
+    trivy_version, image_digest = _read_report_header(report)
+    report.seek(0)
+    metrics = score_vulnerabilities(
+        ijson.items(report, "Results.item.Vulnerabilities.item", use_float=True),
+        config,
+    )
+    return ParsedReport(
+        metrics=metrics,
+        trivy_version=trivy_version,
+        image_digest=image_digest,
+    )
+
+
+def _report_size(report: BinaryIO) -> int:
+    """Size of a seekable report; leaves it rewound."""
+    size = report.seek(0, os.SEEK_END)
+    report.seek(0)
+    return size
+
+
+def _report_parse_error(error: Exception) -> TrivyExecutionException:
+    return TrivyExecutionException(
+        reason=f"Failed to parse Trivy JSON output: {error}",
+        exit_code=0,
+    )
+
+
+def parse_and_score(report: BinaryIO, config: WorkerConfig) -> ParsedReport:
+    """
+    Parse a Trivy JSON report and calculate its risk metrics.
     
-    return None
+    Small reports take the orjson fast path. Reports above
+    STREAMING_PARSE_THRESHOLD (with ijson installed) are streamed: the
+    vulnerabilities are fed one at a time into score_vulnerabilities, so
+    peak memory is the accumulators, not the report tree.
+    
+    Blocking; the worker uses parse_report, which runs it off the loop.
+    
+    Raises:
+        TrivyExecutionException: If the report is not valid JSON
+    """
+    try:
+        if ijson is None or _report_size(report) < STREAMING_PARSE_THRESHOLD:
+            return _parse_report_bytes(report.read(), config)
+        return _stream_report(report, config)
+    except _REPORT_PARSE_ERRORS as e:
+        raise _report_parse_error(e)
+
+
+# Process pool for report parsing - JSON decoding and scoring are CPU-bound
+# and, in a thread, would still hold the GIL against the event loop. Shared
+# by the worker and the upload route. Children come from a forkserver, never
+# a fork of the running process (its event loop, threads and DB connections).
+PARSE_POOL_WORKERS = int(os.getenv("PARSE_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+_parse_pool: ProcessPoolExecutor | None = None
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Get or create the shared report-parsing process pool."""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=PARSE_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the parse pool's processes, if it was started (blocking)."""
+    global _parse_pool
+    pool, _parse_pool = _parse_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def parse_report(report: BinaryIO, config: WorkerConfig) -> ParsedReport:
+    """
+    parse_and_score without blocking the event loop.
+    
+    In-memory reports (below STREAMING_PARSE_THRESHOLD, so never rolled
+    over to disk) are parsed in the process pool, in parallel with other
+    scans. Larger reports exist only as an anonymous temp file, so they
+    are streamed in a thread, keeping memory bounded.
+    
+    Raises:
+        TrivyExecutionException: If the report is not valid JSON
+    """
+    try:
+        if ijson is None or _report_size(report) < STREAMING_PARSE_THRESHOLD:
+            data = report.read()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                get_parse_pool(), _parse_report_bytes, data, config
+            )
+        return await asyncio.to_thread(_stream_report, report, config)
+    except _REPORT_PARSE_ERRORS as e:
+        raise _report_parse_error(e)
 
 
 # =============================================================================
 # DATABASE OPERATIONS
 # =============================================================================
 
-async def fetch_pending_scan(session: AsyncSession) -> VulnerabilityScan | None:
+async def claim_scans(
+    session: AsyncSession,
+    worker_id: str,
+    batch_size: int = 4,
+    scan_id: UUID | None = None,
+) -> list[dict]:
     """
-    Fetch a single pending scan for processing.
+    Atomically claim up to `batch_size` pending scans (or just `scan_id`).
     
-    Uses SELECT ... FOR UPDATE SKIP LOCKED pattern for safe concurrent access.
-    This ensures only one worker processes each scan, even with multiple workers.
+    A single UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED LIMIT n)
+    RETURNING moves the rows to PULLING, so the claim and the first status
+    change are one statement; their audit rows ride in the same commit.
+    Concurrent workers skip each other's locked rows instead of waiting.
+    Returns the scan fields the worker needs (empty if nothing was claimed).
     """
-    # Note: FOR UPDATE SKIP LOCKED requires PostgreSQL
-    # For SQLite (testing), we fall back to simple select
-    stmt = (
-        select(VulnerabilityScan)
-        .where(VulnerabilityScan.status == ScanStatus.pending)
+    # FOR UPDATE SKIP LOCKED is PostgreSQL-only; SQLite (testing) drops it,
+    # where the single UPDATE statement is atomic on its own
+    candidates = select(VulnerabilityScan.id).where(
+        VulnerabilityScan.status == ScanStatus.pending
+    )
+    if scan_id is not None:
+        candidates = candidates.where(VulnerabilityScan.id == scan_id)
+    candidates = (
+        candidates
         .order_by(VulnerabilityScan.created_at)
-        .limit(1)
-        # PostgreSQL-specific: .with_for_update(skip_locked=True)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    
+    now = datetime.now(timezone.utc)
+    stmt = (
+        update(VulnerabilityScan)
+        .where(
+            VulnerabilityScan.id.in_(candidates.scalar_subquery()),
+            VulnerabilityScan.status == ScanStatus.pending,
+        )
+        .values(
+            status=ScanStatus.pulling,
+            started_at=now,
+            updated_at=now,
+            worker_id=worker_id,
+        )
+        .returning(
+            VulnerabilityScan.id,
+            VulnerabilityScan.image_name,
+            VulnerabilityScan.image_tag,
+            VulnerabilityScan.registry,
+            # Trivy's reference, already formatted by the generated column
+            VulnerabilityScan.full_image.label("image_ref"),
+        )
     )
     
-    result = await session.execute(stmt)
-    return result.scalar_one_or_none()
+    rows = (await session.execute(stmt)).all()
+    if not rows:
+        await session.rollback()
+        return []
+    
+    for row in rows:
+        add_audit_transition(
+            session, row.id,
+            ScanStatus.pending, ScanStatus.pulling,
+            message="Scan claimed by worker",
+            worker_id=worker_id,
+            now=now,
+        )
+    await session.commit()
+    return [row._asdict() for row in rows]
 
 
 async def update_scan_status(
@@ -526,14 +1091,18 @@ async def update_scan_status(
     new_status: ScanStatus,
     error_message: str | None = None,
     error_code: str | None = None,
+    now: datetime | None = None,
     **kwargs,
 ) -> None:
     """
     Update scan status with optional additional fields.
+    
+    Pass `now` to reuse a timestamp the caller already took (e.g. the one
+    it is also writing to started_at/completed_at).
     """
     values = {
         "status": new_status,
-        "updated_at": datetime.now(timezone.utc),
+        "updated_at": now or datetime.now(timezone.utc),
     }
     
     if error_message:
@@ -553,23 +1122,187 @@ async def update_scan_status(
     await session.commit()
 
 
+async def transition_scan(
+    session: AsyncSession,
+    scan_id: UUID,
+    previous_status: ScanStatus | None,
+    new_status: ScanStatus,
+    message: str | None = None,
+    audit_data: dict | None = None,
+    worker_id: str | None = None,
+    now: datetime | None = None,
+    **kwargs,
+) -> None:
+    """
+    Move a scan to `new_status` and record the audit row in one commit.
+    
+    Extra keyword arguments are written as column values alongside the
+    status, so each transition costs a single round-trip commit. Pass
+    `now` to stamp updated_at with a timestamp the caller already took.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    stmt = (
+        update(VulnerabilityScan)
+        .where(VulnerabilityScan.id == scan_id)
+        .values(status=new_status, updated_at=now, **kwargs)
+    )
+    
+    await session.execute(stmt)
+    add_audit_transition(
+        session, scan_id,
+        previous_status, new_status,
+        message=message,
+        audit_data=audit_data,
+        worker_id=worker_id,
+        now=now,
+    )
+    await session.commit()
+
+
+async def apply_status_transitions(
+    session: AsyncSession,
+    scan_id: UUID,
+    transitions: list[StatusTransition],
+    worker_id: str | None = None,
+    now: datetime | None = None,
+    **kwargs,
+) -> None:
+    """
+    Walk a scan through several transitions in the current transaction.
+    
+    Issues one UPDATE to the final status (with any extra column values
+    from kwargs) and one multi-row INSERT for the audit rows. Does not
+    commit - the caller groups this with whatever else belongs to the
+    same phase and commits once.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    stmt = (
+        update(VulnerabilityScan)
+        .where(VulnerabilityScan.id == scan_id)
+        .values(status=transitions[-1].new_status, updated_at=now, **kwargs)
+    )
+    
+    await session.execute(stmt)
+    await insert_audit_transitions(session, scan_id, transitions, worker_id, now)
+
+
+# Deferred to save_scan_results so the parse phase needs no commit of its own
+_PARSE_TRANSITION = StatusTransition(
+    ScanStatus.scanning, ScanStatus.parsing,
+    message="Parsing scan results",
+)
+
+
+# Columns save_scan_results writes, bound by name into one prebuilt UPDATE:
+# the SQL is compiled once per process and asyncpg reuses a single prepared
+# statement per connection instead of one per distinct value set
+_SCAN_RESULT_COLUMNS = (
+    "status",
+    "raw_report_key",
+    "raw_report_omitted",
+    "image_digest",
+    # Vulnerability counts
+    "critical_count",
+    "high_count",
+    "medium_count",
+    "low_count",
+    "unknown_count",
+    "total_vulnerabilities",
+    "fixable_count",
+    "unfixable_count",
+    # Risk scoring (risk_score / is_compliant are generated columns)
+    "max_cvss_score",
+    "avg_cvss_score",
+    # Compliance
+    "compliance_status",
+    # Timing
+    "scan_duration",
+    "pull_duration",
+    "analysis_duration",
+    # Metadata
+    "completed_at",
+    "updated_at",
+    "worker_id",
+    "trivy_version",
+)
+
+_SAVE_RESULTS_STMT = (
+    update(VulnerabilityScan)
+    .where(VulnerabilityScan.id == bindparam("scan_id"))
+    .values(
+        # Raw JSON text is cast to JSONB by the database (NULL stays NULL)
+        raw_report=cast(bindparam("raw_report_text", type_=Text), JSONB),
+        **{column: bindparam(column) for column in _SCAN_RESULT_COLUMNS},
+    )
+)
+
+
+def _read_report_text(report: BinaryIO) -> str | None:
+    """
+    Read and decode the report for the JSONB column (blocking; run in a thread).
+    
+    Returns None for reports of STREAMING_PARSE_THRESHOLD or more: those are
+    only kept when RAW_REPORT_DIR is set, never bound as one huge parameter.
+    """
+    if _report_size(report) >= STREAMING_PARSE_THRESHOLD:
+        return None
+    return report.read().decode("utf-8")
+
+
 async def save_scan_results(
     session: AsyncSession,
     scan_id: UUID,
-    raw_report: dict,
+    report: BinaryIO,
     metrics: RiskMetrics,
     timing: ScanTiming,
     worker_id: str,
     trivy_version: str | None = None,
     image_digest: str | None = None,
+    audit_message: str | None = None,
+    audit_data: dict | None = None,
+    store_details: bool = False,
+    transitions: tuple[StatusTransition, ...] = (),
 ) -> None:
     """
     Save complete scan results to database.
+    
+    The PARSING -> COMPLETED audit row (preceded by any earlier
+    `transitions` the caller deferred, e.g. SCANNING -> PARSING) and, with
+    store_details, the per-CVE vulnerability_details rows are committed
+    together with the results, so completion is a single transaction.
+    
+    The report Trivy produced is stored as-is, never re-serialized: with
+    RAW_REPORT_DIR configured it is copied to report storage and only its
+    key is stored on the row; otherwise its text goes to the JSONB column,
+    unless it is over STREAMING_PARSE_THRESHOLD, in which case the raw
+    report is not kept and raw_report_omitted records that (the parsed
+    results always are).
     """
+    report.seek(0)
+    if report_store.is_enabled():
+        report_key = await report_store.save_report_stream(scan_id, report)
+        report_text = None
+    else:
+        # Hand the raw JSON text to PostgreSQL as a JSONB cast - the
+        # database parses it, so the worker never encodes the report
+        report_key = None
+        report_text = await asyncio.to_thread(_read_report_text, report)
+        if report_text is None:
+            logger.warning(
+                "Raw report for scan %s exceeds %d bytes and RAW_REPORT_DIR "
+                "is unset; not storing it", scan_id, STREAMING_PARSE_THRESHOLD,
+            )
+    
     # Update main scan record
-    values = {
+    now = datetime.now(timezone.utc)
+    params = {
+        "scan_id": scan_id,
+        "raw_report_text": report_text,
         "status": ScanStatus.completed,
-        "raw_report": raw_report,
+        "raw_report_key": report_key,
+        "raw_report_omitted": report_key is None and report_text is None,
         "image_digest": image_digest,
         # Vulnerability counts
         "critical_count": metrics.critical_count,
@@ -581,39 +1314,133 @@ async def save_scan_results(
         "fixable_count": metrics.fixable_count,
         "unfixable_count": metrics.unfixable_count,
         # Risk scoring
-        "risk_score": metrics.risk_score,
         "max_cvss_score": metrics.max_cvss_score,
         "avg_cvss_score": metrics.avg_cvss_score,
         # Compliance
-        "is_compliant": metrics.is_compliant,
         "compliance_status": metrics.compliance_status,
         # Timing
         "scan_duration": timing.total_duration,
         "pull_duration": timing.pull_duration,
         "analysis_duration": timing.scan_duration,
         # Metadata
-        "completed_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc),
+        "completed_at": now,
+        "updated_at": now,
         "worker_id": worker_id,
         "trivy_version": trivy_version,
     }
     
-    stmt = (
-        update(VulnerabilityScan)
-        .where(VulnerabilityScan.id == scan_id)
-        .values(**values)
-    )
-    
-    await session.execute(stmt)
+    await session.execute(_SAVE_RESULTS_STMT, params)
     
     # Optionally insert vulnerability details for CVE tracking
-    # (Commented out for performance - enable if needed for CVE impact analysis)
-    # await insert_vulnerability_details(session, scan_id, metrics.vulnerabilities)
-    
+    # (Off by default - enable STORE_VULNERABILITY_DETAILS for CVE impact analysis)
+    if store_details:
+        await insert_vulnerability_details(session, scan_id, metrics.vulnerabilities)
+    
+    await insert_audit_transitions(
+        session, scan_id,
+        [
+            *transitions,
+            StatusTransition(
+                ScanStatus.parsing, ScanStatus.completed,
+                message=audit_message,
+                audit_data=audit_data,
+            ),
+        ],
+        worker_id,
+        now,
+    )
     await session.commit()
 
 
-async def log_audit_transition(
+# vulnerability_details columns written per CVE (id / created_at are
+# server defaults); also the COPY column order
+# id is generated here: the model's uuid4 default is Python-side only, so
+# tables built by create_all have no database default for COPY to fall back on
+_DETAIL_COLUMNS = (
+    "id",
+    "scan_id",
+    "vulnerability_id",
+    "package_name",
+    "package_version",
+    "fixed_version",
+    "severity",
+    "cvss_score",
+    "is_fixable",
+    "published_date",
+)
+
+
+def _parse_published_date(value: str | None) -> datetime | None:
+    """Trivy's PublishedDate (RFC 3339) as a datetime; None if absent/invalid."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _detail_records(scan_id: UUID, columns: VulnColumns) -> Iterator[tuple]:
+    """Yield one vulnerability_details tuple per CVE, straight from the columns."""
+    for cve_id, package, version, fixed, severity, cvss, fixable, published in zip(
+        columns.ids,
+        columns.package_names,
+        columns.package_versions,
+        columns.fixed_versions,
+        columns.severities,
+        columns.cvss_scores,
+        columns.fixable,
+        columns.published_dates,
+    ):
+        yield (
+            uuid4(),
+            scan_id,
+            cve_id[:64],
+            package[:255],
+            version[:64],
+            fixed[:64] if fixed else None,
+            SEVERITY_NAMES[severity],
+            None if cvss == NO_CVSS_SCORE else cvss,
+            bool(fixable),
+            _parse_published_date(published),
+        )
+
+
+async def insert_vulnerability_details(
+    session: AsyncSession,
+    scan_id: UUID,
+    columns: VulnColumns,
+) -> int:
+    """
+    Bulk insert a scan's per-CVE rows in the session's current transaction.
+    
+    On PostgreSQL the rows are streamed with COPY over the session's own
+    asyncpg connection (one round-trip regardless of count); elsewhere
+    (SQLite tests) a single executemany INSERT is used.
+    
+    Returns:
+        Number of rows inserted
+    """
+    if not columns.ids:
+        return 0
+    
+    connection = await session.connection()
+    if connection.dialect.name == "postgresql":
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            VulnerabilityDetail.__tablename__,
+            records=_detail_records(scan_id, columns),
+            columns=_DETAIL_COLUMNS,
+        )
+    else:
+        await session.execute(
+            insert(VulnerabilityDetail),
+            [dict(zip(_DETAIL_COLUMNS, record)) for record in _detail_records(scan_id, columns)],
+        )
+    return len(columns.ids)
+
+
+def add_audit_transition(
     session: AsyncSession,
     scan_id: UUID,
     previous_status: ScanStatus | None,
@@ -621,9 +1448,15 @@ async def log_audit_transition(
     message: str | None = None,
     audit_data: dict | None = None,
     worker_id: str | None = None,
+    now: datetime | None = None,
 ) -> None:
-    """Log state transition for audit trail."""
-    audit_log = ScanAuditLog(
+    """
+    Stage an audit row in the session's current transaction (no commit).
+    
+    Pass `now` to stamp created_at with the timestamp written to the scan
+    row, so the two correlate exactly (default: the database's now()).
+    """
+    audit = ScanAuditLog(
         scan_id=scan_id,
         previous_status=previous_status,
         new_status=new_status,
@@ -631,7 +1464,65 @@ async def log_audit_transition(
         audit_data=audit_data,
         triggered_by=worker_id or "worker",
     )
-    session.add(audit_log)
+    if now is not None:
+        audit.created_at = now
+    session.add(audit)
+
+
+# Executed with a list of rows: one cached statement for any row count
+# (executemany / insertmanyvalues), unlike a per-call multi-row VALUES
+_INSERT_AUDIT_STMT = insert(ScanAuditLog)
+
+
+async def insert_audit_transitions(
+    session: AsyncSession,
+    scan_id: UUID,
+    transitions: list[StatusTransition],
+    worker_id: str | None = None,
+    now: datetime | None = None,
+) -> None:
+    """
+    Write several audit rows with one bulk INSERT (no commit).
+    
+    `now`, if given, is used as every row's created_at (see
+    add_audit_transition).
+    """
+    triggered_by = worker_id or "worker"
+    stamp = {} if now is None else {"created_at": now}
+    await session.execute(
+        _INSERT_AUDIT_STMT,
+        [
+            {
+                "scan_id": scan_id,
+                "previous_status": t.previous_status,
+                "new_status": t.new_status,
+                "message": t.message,
+                "audit_data": t.audit_data,
+                "triggered_by": triggered_by,
+                **stamp,
+            }
+            for t in transitions
+        ],
+    )
+
+
+async def log_audit_transition(
+    session: AsyncSession,
+    scan_id: UUID,
+    previous_status: ScanStatus | None,
+    new_status: ScanStatus,
+    message: str | None = None,
+    audit_data: dict | None = None,
+    worker_id: str | None = None,
+) -> None:
+    """Log state transition for audit trail."""
+    add_audit_transition(
+        session, scan_id,
+        previous_status, new_status,
+        message=message,
+        audit_data=audit_data,
+        worker_id=worker_id,
+    )
     await session.commit()
 
 
@@ -639,202 +1530,193 @@ async def log_audit_transition(
 # WORKER CORE - Single Scan Processing
 # =============================================================================
 
-async def process_single_scan(
-    scan: VulnerabilityScan,
+# Expected scan failures by exact exception type: (error_code, increment_retry).
+# Anything else is recorded as INTERNAL_ERROR.
+_SCAN_ERRORS: dict[type[Exception], tuple[str, bool]] = {
+    ScanTimeoutException: ("TIMEOUT", True),
+    ImageNotFoundException: ("IMAGE_NOT_FOUND", False),  # Permanent - don't retry
+    ImagePullException: ("PULL_FAILED", True),
+    TrivyExecutionException: ("TRIVY_ERROR", True),
+}
+
+
+async def _run_scan_core(
+    scan_id: UUID,
+    image_ref: str,
     config: WorkerConfig,
+    log: logging.LoggerAdapter,
+    start_transitions: list[StatusTransition],
+    **start_values,
 ) -> None:
     """
-    Process a single vulnerability scan end-to-end.
+    Drive a scan from its current status to COMPLETED (or FAILED).
     
-    State Machine:
-        PENDING -> PULLING -> SCANNING -> PARSING -> COMPLETED
-                     |           |           |
-                     v           v           v
-                   FAILED     FAILED      FAILED
+    `start_transitions` are committed together (with `start_values` as
+    extra column values) while Trivy starts up and must end in SCANNING;
+    from there both entry points share every step:
+    
+        ... -> SCANNING -> PARSING -> COMPLETED
+                  |           |
+                  v           v
+                FAILED      FAILED
     
-    This function handles all state transitions and error handling.
     It NEVER raises exceptions - all errors are captured and saved to DB.
     """
-    scan_id = scan.id
-    image_ref = f"{scan.registry}/{scan.image_name}:{scan.image_tag}"
-    if scan.registry == "docker.io":
-        image_ref = f"{scan.image_name}:{scan.image_tag}"
-    
-    # Create logger with scan context
-    log = ScanLogAdapter(logger, {"scan_id": str(scan_id)[:8]})
-    
-    log.info(f"Starting scan for image: {image_ref}")
-    
     timing = ScanTiming(total_start=time.time())
-    temp_dir = None
+    timing.pull_start = timing.total_start
+    report = None
     
     try:
         async with get_db_session() as session:
-            # Transition: PENDING -> PULLING
-            timing.pull_start = time.time()
-            await update_scan_status(
-                session, scan_id, ScanStatus.pulling,
-                started_at=datetime.now(timezone.utc),
-            )
-            await log_audit_transition(
-                session, scan_id,
-                ScanStatus.pending, ScanStatus.pulling,
-                message="Starting image pull",
-                worker_id=config.worker_id,
-            )
-            log.info("Status: PULLING")
+            # Trivy pulls the image itself, so nothing has to happen between
+            # PULLING and SCANNING: start it (fork/exec + DB load) first and
+            # commit the pre-scan transitions while it spins up
             timing.pull_end = time.time()
-            
-            # Transition: PULLING -> SCANNING
-            timing.scan_start = time.time()
-            await update_scan_status(session, scan_id, ScanStatus.scanning)
-            await log_audit_transition(
-                session, scan_id,
-                ScanStatus.pulling, ScanStatus.scanning,
-                message="Starting vulnerability scan",
-                worker_id=config.worker_id,
-            )
-            log.info("Status: SCANNING")
-            
-            # Create temporary directory for Trivy output
-            temp_dir = tempfile.mkdtemp(prefix="trivy_scan_")
-            output_path = Path(temp_dir) / "result.json"
-            
-            # Run Trivy scan (this is the potentially long-running operation)
-            # Now uses async subprocess for non-blocking execution
-            try:
-                raw_report = await run_trivy_scan(
+            timing.scan_start = timing.pull_end
+            trivy_task = asyncio.create_task(
+                run_trivy_scan(
                     image_reference=image_ref,
-                    output_path=output_path,
                     config=config,
                     log=log,
                 )
-            except ScanTimeoutException as e:
-                e.scan_id = str(scan_id)
+            )
+            try:
+                await apply_status_transitions(
+                    session, scan_id,
+                    start_transitions,
+                    worker_id=config.worker_id,
+                    **start_values,
+                )
+                await session.commit()
+            except BaseException:
+                # The scan was never marked SCANNING - stop Trivy (the DB
+                # write itself is never cancelled by a failing scan)
+                trivy_task.cancel()
+                result, = await asyncio.gather(trivy_task, return_exceptions=True)
+                if not isinstance(result, BaseException):
+                    result.close()
                 raise
+            log.info("Status: SCANNING")
+            
+            report = await trivy_task
             
             timing.scan_end = time.time()
             
-            # Transition: SCANNING -> PARSING
-            timing.parse_start = time.time()
-            await update_scan_status(session, scan_id, ScanStatus.parsing)
-            await log_audit_transition(
-                session, scan_id,
-                ScanStatus.scanning, ScanStatus.parsing,
-                message="Parsing scan results",
-                worker_id=config.worker_id,
-            )
+            # SCANNING -> PARSING is recorded with the results below, so
+            # parse + save + PARSING -> COMPLETED cost a single commit
+            timing.parse_start = timing.scan_end
             log.info("Status: PARSING")
             
-            # Calculate risk metrics
-            metrics = calculate_risk_metrics(raw_report, config)
+            # Parse (streamed when large) and score, off the event loop
+            parsed = await parse_report(report, config)
+            metrics = parsed.metrics
             timing.parse_end = time.time()
             
             log.info(
-                f"Scan complete: "
-                f"vulns={metrics.total_vulnerabilities}, "
-                f"critical={metrics.critical_count}, "
-                f"high={metrics.high_count}, "
-                f"risk_score={metrics.risk_score}, "
-                f"fixable={metrics.fixable_count}"
+                "Scan complete: "
+                "vulns=%s, "
+                "critical=%s, "
+                "high=%s, "
+                "risk_score=%s, "
+                "fixable=%s",
+                metrics.total_vulnerabilities,
+                metrics.critical_count,
+                metrics.high_count,
+                metrics.risk_score,
+                metrics.fixable_count,
             )
             
-            # Extract image digest if available
-            image_digest = None
-            if raw_report.get("Metadata", {}).get("RepoDigests"):
-                image_digest = raw_report["Metadata"]["RepoDigests"][0]
-            
-            # Get Trivy version
-            trivy_version = raw_report.get("SchemaVersion", "unknown")
-            
             # Save results and transition: PARSING -> COMPLETED
             await save_scan_results(
                 session=session,
                 scan_id=scan_id,
-                raw_report=raw_report,
+                report=report,
                 metrics=metrics,
                 timing=timing,
                 worker_id=config.worker_id,
-                trivy_version=str(trivy_version),
-                image_digest=image_digest,
-            )
-            
-            await log_audit_transition(
-                session, scan_id,
-                ScanStatus.parsing, ScanStatus.completed,
-                message=f"Scan completed: {metrics.total_vulnerabilities} vulnerabilities found",
+                trivy_version=parsed.trivy_version,
+                image_digest=parsed.image_digest,
+                store_details=config.store_vulnerability_details,
+                transitions=(_PARSE_TRANSITION,),
+                audit_message=f"Scan completed: {metrics.total_vulnerabilities} vulnerabilities found",
                 audit_data={
                     "risk_score": metrics.risk_score,
                     "duration_seconds": timing.total_duration,
                 },
-                worker_id=config.worker_id,
             )
             
             log.info(
-                f"Scan COMPLETED in {timing.total_duration}s - "
-                f"Risk Score: {metrics.risk_score}"
+                "Scan COMPLETED in %ss - Risk Score: %s",
+                timing.total_duration,
+                metrics.risk_score,
             )
     
-    except ScanTimeoutException as e:
-        log.error(f"Scan FAILED: Timeout after {e.timeout_seconds}s")
-        await _handle_scan_failure(
-            scan_id=scan_id,
-            error_message=f"Scan timed out after {e.timeout_seconds} seconds",
-            error_code="TIMEOUT",
-            config=config,
-            log=log,
+    except Exception as e:
+        error_code, increment_retry = _SCAN_ERRORS.get(
+            type(e), ("INTERNAL_ERROR", True)
         )
-    
-    except ImageNotFoundException as e:
-        log.error(f"Scan FAILED: Image not found - {e.image_name}")
+        if error_code == "INTERNAL_ERROR":
+            # Unexpected - keep the traceback
+            log.exception("Scan FAILED: Unexpected error - %s: %s", type(e).__name__, e)
+            error_message = f"Unexpected error: {type(e).__name__}: {str(e)[:500]}"
+        else:
+            # ScanFailedException subclasses carry the cause in `reason`
+            error_message = str(getattr(e, "reason", e.message))
+            log.error("Scan FAILED: %s - %s", error_code, error_message)
         await _handle_scan_failure(
             scan_id=scan_id,
-            error_message=str(e.message),
-            error_code="IMAGE_NOT_FOUND",
+            error_message=error_message,
+            error_code=error_code,
             config=config,
             log=log,
-            increment_retry=False,  # Don't retry - permanent failure
+            increment_retry=increment_retry,
         )
     
-    except ImagePullException as e:
-        log.error(f"Scan FAILED: Pull error - {e.message}")
-        await _handle_scan_failure(
-            scan_id=scan_id,
-            error_message=str(e.message),
-            error_code="PULL_FAILED",
-            config=config,
-            log=log,
-        )
+    finally:
+        # Release the spooled report (and its temp file, if it rolled over)
+        if report is not None:
+            report.close()
+
+
+async def process_single_scan(
+    scan: VulnerabilityScan,
+    config: WorkerConfig,
+) -> None:
+    """
+    Process a single vulnerability scan end-to-end.
     
-    except TrivyExecutionException as e:
-        log.error(f"Scan FAILED: Trivy error - {e.message}")
-        await _handle_scan_failure(
-            scan_id=scan_id,
-            error_message=str(e.message),
-            error_code="TRIVY_ERROR",
-            config=config,
-            log=log,
-        )
+    State Machine:
+        PENDING -> PULLING -> SCANNING -> PARSING -> COMPLETED
+                     |           |           |
+                     v           v           v
+                   FAILED     FAILED      FAILED
     
-    except Exception as e:
-        # Catch-all for unexpected errors
-        log.exception(f"Scan FAILED: Unexpected error - {type(e).__name__}: {e}")
-        await _handle_scan_failure(
-            scan_id=scan_id,
-            error_message=f"Unexpected error: {type(e).__name__}: {str(e)[:500]}",
-            error_code="INTERNAL_ERROR",
-            config=config,
-            log=log,
-        )
+    PENDING -> PULLING -> SCANNING is committed as one step; see
+    _run_scan_core. It NEVER raises exceptions.
+    """
+    scan_id = scan.id
+    image_ref = scan.full_image_name
     
-    finally:
-        # Cleanup temporary files
-        if temp_dir and os.path.exists(temp_dir):
-            try:
-                import shutil
-                shutil.rmtree(temp_dir)
-            except Exception as e:
-                log.warning(f"Failed to cleanup temp dir: {e}")
+    # Create logger with scan context
+    log = ScanLogAdapter(logger, {"scan_id": str(scan_id)[:8]})
+    log.info("Starting scan for image: %s", image_ref)
+    
+    now = datetime.now(timezone.utc)
+    await _run_scan_core(
+        scan_id, image_ref, config, log,
+        [
+            StatusTransition(
+                ScanStatus.pending, ScanStatus.pulling,
+                message="Starting image pull",
+            ),
+            StatusTransition(
+                ScanStatus.pulling, ScanStatus.scanning,
+                message="Starting vulnerability scan",
+            ),
+        ],
+        now=now,
+        started_at=now,
+    )
 
 
 async def process_single_scan_by_id(
@@ -859,183 +1741,55 @@ async def process_single_scan_by_id(
                     FAILED      FAILED
     """
     scan_id = scan_data["id"]
-    image_name = scan_data["image_name"]
-    image_tag = scan_data["image_tag"]
-    registry = scan_data["registry"]
-    
-    image_ref = f"{registry}/{image_name}:{image_tag}"
-    if registry == "docker.io":
-        image_ref = f"{image_name}:{image_tag}"
+    image_ref = scan_data["image_ref"]
     
     # Create logger with scan context
     log = ScanLogAdapter(logger, {"scan_id": str(scan_id)[:8]})
+    log.info("Processing scan for image: %s", image_ref)
     
-    log.info(f"Processing scan for image: {image_ref}")
-    
-    timing = ScanTiming(total_start=time.time())
-    timing.pull_start = timing.total_start
-    timing.pull_end = time.time()
-    temp_dir = None
-    
-    try:
-        async with get_db_session() as session:
-            # Log the PULLING->SCANNING transition
-            await log_audit_transition(
-                session, scan_id,
-                ScanStatus.pulling, ScanStatus.pulling,
-                message="Scan claimed by worker",
-                worker_id=config.worker_id,
-            )
-            
-            # Transition: PULLING -> SCANNING
-            timing.scan_start = time.time()
-            await update_scan_status(session, scan_id, ScanStatus.scanning)
-            await log_audit_transition(
-                session, scan_id,
+    await _run_scan_core(
+        scan_id, image_ref, config, log,
+        [
+            StatusTransition(
                 ScanStatus.pulling, ScanStatus.scanning,
                 message="Starting vulnerability scan",
-                worker_id=config.worker_id,
-            )
-            log.info("Status: SCANNING")
-            
-            # Create temporary directory for Trivy output
-            temp_dir = tempfile.mkdtemp(prefix="trivy_scan_")
-            output_path = Path(temp_dir) / "result.json"
-            
-            # Run Trivy scan (async - non-blocking!)
-            try:
-                raw_report = await run_trivy_scan(
-                    image_reference=image_ref,
-                    output_path=output_path,
-                    config=config,
-                    log=log,
-                )
-            except ScanTimeoutException as e:
-                e.scan_id = str(scan_id)
-                raise
-            
-            timing.scan_end = time.time()
-            
-            # Transition: SCANNING -> PARSING
-            timing.parse_start = time.time()
-            await update_scan_status(session, scan_id, ScanStatus.parsing)
-            await log_audit_transition(
-                session, scan_id,
-                ScanStatus.scanning, ScanStatus.parsing,
-                message="Parsing scan results",
-                worker_id=config.worker_id,
-            )
-            log.info("Status: PARSING")
-            
-            # Calculate risk metrics
-            metrics = calculate_risk_metrics(raw_report, config)
-            timing.parse_end = time.time()
-            
-            log.info(
-                f"Scan complete: "
-                f"vulns={metrics.total_vulnerabilities}, "
-                f"critical={metrics.critical_count}, "
-                f"high={metrics.high_count}, "
-                f"risk_score={metrics.risk_score}, "
-                f"fixable={metrics.fixable_count}"
-            )
-            
-            # Extract image digest if available
-            image_digest = None
-            if raw_report.get("Metadata", {}).get("RepoDigests"):
-                image_digest = raw_report["Metadata"]["RepoDigests"][0]
-            
-            # Get Trivy version
-            trivy_version = raw_report.get("SchemaVersion", "unknown")
-            
-            # Save results and transition: PARSING -> COMPLETED
-            await save_scan_results(
-                session=session,
-                scan_id=scan_id,
-                raw_report=raw_report,
-                metrics=metrics,
-                timing=timing,
-                worker_id=config.worker_id,
-                trivy_version=str(trivy_version),
-                image_digest=image_digest,
-            )
-            
-            await log_audit_transition(
-                session, scan_id,
-                ScanStatus.parsing, ScanStatus.completed,
-                message=f"Scan completed: {metrics.total_vulnerabilities} vulnerabilities found",
-                audit_data={
-                    "risk_score": metrics.risk_score,
-                    "duration_seconds": timing.total_duration,
-                },
-                worker_id=config.worker_id,
-            )
-            
-            log.info(
-                f"Scan COMPLETED in {timing.total_duration}s - "
-                f"Risk Score: {metrics.risk_score}"
-            )
-    
-    except ScanTimeoutException as e:
-        log.error(f"Scan FAILED: Timeout after {e.timeout_seconds}s")
-        await _handle_scan_failure(
-            scan_id=scan_id,
-            error_message=f"Scan timed out after {e.timeout_seconds} seconds",
-            error_code="TIMEOUT",
-            config=config,
-            log=log,
-        )
-    
-    except ImageNotFoundException as e:
-        log.error(f"Scan FAILED: Image not found - {e.image_name}")
-        await _handle_scan_failure(
-            scan_id=scan_id,
-            error_message=str(e.message),
-            error_code="IMAGE_NOT_FOUND",
-            config=config,
-            log=log,
-            increment_retry=False,  # Don't retry - permanent failure
-        )
-    
-    except ImagePullException as e:
-        log.error(f"Scan FAILED: Pull error - {e.message}")
-        await _handle_scan_failure(
-            scan_id=scan_id,
-            error_message=str(e.message),
-            error_code="PULL_FAILED",
-            config=config,
-            log=log,
-        )
-    
-    except TrivyExecutionException as e:
-        log.error(f"Scan FAILED: Trivy error - {e.message}")
-        await _handle_scan_failure(
-            scan_id=scan_id,
-            error_message=str(e.message),
-            error_code="TRIVY_ERROR",
-            config=config,
-            log=log,
-        )
-    
-    except Exception as e:
-        # Catch-all for unexpected errors
-        log.exception(f"Scan FAILED: Unexpected error - {type(e).__name__}: {e}")
-        await _handle_scan_failure(
-            scan_id=scan_id,
-            error_message=f"Unexpected error: {type(e).__name__}: {str(e)[:500]}",
-            error_code="INTERNAL_ERROR",
-            config=config,
-            log=log,
-        )
-    
-    finally:
-        # Cleanup temporary files
-        if temp_dir and os.path.exists(temp_dir):
-            try:
-                import shutil
-                shutil.rmtree(temp_dir)
-            except Exception as e:
-                log.warning(f"Failed to cleanup temp dir: {e}")
+            ),
+        ],
+    )
+
+
+# _handle_scan_failure's two statements, built once with named bind params.
+# The audit row copies the scan's current status as previous_status ...
+# (Core table: an ORM insert would read the bind dict as row values)
+_FAIL_AUDIT_STMT = insert(ScanAuditLog.__table__).from_select(
+    [
+        "scan_id", "previous_status", "new_status",
+        "message", "audit_data", "triggered_by", "created_at",
+    ],
+    select(
+        VulnerabilityScan.id,
+        VulnerabilityScan.status,
+        literal(ScanStatus.failed, ScanAuditLog.new_status.type),
+        bindparam("fail_message", type_=ScanAuditLog.message.type),
+        bindparam("fail_audit_data", type_=ScanAuditLog.audit_data.type),
+        bindparam("fail_triggered_by", type_=ScanAuditLog.triggered_by.type),
+        bindparam("fail_at", type_=ScanAuditLog.created_at.type),
+    ).where(VulnerabilityScan.id == bindparam("fail_scan_id")),
+)
+
+# ... before this UPDATE marks it FAILED and bumps retry_count in SQL
+_FAIL_SCAN_STMT = (
+    update(VulnerabilityScan)
+    .where(VulnerabilityScan.id == bindparam("fail_scan_id"))
+    .values(
+        status=ScanStatus.failed,
+        error_message=bindparam("fail_message"),
+        error_code=bindparam("fail_code"),
+        retry_count=VulnerabilityScan.retry_count + bindparam("fail_retry_increment"),
+        completed_at=bindparam("fail_at"),
+        updated_at=bindparam("fail_at"),
+    )
+)
 
 
 async def _handle_scan_failure(
@@ -1046,38 +1800,35 @@ async def _handle_scan_failure(
     log: logging.LoggerAdapter,
     increment_retry: bool = True,
 ) -> None:
-    """Handle scan failure with proper state transition."""
+    """
+    Handle scan failure with proper state transition.
+    
+    The audit row copies the scan's current status as previous_status with
+    INSERT ... SELECT, then one UPDATE marks it FAILED and bumps retry_count
+    in SQL - no read-modify-write round-trip, and both land in one commit.
+    """
     try:
         async with get_db_session() as session:
-            # Get current retry count
-            scan = await session.get(VulnerabilityScan, scan_id)
-            if not scan:
-                log.error(f"Scan {scan_id} not found during failure handling")
+            params = {
+                "fail_scan_id": scan_id,
+                "fail_message": error_message,
+                "fail_code": error_code,
+                "fail_audit_data": {"error_code": error_code},
+                "fail_triggered_by": config.worker_id,
+                "fail_retry_increment": int(increment_retry),
+                "fail_at": datetime.now(timezone.utc),
+            }
+            await session.execute(_FAIL_AUDIT_STMT, params)
+            result = await session.execute(_FAIL_SCAN_STMT, params)
+            if result.rowcount == 0:
+                await session.rollback()
+                log.error("Scan %s not found during failure handling", scan_id)
                 return
             
-            new_retry_count = scan.retry_count + 1 if increment_retry else scan.retry_count
-            previous_status = scan.status
-            
-            await update_scan_status(
-                session=session,
-                scan_id=scan_id,
-                new_status=ScanStatus.failed,
-                error_message=error_message,
-                error_code=error_code,
-                retry_count=new_retry_count,
-                completed_at=datetime.now(timezone.utc),
-            )
-            
-            await log_audit_transition(
-                session, scan_id,
-                previous_status, ScanStatus.failed,
-                message=error_message,
-                audit_data={"error_code": error_code},
-                worker_id=config.worker_id,
-            )
+            await session.commit()
             
     except Exception as e:
-        log.exception(f"Failed to update scan failure status: {e}")
+        log.exception("Failed to update scan failure status: %s", e)
 
 
 # =============================================================================
@@ -1090,17 +1841,36 @@ class ScanWorker:
     
     Features:
     - Graceful shutdown on SIGTERM/SIGINT
-    - Configurable polling interval
+    - Restarts a crashed self-launched Trivy server between batches
+    - Wakes on LISTEN/NOTIFY (PostgreSQL), polling only as a fallback
+    - A poller claims scans into a queue of up to batch_size while
+      max_parallel consumers run them, so claiming overlaps scanning
     - Automatic reconnection on database errors
     - Comprehensive logging
     """
     
-    def __init__(self, config: WorkerConfig | None = None):
+    def __init__(
+        self,
+        config: WorkerConfig | None = None,
+        trivy_server: TrivyServer | None = None,
+    ):
         self.config = config or WorkerConfig()
+        self.trivy_server = trivy_server
         self.running = True
-        self.current_scan_id: UUID | None = None
+        self.current_scan_ids: set[UUID] = set()
         self.logger = logging.getLogger(f"{__name__}.{self.config.worker_id}")
         
+        # Set by NOTIFY (and on shutdown) to end an idle wait early
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup = asyncio.Event()
+        # Set whenever a consumer takes a scan off the full queue
+        self._dequeued = asyncio.Event()
+        self._listener = None
+        self._listen_retry_at = 0.0
+        
+        # Held for claims only; scans use their own pooled sessions
+        self._poll_connection: AsyncConnection | None = None
+        
         # Setup signal handlers
         self._setup_signal_handlers()
     
@@ -1109,12 +1879,15 @@ class ScanWorker:
         
         def handle_shutdown(signum, frame):
             sig_name = signal.Signals(signum).name
-            self.logger.info(f"Received {sig_name}, initiating graceful shutdown...")
+            self.logger.info("Received %s, initiating graceful shutdown...", sig_name)
             self.running = False
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
             
-            if self.current_scan_id:
+            if self.current_scan_ids:
                 self.logger.info(
-                    f"Waiting for current scan {self.current_scan_id} to complete..."
+                    "Waiting for %s current scan(s) to complete...",
+                    len(self.current_scan_ids),
                 )
         
         # Register handlers
@@ -1125,52 +1898,172 @@ class ScanWorker:
         """
         Main worker loop.
         
-        Continuously polls for pending scans and processes them.
-        Handles database connection errors gracefully.
+        Runs the claim poller and max_parallel scan consumers until
+        shutdown; scans already claimed are finished before returning.
         """
         self.logger.info(
-            f"Worker {self.config.worker_id} starting - "
-            f"poll_interval={self.config.poll_interval}s, "
-            f"trivy_timeout={self.config.trivy_timeout}s"
+            "Worker %s starting - "
+            "poll_interval=%ss, "
+            "batch_size=%s, "
+            "max_parallel=%s, "
+            "trivy_timeout=%ss",
+            self.config.worker_id,
+            self.config.poll_interval,
+            self.config.batch_size,
+            self.config.max_parallel,
+            self.config.trivy_timeout,
         )
         
+        self._loop = asyncio.get_running_loop()
+        
+        # Claimed scans wait here (already PULLING) for a free consumer;
+        # max_parallel consumers bound Trivy subprocess fan-out
+        queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=self.config.batch_size)
+        consumers = [
+            asyncio.create_task(self._consume(queue))
+            for _ in range(self.config.max_parallel)
+        ]
+        try:
+            await self._poll(queue)
+            # Everything queued is already claimed - finish it before exiting
+            await queue.join()
+        finally:
+            for consumer in consumers:
+                consumer.cancel()
+            await asyncio.gather(*consumers, return_exceptions=True)
+        
+        if self._listener is not None:
+            await self._listener.close()
+        if self._poll_connection is not None:
+            await self._poll_connection.close()
+        self.logger.info("Worker %s stopped", self.config.worker_id)
+    
+    async def _poll(self, queue: asyncio.Queue[dict]) -> None:
+        """
+        Producer loop: claim pending scans into `queue` whenever it has room.
+        
+        Handles database connection errors gracefully (exponential backoff,
+        shutdown after repeated failures).
+        """
         consecutive_errors = 0
         max_consecutive_errors = 5
         
         while self.running:
             try:
-                # Poll for pending scans
-                async with get_db_session() as session:
-                    scan = await fetch_pending_scan(session)
+                # A DB refresh must not run under in-flight scans: stop
+                # claiming and let the queue drain first
+                if self.config.skip_db_update and trivy_db_stale(self.config):
+                    await queue.join()
+                    await ensure_trivy_db(self.config)
+                if self.trivy_server is not None:
+                    await self.trivy_server.ensure_running()
                 
-                if scan:
-                    self.current_scan_id = scan.id
-                    consecutive_errors = 0  # Reset on successful DB access
-                    
-                    await process_single_scan(scan, self.config)
-                    
-                    self.current_scan_id = None
+                room = queue.maxsize - queue.qsize()
+                if room == 0:
+                    # Full - wait for a consumer to take a scan
+                    self._dequeued.clear()
+                    await self._dequeued.wait()
+                    continue
+                
+                # Poll for pending scans; a NOTIFY arriving from here on
+                # cuts the next idle wait short
+                self._wakeup.clear()
+                claimed = await self._claim_batch(room)
+                consecutive_errors = 0  # Reset on successful DB access
+                
+                if claimed:
+                    for scan_data in claimed:
+                        queue.put_nowait(scan_data)
                 else:
-                    # No pending scans, wait before next poll
-                    await asyncio.sleep(self.config.poll_interval)
-                    consecutive_errors = 0
+                    # No pending scans, wait for a NOTIFY (or the next poll)
+                    await self._wait_for_work()
                     
             except Exception as e:
                 consecutive_errors += 1
                 self.logger.error(
-                    f"Worker loop error ({consecutive_errors}/{max_consecutive_errors}): {e}"
+                    "Worker loop error (%s/%s): %s",
+                    consecutive_errors,
+                    max_consecutive_errors,
+                    e,
                 )
                 
                 if consecutive_errors >= max_consecutive_errors:
                     self.logger.critical(
-                        f"Too many consecutive errors, shutting down worker"
+                        "Too many consecutive errors, shutting down worker"
                     )
                     break
                 
                 # Exponential backoff on errors
                 await asyncio.sleep(min(2 ** consecutive_errors, 60))
+    
+    async def _consume(self, queue: asyncio.Queue[dict]) -> None:
+        """Consumer loop: run claimed scans one at a time until cancelled."""
+        while True:
+            scan_data = await queue.get()
+            self._dequeued.set()
+            self.current_scan_ids.add(scan_data["id"])
+            try:
+                # Never raises - failures are recorded on the scan
+                await process_single_scan_by_id(scan_data, self.config)
+            finally:
+                self.current_scan_ids.discard(scan_data["id"])
+                queue.task_done()
+    
+    async def _claim_batch(self, limit: int) -> list[dict]:
+        """
+        Claim the next batch over the worker's own long-lived connection.
+        
+        Skips the pool checkout (and its pre-ping round-trip) on every
+        poll; a connection that errors is dropped and reopened next time.
+        """
+        if self._poll_connection is None:
+            self._poll_connection = await get_engine().connect()
+        try:
+            async with get_session_factory()(bind=self._poll_connection) as session:
+                return await claim_scans(session, self.config.worker_id, limit)
+        except Exception:
+            connection, self._poll_connection = self._poll_connection, None
+            try:
+                await connection.close()
+            except Exception:
+                pass
+            raise
+    
+    async def _wait_for_work(self) -> None:
+        """
+        Sleep until a pending scan may be available.
+        
+        While LISTENing on SCAN_PENDING_CHANNEL this returns on the first
+        NOTIFY, with notify_fallback_interval as a safety net for missed
+        notifications; without a listener it sleeps poll_interval.
+        """
+        if self._listener is not None and self._listener.is_closed():
+            self.logger.warning("LISTEN connection lost, polling until reconnected")
+            self._listener = None
+        
+        if self._listener is None and time.monotonic() >= self._listen_retry_at:
+            try:
+                self._listener = await connect_listener(
+                    SCAN_PENDING_CHANNEL, self._wakeup.set
+                )
+                if self._listener is None:
+                    # Not PostgreSQL - plain polling for good
+                    self._listen_retry_at = float("inf")
+                else:
+                    self.logger.info("Listening for %s notifications", SCAN_PENDING_CHANNEL)
+            except Exception as e:
+                self.logger.warning("LISTEN unavailable, polling instead: %s", e)
+                self._listen_retry_at = time.monotonic() + self.config.notify_fallback_interval
         
-        self.logger.info(f"Worker {self.config.worker_id} stopped")
+        timeout = (
+            self.config.poll_interval
+            if self._listener is None
+            else self.config.notify_fallback_interval
+        )
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except TimeoutError:
+            pass
 
 
 # =============================================================================
@@ -1184,7 +2077,7 @@ async def process_scan_job(scan_id: UUID) -> None:
     This is the entry point called by FastAPI BackgroundTasks.
     
     CONCURRENCY FIX:
-    Uses SELECT FOR UPDATE SKIP LOCKED to atomically claim the scan.
+    Uses claim_scans (FOR UPDATE SKIP LOCKED) to atomically claim the scan.
     This prevents race conditions where:
     - Multiple background tasks try to process the same scan
     - A scan is processed after its status has changed
@@ -1192,60 +2085,34 @@ async def process_scan_job(scan_id: UUID) -> None:
     The SKIP LOCKED option means if another worker has already locked
     this scan, we simply skip it (return early) instead of waiting.
     """
-    logger.info(f"Background task received scan job: {scan_id}")
+    logger.info("Background task received scan job: %s", scan_id)
     
     config = WorkerConfig()
     
     try:
-        # Atomically check and claim the scan using FOR UPDATE SKIP LOCKED
+        # Atomically claim the scan (UPDATE ... RETURNING, SKIP LOCKED)
         # This ensures only one worker processes this scan
         async with get_db_session() as session:
-            from sqlalchemy import select
-            
-            # Use FOR UPDATE SKIP LOCKED to atomically claim the scan
-            # This prevents race conditions with concurrent workers
-            stmt = (
-                select(VulnerabilityScan)
-                .where(
-                    VulnerabilityScan.id == scan_id,
-                    VulnerabilityScan.status == ScanStatus.pending,
-                )
-                .with_for_update(skip_locked=True)
+            claimed = await claim_scans(
+                session, config.worker_id, batch_size=1, scan_id=scan_id
             )
-            
-            result = await session.execute(stmt)
-            scan = result.scalar_one_or_none()
-            
-            if not scan:
-                # Either scan doesn't exist, or it's not pending, or it's locked
-                # In any case, nothing for us to do
-                logger.info(
-                    f"Scan {scan_id} not available for processing "
-                    f"(may be already claimed, not pending, or not found)"
-                )
-                return
-            
-            # Immediately transition to PULLING to claim ownership
-            # This releases the lock but marks it as "in progress"
-            scan.status = ScanStatus.pulling
-            scan.started_at = datetime.now(timezone.utc)
-            scan.worker_id = config.worker_id
-            await session.commit()
-            
-            # Store the scan data we need (scan object will be detached after commit)
-            scan_data = {
-                "id": scan.id,
-                "image_name": scan.image_name,
-                "image_tag": scan.image_tag,
-                "registry": scan.registry,
-            }
+        
+        if not claimed:
+            # Either scan doesn't exist, or it's not pending, or it's locked
+            # In any case, nothing for us to do
+            logger.info(
+                "Scan %s not available for processing "
+                "(may be already claimed, not pending, or not found)",
+                scan_id,
+            )
+            return
         
         # Now process the scan outside the session context
         # process_single_scan creates its own sessions as needed
-        await process_single_scan_by_id(scan_data, config)
+        await process_single_scan_by_id(claimed[0], config)
         
     except Exception as e:
-        logger.exception(f"Background task failed for scan {scan_id}: {e}")
+        logger.exception("Background task failed for scan %s: %s", scan_id, e)
         
         # Try to mark as failed
         try:
@@ -1258,7 +2125,7 @@ async def process_scan_job(scan_id: UUID) -> None:
                     error_code="BACKGROUND_TASK_ERROR",
                 )
         except Exception:
-            logger.exception(f"Failed to update scan {scan_id} status to FAILED")
+            logger.exception("Failed to update scan %s status to FAILED", scan_id)
 
 
 # =============================================================================
@@ -1278,17 +2145,38 @@ async def main() -> None:
     # Check Trivy availability
     config = WorkerConfig()
     if not os.path.exists(config.trivy_binary):
-        logger.error(f"Trivy binary not found at: {config.trivy_binary}")
+        logger.error("Trivy binary not found at: %s", config.trivy_binary)
         logger.info("Install Trivy: https://aquasecurity.github.io/trivy/")
         sys.exit(1)
     
     # Ensure cache directory exists
     os.makedirs(config.trivy_cache_dir, exist_ok=True)
+    logger.info(
+        "Large reports spill to %s", config.scratch_dir or tempfile.gettempdir()
+    )
     
-    # Run worker
-    worker = ScanWorker(config)
-    await worker.run()
+    # Pre-warm the vulnerability DB before claiming any scans
+    config.skip_db_update = await ensure_trivy_db(config)
+    
+    # Run worker, behind a self-launched Trivy server when configured
+    try:
+        if config.trivy_server_url is None and settings.trivy_server_listen:
+            async with TrivyServer(config, settings.trivy_server_listen) as server:
+                config.trivy_server_url = server.url
+                await ScanWorker(config, trivy_server=server).run()
+        else:
+            await ScanWorker(config).run()
+    finally:
+        await asyncio.to_thread(shutdown_parse_pool)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if sys.argv[1:] == ["--update-db"]:
+        # One-shot DB refresh: python -m app.worker --update-db
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        )
+        update_trivy_db_sync()
+    else:
+        asyncio.run(main())
@@ -277,6 +277,13 @@ function App() {
           throw new Error(errorMsg);
         }
         const fullScan = await response.json();
+        // The Trivy report is served separately, as stored
+        if (fullScan.raw_report_url) {
+          const reportResponse = await fetch(`${API_URL}${fullScan.raw_report_url}`);
+          if (reportResponse.ok) {
+            fullScan.raw_report = await reportResponse.json();
+          }
+        }
         setSelectedScan(fullScan);
       } catch (err) {
         addToast(err.message || 'Failed to load scan details', 'error');
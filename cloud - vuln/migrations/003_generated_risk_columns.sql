@@ -0,0 +1,97 @@
+-- =============================================================================
+-- Migration: Derive risk_score / is_compliant as generated columns
+-- =============================================================================
+-- File: 003_generated_risk_columns.sql
+-- Purpose: Let PostgreSQL compute risk_score and is_compliant from the
+--          severity counts (STORED generated columns) instead of every writer
+--          re-implementing the formula in Python
+-- Run this AFTER 002_remove_idempotency_unique_constraint.sql
+-- =============================================================================
+
+\echo 'Converting risk_score / is_compliant to generated columns...'
+
+BEGIN;
+
+-- Views reference both columns and must be dropped before the columns can be
+DROP VIEW IF EXISTS latest_scans;
+DROP VIEW IF EXISTS vulnerability_statistics;
+
+-- Generated columns cannot be added in place over existing columns, so drop
+-- and re-add them. Dependent indexes are dropped along with the columns.
+ALTER TABLE vulnerability_scans DROP COLUMN IF EXISTS risk_score;
+ALTER TABLE vulnerability_scans DROP COLUMN IF EXISTS is_compliant;
+
+ALTER TABLE vulnerability_scans
+    ADD COLUMN risk_score INTEGER NOT NULL
+        GENERATED ALWAYS AS (
+            critical_count * 100 + high_count * 50 + medium_count * 10 + low_count
+        ) STORED
+        CHECK (risk_score >= 0);
+
+ALTER TABLE vulnerability_scans
+    ADD COLUMN is_compliant BOOLEAN NOT NULL
+        GENERATED ALWAYS AS (critical_count = 0 AND high_count = 0) STORED;
+
+COMMENT ON COLUMN vulnerability_scans.risk_score IS 'Weighted risk score: Critical=100, High=50, Medium=10, Low=1 (generated)';
+COMMENT ON COLUMN vulnerability_scans.is_compliant IS 'True if no Critical/High CVEs found (generated)';
+
+-- Recreate indexes dropped with the columns
+CREATE INDEX IF NOT EXISTS ix_scans_risk_score ON vulnerability_scans (risk_score);
+CREATE INDEX IF NOT EXISTS ix_scans_is_compliant ON vulnerability_scans (is_compliant);
+CREATE INDEX IF NOT EXISTS ix_scans_compliance_filter
+    ON vulnerability_scans (is_compliant, critical_count DESC, created_at DESC);
+
+-- Recreate views (unchanged definitions from 001_initial_schema.sql)
+CREATE OR REPLACE VIEW latest_scans AS
+SELECT DISTINCT ON (image_name, image_tag)
+    id,
+    image_name,
+    image_tag,
+    registry,
+    status,
+    risk_score,
+    is_compliant,
+    compliance_status,
+    critical_count,
+    high_count,
+    medium_count,
+    low_count,
+    total_vulnerabilities,
+    fixable_count,
+    scan_duration,
+    created_at,
+    completed_at
+FROM vulnerability_scans
+WHERE status = 'completed'
+ORDER BY image_name, image_tag, created_at DESC;
+
+COMMENT ON VIEW latest_scans IS 'Latest completed scan for each unique image:tag combination';
+
+-- Unfinished scans have all-zero counts and therefore generate
+-- is_compliant = TRUE, so compliance is only counted for completed scans
+CREATE OR REPLACE VIEW vulnerability_statistics AS
+SELECT
+    COUNT(*) AS total_scans,
+    COUNT(*) FILTER (WHERE status = 'completed') AS completed_scans,
+    COUNT(*) FILTER (WHERE status = 'failed') AS failed_scans,
+    COUNT(*) FILTER (WHERE status = 'completed' AND is_compliant = TRUE) AS compliant_scans,
+    COUNT(*) FILTER (WHERE critical_count > 0) AS scans_with_critical,
+    AVG(risk_score) FILTER (WHERE status = 'completed') AS avg_risk_score,
+    SUM(total_vulnerabilities) FILTER (WHERE status = 'completed') AS total_vulnerabilities_found,
+    SUM(critical_count) FILTER (WHERE status = 'completed') AS total_critical_cves,
+    SUM(high_count) FILTER (WHERE status = 'completed') AS total_high_cves,
+    AVG(scan_duration) FILTER (WHERE status = 'completed') AS avg_scan_duration
+FROM vulnerability_scans
+WHERE created_at >= NOW() - INTERVAL '30 days';
+
+COMMENT ON VIEW vulnerability_statistics IS 'Aggregated vulnerability statistics for the past 30 days';
+
+COMMIT;
+
+-- Verify the columns are now generated
+SELECT column_name, is_generated, generation_expression
+FROM information_schema.columns
+WHERE table_name = 'vulnerability_scans'
+AND column_name IN ('risk_score', 'is_compliant');
+
+\echo 'Migration complete. risk_score and is_compliant are now maintained by PostgreSQL.'
@@ -0,0 +1,26 @@
+-- =============================================================================
+-- Migration: Trigram GIN index for image_name substring search
+-- =============================================================================
+-- File: 004_image_name_trigram_index.sql
+-- Purpose: Serve the dashboard's image_name ILIKE '%term%' filter from an
+--          index instead of a sequential scan (leading-wildcard LIKE cannot
+--          use the B-tree indexes)
+-- Run this AFTER 003_generated_risk_columns.sql
+-- NOTE: CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+-- =============================================================================
+
+\echo 'Creating trigram index on vulnerability_scans.image_name...'
+
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+
+-- CONCURRENTLY avoids blocking scan inserts while the index builds
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_scan_image_name_trgm
+    ON vulnerability_scans USING GIN (image_name gin_trgm_ops);
+
+-- Verify the index exists
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'vulnerability_scans'
+AND indexname = 'ix_scan_image_name_trgm';
+
+\echo 'Migration complete. image_name ILIKE filters can now use ix_scan_image_name_trgm.'
@@ -0,0 +1,20 @@
+-- =============================================================================
+-- Migration: Content hash for uploaded tarballs
+-- =============================================================================
+-- File: 005_upload_content_sha256.sql
+-- Purpose: Store the SHA256 of uploaded image tarballs so re-uploads of
+--          identical bytes reuse the existing scan instead of re-running Trivy
+-- Run this AFTER 004_image_name_trigram_index.sql
+-- =============================================================================
+
+\echo 'Adding vulnerability_scans.content_sha256...'
+
+ALTER TABLE vulnerability_scans
+    ADD COLUMN IF NOT EXISTS content_sha256 VARCHAR(64);
+
+COMMENT ON COLUMN vulnerability_scans.content_sha256 IS 'SHA256 of uploaded tarball bytes (content-level deduplication)';
+
+CREATE INDEX IF NOT EXISTS ix_vulnerability_scans_content_sha256
+    ON vulnerability_scans (content_sha256);
+
+\echo 'Migration complete. Uploads are now deduplicated by content hash.'
@@ -0,0 +1,81 @@
+-- =============================================================================
+-- Migration: Precompute display fields as generated columns
+-- =============================================================================
+-- File: 006_precomputed_display_columns.sql
+-- Purpose: Store risk_level, remediation_urgency, full_image,
+--          critical_and_high and fixable_ratio on the row (STORED generated
+--          columns) so response schemas read them instead of re-deriving
+--          them in Python for every serialized scan
+-- Run this AFTER 005_upload_content_sha256.sql
+-- =============================================================================
+
+\echo 'Adding precomputed display columns...'
+
+BEGIN;
+
+-- Generated columns cannot reference other generated columns, so the risk
+-- score formula is repeated inline (keep in sync with 003 and app/models.py)
+ALTER TABLE vulnerability_scans
+    ADD COLUMN IF NOT EXISTS risk_level VARCHAR(16) NOT NULL
+        GENERATED ALWAYS AS (
+            CASE
+                WHEN (critical_count * 100 + high_count * 50 + medium_count * 10 + low_count) >= 500 THEN 'CRITICAL'
+                WHEN (critical_count * 100 + high_count * 50 + medium_count * 10 + low_count) >= 100 THEN 'HIGH'
+                WHEN (critical_count * 100 + high_count * 50 + medium_count * 10 + low_count) >= 30 THEN 'MEDIUM'
+                WHEN (critical_count * 100 + high_count * 50 + medium_count * 10 + low_count) >= 1 THEN 'LOW'
+                ELSE 'NONE'
+            END
+        ) STORED;
+
+ALTER TABLE vulnerability_scans
+    ADD COLUMN IF NOT EXISTS remediation_urgency VARCHAR(64) NOT NULL
+        GENERATED ALWAYS AS (
+            CASE
+                WHEN (critical_count * 100 + high_count * 50 + medium_count * 10 + low_count) >= 500 THEN 'Immediate (within 24 hours)'
+                WHEN (critical_count * 100 + high_count * 50 + medium_count * 10 + low_count) >= 100 THEN 'Urgent (within 7 days)'
+                WHEN (critical_count * 100 + high_count * 50 + medium_count * 10 + low_count) >= 30 THEN 'Standard (within 30 days)'
+                WHEN (critical_count * 100 + high_count * 50 + medium_count * 10 + low_count) >= 1 THEN 'Best-effort (within 90 days)'
+                ELSE 'No action required'
+            END
+        ) STORED;
+
+ALTER TABLE vulnerability_scans
+    ADD COLUMN IF NOT EXISTS full_image VARCHAR(1024) NOT NULL
+        GENERATED ALWAYS AS (
+            CASE
+                WHEN registry = 'docker.io' THEN image_name || ':' || image_tag
+                ELSE registry || '/' || image_name || ':' || image_tag
+            END
+        ) STORED;
+
+ALTER TABLE vulnerability_scans
+    ADD COLUMN IF NOT EXISTS critical_and_high INTEGER NOT NULL
+        GENERATED ALWAYS AS (critical_count + high_count) STORED;
+
+ALTER TABLE vulnerability_scans
+    ADD COLUMN IF NOT EXISTS fixable_ratio DOUBLE PRECISION NOT NULL
+        GENERATED ALWAYS AS (
+            CASE
+                WHEN total_vulnerabilities = 0 THEN 1.0
+                ELSE ROUND(fixable_count * 1.0 / total_vulnerabilities, 4)
+            END
+        ) STORED;
+
+COMMENT ON COLUMN vulnerability_scans.risk_level IS 'Risk band derived from risk_score (generated)';
+COMMENT ON COLUMN vulnerability_scans.remediation_urgency IS 'Remediation timeline for the risk band (generated)';
+COMMENT ON COLUMN vulnerability_scans.full_image IS 'Display reference; docker.io registry omitted (generated)';
+COMMENT ON COLUMN vulnerability_scans.critical_and_high IS 'Critical + High count (generated)';
+COMMENT ON COLUMN vulnerability_scans.fixable_ratio IS 'Fixable / total, 1.0 when there are no vulnerabilities (generated)';
+
+CREATE INDEX IF NOT EXISTS ix_vulnerability_scans_risk_level
+    ON vulnerability_scans (risk_level);
+
+COMMIT;
+
+-- Verify the columns are generated
+SELECT column_name, is_generated, generation_expression
+FROM information_schema.columns
+WHERE table_name = 'vulnerability_scans'
+AND column_name IN ('risk_level', 'remediation_urgency', 'full_image', 'critical_and_high', 'fixable_ratio');
+
+\echo 'Migration complete. Display fields are now maintained by PostgreSQL.'
@@ -0,0 +1,18 @@
+-- =============================================================================
+-- Migration: Reference raw Trivy reports stored outside the database
+-- =============================================================================
+-- File: 007_raw_report_key.sql
+-- Purpose: When RAW_REPORT_DIR is configured, raw reports are written to
+--          disk and served verbatim by GET /api/v1/scans/{id}/raw_report;
+--          raw_report_key records where each one lives
+-- Run this AFTER 006_precomputed_display_columns.sql
+-- =============================================================================
+
+\echo 'Adding raw_report_key column...'
+
+ALTER TABLE vulnerability_scans
+    ADD COLUMN IF NOT EXISTS raw_report_key VARCHAR(512);
+
+COMMENT ON COLUMN vulnerability_scans.raw_report_key IS 'Key of the raw Trivy report in report storage (NULL = stored in raw_report)';
+
+\echo 'Migration complete.'
@@ -0,0 +1,25 @@
+-- =============================================================================
+-- Migration: Composite index for keyset pagination of the scan list
+-- =============================================================================
+-- File: 008_scan_list_keyset_index.sql
+-- Purpose: GET /api/v1/scans?cursor=... seeks with
+--          WHERE (created_at, id) < (:ts, :id) ORDER BY created_at DESC, id DESC;
+--          a (created_at, id) B-tree answers that with a backward index scan
+--          that stops after page_size rows, at any depth
+-- Run this AFTER 007_raw_report_key.sql
+-- NOTE: CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+-- =============================================================================
+
+\echo 'Creating keyset pagination index on vulnerability_scans...'
+
+-- CONCURRENTLY avoids blocking scan inserts while the index builds
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_scans_list_order
+    ON vulnerability_scans (created_at, id);
+
+-- Verify the index exists
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'vulnerability_scans'
+AND indexname = 'ix_scans_list_order';
+
+\echo 'Migration complete. Cursor pages of the scan list now use ix_scans_list_order.'
@@ -0,0 +1,91 @@
+-- =============================================================================
+-- Migration: is_compliant follows the worker's compliance rule
+-- =============================================================================
+-- File: 009_is_compliant_requires_completed.sql
+-- Purpose: is_compliant was generated as (critical_count = 0 AND high_count = 0),
+--          so pending, in-progress and failed scans (all counts zero) read as
+--          compliant, and so did completed scans with Medium/Low findings.
+--          It now matches the worker (compliance_status = 'compliant'): a
+--          completed scan with no Critical, High, Medium or Low CVEs.
+-- Run this AFTER 008_scan_list_keyset_index.sql
+-- =============================================================================
+
+\echo 'Redefining is_compliant to match compliance_status...'
+
+BEGIN;
+
+-- Views reference the column and must be dropped before it can be
+DROP VIEW IF EXISTS latest_scans;
+DROP VIEW IF EXISTS vulnerability_statistics;
+
+-- A generation expression cannot be altered in place; dependent indexes are
+-- dropped along with the column
+ALTER TABLE vulnerability_scans DROP COLUMN IF EXISTS is_compliant;
+
+ALTER TABLE vulnerability_scans
+    ADD COLUMN is_compliant BOOLEAN NOT NULL
+        GENERATED ALWAYS AS (
+            status = 'completed'
+            AND critical_count = 0 AND high_count = 0
+            AND medium_count = 0 AND low_count = 0
+        ) STORED;
+
+COMMENT ON COLUMN vulnerability_scans.is_compliant IS 'True if the scan completed with no Critical/High/Medium/Low CVEs (generated)';
+
+-- Recreate indexes dropped with the column
+CREATE INDEX IF NOT EXISTS ix_scans_is_compliant ON vulnerability_scans (is_compliant);
+CREATE INDEX IF NOT EXISTS ix_scans_compliance_filter
+    ON vulnerability_scans (is_compliant, critical_count DESC, created_at DESC);
+
+-- Recreate views (unchanged definitions from 003_generated_risk_columns.sql)
+CREATE OR REPLACE VIEW latest_scans AS
+SELECT DISTINCT ON (image_name, image_tag)
+    id,
+    image_name,
+    image_tag,
+    registry,
+    status,
+    risk_score,
+    is_compliant,
+    compliance_status,
+    critical_count,
+    high_count,
+    medium_count,
+    low_count,
+    total_vulnerabilities,
+    fixable_count,
+    scan_duration,
+    created_at,
+    completed_at
+FROM vulnerability_scans
+WHERE status = 'completed'
+ORDER BY image_name, image_tag, created_at DESC;
+
+COMMENT ON VIEW latest_scans IS 'Latest completed scan for each unique image:tag combination';
+
+CREATE OR REPLACE VIEW vulnerability_statistics AS
+SELECT
+    COUNT(*) AS total_scans,
+    COUNT(*) FILTER (WHERE status = 'completed') AS completed_scans,
+    COUNT(*) FILTER (WHERE status = 'failed') AS failed_scans,
+    COUNT(*) FILTER (WHERE status = 'completed' AND is_compliant = TRUE) AS compliant_scans,
+    COUNT(*) FILTER (WHERE critical_count > 0) AS scans_with_critical,
+    AVG(risk_score) FILTER (WHERE status = 'completed') AS avg_risk_score,
+    SUM(total_vulnerabilities) FILTER (WHERE status = 'completed') AS total_vulnerabilities_found,
+    SUM(critical_count) FILTER (WHERE status = 'completed') AS total_critical_cves,
+    SUM(high_count) FILTER (WHERE status = 'completed') AS total_high_cves,
+    AVG(scan_duration) FILTER (WHERE status = 'completed') AS avg_scan_duration
+FROM vulnerability_scans
+WHERE created_at >= NOW() - INTERVAL '30 days';
+
+COMMENT ON VIEW vulnerability_statistics IS 'Aggregated vulnerability statistics for the past 30 days';
+
+COMMIT;
+
+-- Verify the new generation expression
+SELECT column_name, is_generated, generation_expression
+FROM information_schema.columns
+WHERE table_name = 'vulnerability_scans'
+AND column_name = 'is_compliant';
+
+\echo 'Migration complete. Only completed scans without findings are compliant.'
@@ -0,0 +1,19 @@
+-- =============================================================================
+-- Migration: Record raw reports that were too large to keep
+-- =============================================================================
+-- File: 010_raw_report_omitted.sql
+-- Purpose: Without RAW_REPORT_DIR, reports of STREAMING_PARSE_THRESHOLD
+--          (10MB) or more are not stored in the raw_report column;
+--          raw_report_omitted marks those scans so
+--          GET /api/v1/scans/{id}/raw_report can say why it has no report
+-- Run this AFTER 009_is_compliant_requires_completed.sql
+-- =============================================================================
+
+\echo 'Adding raw_report_omitted column...'
+
+ALTER TABLE vulnerability_scans
+    ADD COLUMN IF NOT EXISTS raw_report_omitted BOOLEAN NOT NULL DEFAULT false;
+
+COMMENT ON COLUMN vulnerability_scans.raw_report_omitted IS 'True if the raw report exceeded the inline limit and was not kept';
+
+\echo 'Migration complete.'
@@ -20,3 +20,13 @@ def pytest_configure(config):
 def anyio_backend():
     """Use asyncio as the async backend."""
     return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def clear_analytics_cache():
+    """Keep per-process analytics cached by one test out of the next."""
+    from app.repositories import _analytics_cache
+    
+    _analytics_cache.clear()
+    yield
+    _analytics_cache.clear()
@@ -173,10 +173,8 @@ async def test_submit_scan_idempotency_cache_hit(client: AsyncClient, db_session
         image_tag="7.0",
         registry="docker.io",
         status=ScanStatus.completed,
-        risk_score=50,
         critical_count=0,
         high_count=1,
-        is_compliant=False,
     )
     db_session.add(existing_scan)
     await db_session.commit()
@@ -259,12 +257,9 @@ async def test_get_scan_by_id(client: AsyncClient, db_session: AsyncSession):
         image_tag="22.04",
         registry="docker.io",
         status=ScanStatus.completed,
-        risk_score=150,
         critical_count=1,
-        high_count=2,
-        medium_count=5,
-        total_vulnerabilities=8,
-        is_compliant=False,
+        high_count=1,
+        total_vulnerabilities=2,
     )
     db_session.add(scan)
     await db_session.commit()
@@ -343,7 +338,7 @@ async def test_list_scans_with_data(client: AsyncClient, db_session: AsyncSessio
             image_tag="latest",
             registry="docker.io",
             status=ScanStatus.completed,
-            risk_score=i * 10,
+            medium_count=i,
         )
         db_session.add(scan)
     await db_session.commit()
@@ -369,12 +364,12 @@ async def test_dashboard_stats(client: AsyncClient, db_session: AsyncSession):
     scans = [
         VulnerabilityScan(
             image_name="app1", image_tag="v1", registry="docker.io",
-            status=ScanStatus.completed, is_compliant=True, risk_score=0,
+            status=ScanStatus.completed,
         ),
         VulnerabilityScan(
             image_name="app2", image_tag="v1", registry="docker.io",
-            status=ScanStatus.completed, is_compliant=False, risk_score=150,
-            critical_count=1,
+            status=ScanStatus.completed,
+            critical_count=1, high_count=1,
         ),
         VulnerabilityScan(
             image_name="app3", image_tag="v1", registry="docker.io",
@@ -0,0 +1,272 @@
+"""
+Schema Unit Tests
+=================
+Tests for the Pydantic API schemas.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models import Base, ScanStatus, ComplianceStatus, VulnerabilityScan
+from app.schemas import (
+    ScanDetailResponse,
+    ScanSummaryResponse,
+    ScanRequest,
+    ScanTimingSchema,
+    RiskAssessmentSchema,
+    VulnerabilityCountsSchema,
+)
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def scan_row():
+    """Flat object shaped like a VulnerabilityScan ORM row."""
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        idempotency_key="abc123",
+        image_name="nginx",
+        image_tag="1.25",
+        image_digest=None,
+        registry="docker.io",
+        full_image="nginx:1.25",
+        status=ScanStatus.completed,
+        error_message=None,
+        error_code=None,
+        retry_count=0,
+        critical_count=1,
+        high_count=2,
+        medium_count=3,
+        low_count=4,
+        unknown_count=0,
+        total_vulnerabilities=10,
+        fixable_count=6,
+        unfixable_count=4,
+        critical_and_high=3,
+        fixable_ratio=0.6,
+        risk_score=234,
+        max_cvss_score=9.8,
+        avg_cvss_score=6.1,
+        is_compliant=False,
+        compliance_status=ComplianceStatus.non_compliant,
+        risk_level="HIGH",
+        remediation_urgency="Urgent (within 7 days)",
+        scan_duration=12.5,
+        pull_duration=4.0,
+        analysis_duration=7.0,
+        worker_id="worker-1",
+        trivy_version="0.48.0",
+        created_at=now,
+        started_at=now,
+        completed_at=now,
+        updated_at=now,
+        raw_report={"Results": []},
+    )
+
+
+# =============================================================================
+# TESTS - ScanDetailResponse
+# =============================================================================
+
+class TestScanDetailResponse:
+    """Tests for ORM -> detail response conversion."""
+    
+    def test_from_orm_fast_passes_validation(self, scan_row):
+        """The validation-free path must produce data the schema would accept."""
+        fast = ScanDetailResponse.from_orm_fast(scan_row)
+        validated = ScanDetailResponse.model_validate(fast.model_dump())
+        
+        assert fast.model_dump(mode="json") == validated.model_dump(mode="json")
+    
+    def test_from_rows_matches_from_orm_fast(self, scan_row):
+        """Batch construction builds the same objects as the single-row path."""
+        [built] = ScanDetailResponse.from_rows([scan_row])
+        fast = ScanDetailResponse.from_orm_fast(scan_row)
+        
+        assert built.model_dump(mode="json") == fast.model_dump(mode="json")
+    
+    def test_raw_report_referenced_not_embedded(self, scan_row):
+        """The report is linked by URL and never serialized into the response."""
+        fast = ScanDetailResponse.from_orm_fast(scan_row)
+        
+        payload = orjson.loads(fast.model_dump_json())
+        
+        assert "raw_report" not in payload
+        assert payload["raw_report_url"] == f"/api/v1/scans/{scan_row.id}/raw_report"
+    
+    def test_from_orm_fast_nested_fields(self, scan_row):
+        """Precomputed columns and nested computed fields survive model_construct."""
+        fast = ScanDetailResponse.from_orm_fast(scan_row)
+        
+        assert fast.vulnerability_counts.critical_and_high == 3
+        assert fast.risk_assessment.risk_level == "HIGH"
+        assert fast.timing.overhead_duration == 1.5
+        assert fast.full_image == "nginx:1.25"
+
+
+class TestScanSummaryEncode:
+    """Tests for the generated orjson encoder."""
+    
+    @pytest.mark.parametrize("created_at", [
+        datetime(2024, 1, 1, 12, 30, 5, 123456, tzinfo=timezone.utc),
+        datetime(2024, 1, 1, 12, 30),
+    ])
+    def test_encode_matches_pydantic(self, scan_row, created_at):
+        """The generated encoder must be byte-identical to model_dump_json."""
+        scan_row.created_at = created_at
+        summary = ScanSummaryResponse.model_validate(scan_row)
+        
+        assert summary.encode() == summary.model_dump_json().encode()
+
+
+# =============================================================================
+# TESTS - Generated display columns
+# =============================================================================
+
+@pytest.fixture
+def db_session():
+    """In-memory SQLite session with the full schema created."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _insert_scan(session, **counts) -> VulnerabilityScan:
+    """Insert a scan and reload it so generated columns are populated."""
+    scan = VulnerabilityScan(image_name="nginx", image_tag="1.25", **counts)
+    session.add(scan)
+    session.commit()
+    session.refresh(scan)
+    return scan
+
+
+class TestRiskLevel:
+    """Tests for the risk level / remediation generated columns."""
+    
+    @pytest.mark.parametrize("critical,expected", [
+        (0, "NONE"),
+        (1, "HIGH"),
+        (4, "HIGH"),
+        (5, "CRITICAL"),
+    ])
+    def test_risk_level_thresholds(self, db_session, critical, expected):
+        """Band boundaries are inclusive of the lower threshold."""
+        scan = _insert_scan(db_session, critical_count=critical)
+        assert scan.risk_level == expected
+    
+    @pytest.mark.parametrize("low,expected", [
+        (1, "LOW"),
+        (29, "LOW"),
+        (30, "MEDIUM"),
+        (100, "HIGH"),
+    ])
+    def test_low_severity_bands(self, db_session, low, expected):
+        """Low findings (weight 1) walk through every lower band."""
+        scan = _insert_scan(db_session, low_count=low)
+        assert scan.risk_level == expected
+    
+    def test_remediation_urgency_follows_band(self, db_session):
+        """Urgency text is derived from the same band as the level."""
+        scan = _insert_scan(db_session, high_count=2)
+        
+        assert scan.risk_level == "HIGH"
+        assert scan.remediation_urgency == "Urgent (within 7 days)"
+    
+    @pytest.mark.parametrize("low", [0, 1, 30, 100, 600])
+    def test_schema_derives_band_from_score(self, db_session, low):
+        """Without DB values the schema derives the same band as the column."""
+        scan = _insert_scan(db_session, low_count=low)
+        risk = RiskAssessmentSchema(risk_score=scan.risk_score)
+        
+        assert risk.risk_level == scan.risk_level
+        assert risk.remediation_urgency == scan.remediation_urgency
+
+
+class TestDerivedMetrics:
+    """Tests for generated ratio columns and computed duration fast paths."""
+    
+    @pytest.mark.parametrize("fixable,total,expected", [
+        (0, 0, 1.0),
+        (0, 7, 0.0),
+        (7, 7, 1.0),
+        (1, 3, 0.3333),
+    ])
+    def test_fixable_ratio(self, db_session, fixable, total, expected):
+        """Ratio is exact on the extremes and rounded to 4 places otherwise."""
+        scan = _insert_scan(
+            db_session, fixable_count=fixable, total_vulnerabilities=total
+        )
+        assert scan.fixable_ratio == expected
+    
+    def test_counts_schema_derives_totals(self):
+        """critical_and_high / fixable_ratio are derived when not supplied."""
+        counts = VulnerabilityCountsSchema(critical=2, high=3, total=3, fixable=1)
+        
+        assert counts.critical_and_high == 5
+        assert counts.fixable_ratio == 0.3333
+        assert VulnerabilityCountsSchema().fixable_ratio == 1.0
+    
+    @pytest.mark.parametrize("registry,expected", [
+        ("docker.io", "nginx:1.25"),
+        ("ghcr.io", "ghcr.io/nginx:1.25"),
+    ])
+    def test_full_image(self, db_session, registry, expected):
+        """Docker Hub references omit the registry prefix."""
+        scan = _insert_scan(db_session, registry=registry)
+        assert scan.full_image == expected
+        
+        summary = ScanSummaryResponse(
+            id=scan.id, image_name="nginx", image_tag="1.25", registry=registry,
+            status="pending", created_at=scan.created_at,
+        )
+        assert summary.full_image == expected
+    
+    @pytest.mark.parametrize("timing,expected", [
+        ({}, None),
+        ({"scan_duration": 12.34567}, 12.346),
+        ({"scan_duration": 10.0, "pull_duration": 4.0}, 6.0),
+        ({"scan_duration": 10.0, "pull_duration": 4.0, "analysis_duration": 5.5}, 0.5),
+    ])
+    def test_overhead_duration(self, timing, expected):
+        """Overhead is total minus the recorded pull/analysis components."""
+        assert ScanTimingSchema(**timing).overhead_duration == expected
+
+
+# =============================================================================
+# TESTS - ScanRequest
+# =============================================================================
+
+class TestScanRequestValidation:
+    """Tests for inbound image reference validation."""
+    
+    def test_image_name_normalized_before_matching(self):
+        """Slashes and case are normalized before the format check."""
+        request = ScanRequest(image_name="/Library/Nginx/", image_tag="1.25")
+        
+        assert request.image_name == "library/nginx"
+    
+    @pytest.mark.parametrize("image_name,image_tag", [
+        ("ng inx", "latest"),
+        ("-nginx", "latest"),
+        ("nginx", "-rc1"),
+        ("nginx", ".hidden"),
+        ("nginx", "has space"),
+        ("nginx", "v\u00e91"),
+    ])
+    def test_invalid_references_rejected(self, image_name, image_tag):
+        """Malformed names and tags fail validation."""
+        with pytest.raises(ValidationError):
+            ScanRequest(image_name=image_name, image_tag=image_tag)
@@ -4,25 +4,35 @@ Worker Unit Tests
 Tests for the vulnerability scanner worker module.
 """
 
+import io
 import json
 import pytest
+from dataclasses import replace
 from unittest.mock import Mock, patch, AsyncMock
 from pathlib import Path
 
 from app.worker import (
+    _classify_trivy_error,
+    _read_report_text,
     calculate_risk_metrics,
     extract_cvss_score,
+    parse_and_score,
     WorkerConfig,
     RiskMetrics,
 )
 from app.models import ComplianceStatus
+from app.exceptions import (
+    ImageNotFoundException,
+    ImagePullException,
+    TrivyExecutionException,
+)
 
 
 # =============================================================================
 # FIXTURES - Sample Trivy Output
 # =============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_trivy_output_critical():
     """Sample Trivy output with critical vulnerabilities."""
     return {
@@ -75,7 +85,7 @@ def sample_trivy_output_critical():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_trivy_output_clean():
     """Sample Trivy output with no vulnerabilities."""
     return {
@@ -91,7 +101,7 @@ def sample_trivy_output_clean():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_trivy_output_medium_only():
     """Sample Trivy output with only medium vulnerabilities."""
     return {
@@ -124,7 +134,7 @@ def sample_trivy_output_medium_only():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def worker_config():
     """Default worker configuration for tests."""
     return WorkerConfig(
@@ -138,6 +148,12 @@ def worker_config():
     )
 
 
+@pytest.fixture
+def detail_worker_config(worker_config):
+    """Worker configuration that keeps per-CVE vulnerability details."""
+    return replace(worker_config, store_vulnerability_details=True)
+
+
 # =============================================================================
 # RISK METRICS CALCULATION TESTS
 # =============================================================================
@@ -196,6 +212,7 @@ class TestCalculateRiskMetrics:
         assert metrics.high_count == 0
         assert metrics.medium_count == 2
         assert metrics.risk_score == 20  # 2 * 10
+        assert metrics.is_compliant is False
         assert metrics.compliance_status == ComplianceStatus.pending_review
     
     def test_empty_results(self, worker_config):
@@ -213,6 +230,28 @@ class TestCalculateRiskMetrics:
         
         assert metrics.total_vulnerabilities == 0
         assert metrics.is_compliant is True
+    
+    def test_severity_casing_and_unknown_values(self, detail_worker_config):
+        """Test that lowercase severities count and unrecognised ones are UNKNOWN."""
+        output = {
+            "Results": [{
+                "Vulnerabilities": [
+                    {"VulnerabilityID": "CVE-1", "Severity": "critical"},
+                    {"VulnerabilityID": "CVE-2", "Severity": "NEGLIGIBLE"},
+                    {"VulnerabilityID": "CVE-3"},
+                    {"VulnerabilityID": "CVE-4", "Severity": "High"},
+                    {"VulnerabilityID": "CVE-5", "Severity": None},
+                ]
+            }]
+        }
+        metrics = calculate_risk_metrics(output, detail_worker_config)
+        
+        assert metrics.critical_count == 1
+        assert metrics.high_count == 1
+        assert metrics.unknown_count == 3
+        assert [v["severity"] for v in metrics.vulnerabilities] == [
+            "CRITICAL", "UNKNOWN", "UNKNOWN", "HIGH", "UNKNOWN",
+        ]
 
 
 class TestExtractCvssScore:
@@ -245,6 +284,34 @@ class TestExtractCvssScore:
         }
         assert extract_cvss_score(vuln) == 6.5
     
+    def test_priority_order(self):
+        """Vendor V3 beats NVD V2, which beats vendor V2."""
+        vuln = {
+            "CVSS": {
+                "ghsa": {"V2Score": 4.0},
+                "nvd": {"V2Score": 5.0},
+                "redhat": {"V3Score": 7.1, "V2Score": 6.0},
+            }
+        }
+        assert extract_cvss_score(vuln) == 7.1
+    
+        del vuln["CVSS"]["redhat"]
+        assert extract_cvss_score(vuln) == 5.0
+    
+        del vuln["CVSS"]["nvd"]
+        assert extract_cvss_score(vuln) == 4.0
+    
+    def test_vendor_priority_ignores_report_order(self):
+        """Known vendors outrank unlisted ones whatever the key order."""
+        vuln = {
+            "CVSS": {
+                "photon": {"V3Score": 5.3},
+                "ghsa": {"V3Score": 6.1},
+                "redhat": {"V3Score": 7.4},
+            }
+        }
+        assert extract_cvss_score(vuln) == 7.4
+    
     def test_no_cvss_data(self):
         """Test handling of missing CVSS data."""
         vuln = {"VulnerabilityID": "CVE-2024-0001"}
@@ -318,10 +385,12 @@ class TestVulnerabilityDetailsExtraction:
     """Tests for vulnerability details extraction."""
     
     def test_vulnerability_details_extracted(
-        self, sample_trivy_output_critical, worker_config
+        self, sample_trivy_output_critical, detail_worker_config
     ):
         """Test that vulnerability details are properly extracted."""
-        metrics = calculate_risk_metrics(sample_trivy_output_critical, worker_config)
+        metrics = calculate_risk_metrics(
+            sample_trivy_output_critical, detail_worker_config
+        )
         
         assert len(metrics.vulnerabilities) == 4
         
@@ -338,10 +407,12 @@ class TestVulnerabilityDetailsExtraction:
         assert first_vuln["is_fixable"] is True
     
     def test_unfixable_vulnerability(
-        self, sample_trivy_output_critical, worker_config
+        self, sample_trivy_output_critical, detail_worker_config
     ):
         """Test that unfixable vulnerabilities are marked correctly."""
-        metrics = calculate_risk_metrics(sample_trivy_output_critical, worker_config)
+        metrics = calculate_risk_metrics(
+            sample_trivy_output_critical, detail_worker_config
+        )
         
         # CVE-2024-0003 has empty FixedVersion
         libxml_vuln = next(
@@ -350,6 +421,89 @@ class TestVulnerabilityDetailsExtraction:
         )
         assert libxml_vuln["is_fixable"] is False
         assert libxml_vuln["fixed_version"] is None
+    
+    def test_details_skipped_when_not_stored(
+        self, sample_trivy_output_critical, worker_config
+    ):
+        """Test that only counters are kept when details are not stored."""
+        metrics = calculate_risk_metrics(sample_trivy_output_critical, worker_config)
+        
+        assert metrics.total_vulnerabilities == 4
+        assert metrics.fixable_count == 2
+        assert list(metrics.vulnerabilities) == []
+
+
+# =============================================================================
+# TRIVY ERROR CLASSIFICATION TESTS
+# =============================================================================
+
+class TestClassifyTrivyError:
+    """Tests for mapping Trivy stderr to exceptions."""
+    
+    @pytest.mark.parametrize("stderr_text, expected", [
+        ("FATAL: MANIFEST UNKNOWN", ImageNotFoundException),
+        ("could not find image nginx:nope", ImageNotFoundException),
+        ("401 Unauthorized", ImagePullException),
+        ("TOOMANYREQUESTS: Too Many Requests", ImagePullException),
+        # Not-found wins over an auth hint, as before
+        ("access denied: manifest unknown", ImageNotFoundException),
+        ("unexpected failure", TrivyExecutionException),
+    ])
+    def test_classification(self, stderr_text, expected):
+        error = _classify_trivy_error(stderr_text, "nginx:latest", 1)
+        assert type(error) is expected
+    
+    def test_empty_stderr_reports_exit_code(self):
+        error = _classify_trivy_error("", "nginx:latest", 2)
+        assert error.exit_code == 2
+        assert "Exit code 2" in error.message
+
+
+# =============================================================================
+# REPORT FILE PARSING TESTS
+# =============================================================================
+
+class TestParseAndScore:
+    """Tests for parse_and_score (in-memory and streaming paths)."""
+    
+    @pytest.fixture
+    def report_file(self, sample_trivy_output_critical):
+        # Trivy writes Metadata before Results
+        report = {
+            "SchemaVersion": 2,
+            "Metadata": {"RepoDigests": ["nginx@sha256:abc", "nginx@sha256:def"]},
+            "Results": sample_trivy_output_critical["Results"],
+        }
+        return io.BytesIO(json.dumps(report).encode()), report
+    
+    @pytest.mark.parametrize("threshold", [10 * 1024 * 1024, 0])
+    def test_matches_in_memory_scoring(self, report_file, worker_config, threshold):
+        """Both parse paths produce the same metrics and header fields."""
+        stream, report = report_file
+        
+        with patch("app.worker.STREAMING_PARSE_THRESHOLD", threshold):
+            parsed = parse_and_score(stream, worker_config)
+        
+        assert parsed.metrics == calculate_risk_metrics(report, worker_config)
+        assert parsed.trivy_version == "2"
+        assert parsed.image_digest == "nginx@sha256:abc"
+    
+    @pytest.mark.parametrize("threshold", [10 * 1024 * 1024, 0])
+    def test_invalid_json_raises_trivy_error(self, worker_config, threshold):
+        """A truncated report surfaces as a Trivy execution failure."""
+        stream = io.BytesIO(b'{"SchemaVersion": 2, "Results": [')
+        
+        with patch("app.worker.STREAMING_PARSE_THRESHOLD", threshold):
+            with pytest.raises(TrivyExecutionException):
+                parse_and_score(stream, worker_config)
+    
+    def test_large_report_not_inlined(self):
+        """Reports at the streaming threshold are never read into one string."""
+        stream = io.BytesIO(b'{"Results": []}')
+        
+        assert _read_report_text(stream) == '{"Results": []}'
+        with patch("app.worker.STREAMING_PARSE_THRESHOLD", 4):
+            assert _read_report_text(stream) is None
 
 
 # =============================================================================